@@ -0,0 +1,77 @@
+"""Compare moving pixels between Qt and Pillow via PNG buffers and via raw buffers.
+
+Usage: python benchmarks/pixel_transfer.py [--width 6000] [--height 4000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PIL import Image
+from PyQt5.QtCore import QByteArray, QBuffer
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtWidgets import QApplication
+from image_resizer.utils.qt_image import pil_to_qpixmap, qpixmap_to_pil
+
+
+def png_pixmap_to_pil(pixmap):
+    """The former transfer: encode PNG into a QBuffer and reopen it with Pillow"""
+    temp_buffer = QByteArray()
+    buffer = QBuffer(temp_buffer)
+    buffer.open(QBuffer.WriteOnly)
+    pixmap.save(buffer, 'PNG')
+    buffer.close()
+    image = Image.open(BytesIO(temp_buffer.data()))
+    image.load()
+    return image
+
+
+def png_pil_to_pixmap(image):
+    """The former transfer back: encode PNG with Pillow and decode it with Qt"""
+    img_byte_arr = BytesIO()
+    image.save(img_byte_arr, format='PNG')
+    return QPixmap.fromImage(QImage.fromData(img_byte_arr.getvalue()))
+
+
+def best_time(func, arg, repeat):
+    """Best wall-clock time of several runs, in seconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--width', type=int, default=6000)
+    parser.add_argument('--height', type=int, default=4000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+
+    # Noise does not compress, which is close to what photos cost zlib
+    image = Image.effect_noise((args.width, args.height), 64).convert('RGB')
+    pixmap = pil_to_qpixmap(image)
+    megapixels = args.width * args.height / 1e6
+    print(f"{args.width} x {args.height} ({megapixels:.1f} MP), best of {args.repeat}")
+
+    cases = [
+        ("QPixmap -> PIL", png_pixmap_to_pil, qpixmap_to_pil, pixmap),
+        ("PIL -> QPixmap", png_pil_to_pixmap, pil_to_qpixmap, image),
+    ]
+    for name, png_func, raw_func, arg in cases:
+        png_time = best_time(png_func, arg, args.repeat)
+        raw_time = best_time(raw_func, arg, args.repeat)
+        print(f"{name}: PNG {png_time * 1000:8.1f} ms   raw {raw_time * 1000:8.1f} ms   "
+              f"{png_time / raw_time:6.1f}x faster")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Calibrate the sampled file-size estimator against real encodes.
+
+Usage: python benchmarks/size_estimate.py [image ...]
+
+Without arguments a set of synthetic photo-like and screenshot-like images is used.
+The printed mean ratio per format is the value for DEFAULT_CALIBRATION.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PIL import Image, ImageDraw, ImageFilter
+from PyQt5.QtWidgets import QApplication
+from image_resizer.utils.qt_image import pil_to_qimage
+from image_resizer.utils.size_estimator import encoded_size, sampled_size
+
+QUALITIES = (30, 50, 70, 80, 90, 95)
+
+
+def synthetic_images():
+    """Photo-like (smooth plus grain) and screenshot-like (flat plus text) test images"""
+    size = (4000, 3000)
+    noise = Image.effect_noise(size, 40).convert('RGB')
+    gradient = Image.linear_gradient('L').resize(size).convert('RGB')
+    photo = Image.blend(gradient, noise.filter(ImageFilter.GaussianBlur(3)), 0.5)
+    grainy = Image.blend(photo, noise, 0.15)
+
+    screenshot = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(screenshot)
+    for y in range(0, size[1], 40):
+        draw.text((40 + (y * 7) % 300, y), "Lorem ipsum dolor sit amet " * 8, fill='black')
+    draw.rectangle((size[0] // 2, size[1] // 3, size[0] - 200, size[1] - 200), fill=(60, 120, 200))
+    return [('photo', photo), ('grainy', grainy), ('screenshot', screenshot)]
+
+
+def main():
+    app = QApplication(sys.argv)
+
+    if len(sys.argv) > 1:
+        images = [(os.path.basename(path), Image.open(path).convert('RGB')) for path in sys.argv[1:]]
+    else:
+        images = synthetic_images()
+
+    ratios = {'JPEG': [], 'PNG': []}
+    for name, pil_image in images:
+        image = pil_to_qimage(pil_image)
+        settings = [('JPEG', quality) for quality in QUALITIES] + [('PNG', -1)]
+        for img_format, quality in settings:
+            start = time.perf_counter()
+            real = encoded_size(image, img_format, quality)
+            full_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            sampled = sampled_size(image, img_format, quality)
+            sample_time = time.perf_counter() - start
+
+            ratios[img_format].append(real / sampled)
+            print(f"{name:12s} {img_format:4s} q={quality:3d}  real {real / 1e6:7.3f} MB  "
+                  f"sampled {sampled / 1e6:7.3f} MB  ratio {real / sampled:5.2f}  "
+                  f"encode {full_time * 1000:7.1f} ms  sample {sample_time * 1000:5.1f} ms")
+
+    print()
+    for img_format, values in ratios.items():
+        mean = sum(values) / len(values)
+        error = sum(abs(value / mean - 1) for value in values) / len(values)
+        print(f"{img_format}: mean ratio {mean:.3f}, mean error after calibration {error * 100:.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+from PyQt5.QtWidgets import QGraphicsItem
+from PyQt5.QtCore import Qt, QRectF
+from PyQt5.QtGui import QPainter
+
+class AnnotationItem(QGraphicsItem):
+    """Draws an image's annotation layer live, above its pixmap"""
+
+    def __init__(self, layer, rect, parent=None):
+        super().__init__(parent)
+        self.layer = layer
+        self.rect = QRectF(rect)
+        
+        # Repaints cover only the area that changed, e.g. the latest stroke segment
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        
+        # Purely visual; clicks go to the tools and items underneath
+        self.setAcceptedMouseButtons(Qt.NoButton)
+        self.setAcceptHoverEvents(False)
+
+    def boundingRect(self):
+        return self.rect
+
+    def paint(self, painter, option, widget=None):
+        # Clip to the image, as annotations burned into it would be
+        painter.save()
+        painter.setClipRect(self.rect)
+        painter.setRenderHint(QPainter.Antialiasing)
+        self.layer.paint(painter, option.exposedRect)
+        painter.restore()
@@ -1,7 +1,8 @@
-from PyQt5.QtWidgets import QGraphicsRectItem, QGraphicsLineItem, QGraphicsPixmapItem, QGraphicsEllipseItem
+from PyQt5.QtWidgets import QGraphicsRectItem, QGraphicsLineItem, QGraphicsEllipseItem
 from PyQt5.QtCore import Qt, QRectF, QPointF, QLineF
-from PyQt5.QtGui import QPen, QBrush, QPainter, QTransform
+from PyQt5.QtGui import QPen, QBrush, QTransform
 import math
+from image_resizer.utils.operations import ShapeOperation
 
 class BaseShapeHandler:
     def __init__(self, app):
@@ -81,72 +82,34 @@ class BaseShapeHandler:
             # First remove all handles from scene
             self.clear_handles()
             
-            # Find the pixmap item and create a clean copy
-            pixmap = None
-            for item in self.app.scene.items():
-                if isinstance(item, QGraphicsPixmapItem):
-                    pixmap = item.pixmap().copy()
-                    break
-                    
-            if pixmap and shape.scene():
-                # Create a new painter for the pixmap
-                painter = QPainter(pixmap)
-                painter.setPen(pen)
-                painter.setRenderHint(QPainter.Antialiasing)
-                
-                # Draw the shape on the pixmap
+            if shape.scene():
+                # Describe the shape in image coordinates
                 if isinstance(shape, QGraphicsLineItem):
                     line = shape.line()
                     line.translate(shape.pos())
-                    painter.drawLine(line)
-                    
-                    # Draw arrow head if this is an arrow shape
                     if shape.data(0) == "arrow":
-                        # Get the arrow's stored properties
-                        arrow_size = shape.data(1)
-                        
-                        # Calculate endpoint in pixmap coordinates
-                        p2 = line.p2()
-                        
-                        # Calculate angle
-                        angle = math.atan2(line.dy(), line.dx())
-                        
-                        # Calculate arrow points directly
-                        arrow_p1 = QPointF(
-                            p2.x() - arrow_size * math.cos(angle + math.pi/6),
-                            p2.y() - arrow_size * math.sin(angle + math.pi/6)
-                        )
-                        
-                        arrow_p2 = QPointF(
-                            p2.x() - arrow_size * math.cos(angle - math.pi/6),
-                            p2.y() - arrow_size * math.sin(angle - math.pi/6)
-                        )
-                        
-                        # Draw arrow head
-                        painter.drawLine(p2, arrow_p1)
-                        painter.drawLine(p2, arrow_p2)
+                        operation = ShapeOperation('arrow', line, pen, shape.data(1))
+                    else:
+                        operation = ShapeOperation('line', line, pen)
                 elif isinstance(shape, QGraphicsEllipseItem):
                     rect = shape.rect()
                     rect.translate(shape.pos())
-                    painter.drawEllipse(rect)
-                elif isinstance(shape, QGraphicsRectItem):
+                    operation = ShapeOperation('ellipse', rect, pen)
+                else:
                     rect = shape.rect()
                     rect.translate(shape.pos())
-                    painter.drawRect(rect)
+                    operation = ShapeOperation('rect', rect, pen)
                 
-                painter.end()
-                
-                # Save state before updating scene
-                self.app.image_handler.save_state()
-                
-                # Update scene with clean pixmap
-                self.app.scene.clear()
-                pixmap_item = self.app.scene.addPixmap(pixmap)
-                
-                # Make sure we don't have any artifacts from old shapes
-                for item in self.app.scene.items():
-                    if not isinstance(item, QGraphicsPixmapItem):
-                        self.app.scene.removeItem(item)
+                # The annotation layer draws the shape from now on, in place of the editable item
+                annotations = self.app.image_handler.annotation_item()
+                self.app.scene.removeItem(shape)
+                self.selected_shape = None
+                if annotations:
+                    annotations.layer.add(operation)
+                    annotations.update()
+                    
+                    # Save state with the shape recorded as a vector annotation
+                    self.app.image_handler.save_state()
 
             # Deselect the current tool
             if hasattr(self.app, 'tool_manager'):
@@ -0,0 +1,20 @@
+from PyQt5.QtWidgets import QGraphicsItem
+from PyQt5.QtCore import Qt, QRectF
+
+class CanvasItem(QGraphicsItem):
+    """Shows a QImage that a tool paints into in place, repainting only what changed"""
+
+    def __init__(self, image, parent=None):
+        super().__init__(parent)
+        self.image = image
+        
+        # Paint only the exposed part of the image, not all of it on every update
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        self.setAcceptedMouseButtons(Qt.NoButton)
+
+    def boundingRect(self):
+        return QRectF(self.image.rect())
+
+    def paint(self, painter, option, widget=None):
+        rect = QRectF(option.exposedRect.toAlignedRect().intersected(self.image.rect()))
+        painter.drawImage(rect, self.image, rect)
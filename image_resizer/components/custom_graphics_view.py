@@ -10,7 +10,9 @@ class CustomGraphicsView(QGraphicsView):
         self.setRenderHint(QPainter.SmoothPixmapTransform)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        # Repaint only the regions items mark as changed, so drawing on a large
+        # image doesn't rescale the whole pixmap for every mouse move
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
         
         # Enable mouse tracking for better text tool interaction
         self.setMouseTracking(True)
@@ -1,4 +1,5 @@
 from PyQt5.QtCore import QObject
+from image_resizer.utils.strokes import tolerance_for_scale
 
 class BaseTool:
     def __init__(self, app):
@@ -21,6 +22,15 @@ class BaseTool:
     def mouse_move(self, event):
         pass
 
+    def stroke_tolerance(self):
+        """How far, in image pixels, a stroke point can move without it showing at the current zoom"""
+        return tolerance_for_scale(self.app.view.transform().m11())
+
+    def mouse_move_batch(self, event, points):
+        """Moves collected over one frame: the latest event and every scene position in order"""
+        # Tools that only follow the pointer need just the latest position
+        self.mouse_move(event)
+
     def mouse_release(self, event):
         """Base mouse release handler that deselects the tool"""
         # Deselect the tool after use
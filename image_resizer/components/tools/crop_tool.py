@@ -1,6 +1,6 @@
 from PyQt5.QtWidgets import QGraphicsRectItem, QGraphicsPixmapItem, QGraphicsPathItem
 from PyQt5.QtCore import Qt, QRectF
-from PyQt5.QtGui import QPen, QColor, QPainterPath
+from PyQt5.QtGui import QPen, QColor, QPainterPath, QTransform
 from .base_tool import BaseTool
 
 class CropTool(BaseTool):
@@ -88,12 +88,9 @@ class CropTool(BaseTool):
             return
         
         try:
-            # Get current file path
-            current_item = self.app.image_list.currentItem()
-            if not current_item:
-                return
-            file_path = self.app.image_handler.get_file_path_from_item(current_item)
-            if not file_path:
+            # Get the current image
+            record = self.app.image_handler.current_record()
+            if not record:
                 return
             
             # Get crop rectangle
@@ -116,7 +113,8 @@ class CropTool(BaseTool):
                 return
             
             # Get the cropped portion of the image
-            cropped = original_pixmap.copy(rect.toRect())
+            crop_rect = rect.toRect()
+            cropped = original_pixmap.copy(crop_rect)
             
             # Clear scene and add cropped image
             self.app.scene.clear()
@@ -126,16 +124,20 @@ class CropTool(BaseTool):
             # Set scene rect to match the cropped image size
             self.app.scene.setSceneRect(0, 0, cropped.width(), cropped.height())
             
+            # Annotations stay vectors; shift them into the cropped image's coordinates
+            layer = record.annotations
+            if layer:
+                layer.transform(QTransform.fromTranslate(-crop_rect.x(), -crop_rect.y()))
+            self.app.image_handler.show_annotations(record)
+            
             # Save state AFTER applying the crop
             self.app.image_handler.save_state()
             
             # Use the helper method to properly fit the image
             self.app.image_handler.fit_image_to_view()
             
-            # Update dimensions and store edited version
-            self.app.image_handler.current_dimensions[file_path] = (cropped.width(), cropped.height())
-            self.app.image_handler.edited_file_sizes[file_path] = self.app.image_handler.calculate_file_size(cropped)
-            self.app.image_handler.edited_images[file_path] = cropped
+            # Update dimensions; save_state stored the edited version
+            record.size = (cropped.width(), cropped.height())
             
             # Update info labels
             self.app.image_handler.update_info_label()
@@ -1,12 +1,15 @@
 from PyQt5.QtWidgets import QGraphicsPixmapItem, QGraphicsRectItem, QGraphicsEllipseItem
-from PyQt5.QtGui import QPainter, QPen, QColor, QBrush
+from PyQt5.QtGui import QPainter, QPen, QColor, QBrush, QPainterPath, QPixmap
 from PyQt5.QtCore import Qt, QRectF
 from .base_tool import BaseTool
+from image_resizer.components.canvas_item import CanvasItem
+from image_resizer.utils.strokes import thin_points, simplify_points
 
 class EraserTool(BaseTool):
     def __init__(self, app):
         super().__init__(app)
-        self.temp_image = None
+        self.pixmap_item = None  # Image item being erased, hidden during a stroke
+        self.canvas = None  # CanvasItem showing the stroke's working image
         self.erasing = False
         self.line_width = 10  # Default eraser size (wider than pencil)
         self.width_multiplier = 3  # Eraser size multiplier 
@@ -15,7 +18,7 @@ class EraserTool(BaseTool):
         self.cursor_item = None  # Visual indicator for eraser boundary
         self.color_mode = False  # False = transparent erasing, True = color erasing
         self.current_color = QColor(Qt.black)  # Default color for color mode
-        self.current_image_path = None  # Track which image we're erasing
+        self.image_record = None  # Track which image we're erasing
     
     @property
     def actual_line_width(self):
@@ -55,16 +58,10 @@ class EraserTool(BaseTool):
            hasattr(self.app, 'scene'))
 
     def activate(self):
-        # Get current image path
-        current_item = self.app.image_list.currentItem()
-        if current_item:
-            self.current_image_path = self.app.image_handler.get_file_path_from_item(current_item)
-        
-        # Store the current image when tool is activated
-        for item in self.app.scene.items():
-            if isinstance(item, QGraphicsPixmapItem):
-                self.temp_image = item.pixmap().copy()
-                break
+        # Get current image
+        record = self.app.image_handler.current_record()
+        if record:
+            self.image_record = record
         
         # Remove any existing cursor first
         self.remove_cursor_safely()
@@ -78,11 +75,12 @@ class EraserTool(BaseTool):
             self.current_color = self.app.tool_manager.current_color
                 
     def deactivate(self):
+        # Keep what was erased if the tool is switched mid-stroke
+        self.finish_stroke()
         super().deactivate()
-        self.temp_image = None
         self.erasing = False
         self.last_point = None
-        self.current_image_path = None
+        self.image_record = None
         
         # Remove cursor indicator safely
         self.remove_cursor_safely()
@@ -167,21 +165,35 @@ class EraserTool(BaseTool):
         self.update_cursor_appearance()
         
     def mouse_press(self, event):
-        # Update the current image path before we start erasing
-        current_item = self.app.image_list.currentItem()
-        if current_item:
-            self.current_image_path = self.app.image_handler.get_file_path_from_item(current_item)
+        # Update the current image before we start erasing
+        record = self.app.image_handler.current_record()
+        if record:
+            self.image_record = record
             
         pos = self.app.view.mapToScene(event.pos())
-        self.erasing = True
-        self.last_point = pos
         
-        # Find and store the current pixmap and save state
+        # Erasing edits pixels, so draw the annotations into them first
+        self.app.image_handler.flatten_annotations()
+        
+        # Find the image and save state before anything is erased
+        self.pixmap_item = None
         for item in self.app.scene.items():
             if isinstance(item, QGraphicsPixmapItem):
-                self.temp_image = item.pixmap().copy()
-                self.app.image_handler.save_state()  # Save state when starting to erase
+                self.pixmap_item = item
                 break
+        if not self.pixmap_item:
+            return
+        self.app.image_handler.save_state()  # Save state when starting to erase
+        
+        # Erase into an image shown in place of the pixmap, so each move only
+        # repaints the area it touched
+        self.canvas = CanvasItem(self.pixmap_item.pixmap().toImage())
+        self.canvas.setZValue(self.pixmap_item.zValue())
+        self.app.scene.addItem(self.canvas)
+        self.pixmap_item.hide()
+        
+        self.erasing = True
+        self.last_point = pos
                 
         # Apply the first eraser mark
         self.erase_at_position(pos)
@@ -192,175 +204,136 @@ class EraserTool(BaseTool):
             pos = self.app.view.mapToScene(event.pos())
         except (RuntimeError, ReferenceError):
             return
+        self.mouse_move_batch(event, [pos])
+
+    def mouse_move_batch(self, event, points):
+        pos = points[-1]
         
         # Update cursor position even if not erasing
         self.update_cursor_position(pos)
         
         # Verify we're still on the same image
-        current_item = self.app.image_list.currentItem()
-        if current_item:
-            current_path = self.app.image_handler.get_file_path_from_item(current_item)
-            if current_path != self.current_image_path:
+        if self.app.image_list.currentIndex().isValid():
+            if self.app.image_handler.current_record() is not self.image_record:
                 self.erasing = False
                 self.last_point = None
                 return
         
-        if not self.erasing or not self.temp_image:
+        if not self.erasing or not self.canvas:
             return
             
         if self.last_point:
-            # Erase along the path from last point to current point
-            painter = QPainter(self.temp_image)
-            
-            # Set composition mode based on erasing mode
-            if self.color_mode:
-                painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
-            else:
-                painter.setCompositionMode(QPainter.CompositionMode_Source)
-            
-            # Set up the brush/pen for erasing
-            color = self.current_color if self.color_mode else Qt.transparent
-            pen = QPen(color, self.actual_line_width, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
-            brush = QBrush(color)
-            painter.setPen(pen)
-            painter.setBrush(brush)
-            
-            # For smoother erasing, draw multiple points along the line
-            # Calculate Manhattan distance between points
-            manhattan_distance = abs(self.last_point.x() - pos.x()) + abs(self.last_point.y() - pos.y())
-            steps = max(int(manhattan_distance / 2), 1)
+            # Points that would not change what is erased are skipped
+            tolerance = self.stroke_tolerance()
+            points = thin_points(points, self.last_point, tolerance)
+            if not points:
+                return
+            points = simplify_points([self.last_point] + points, tolerance)[1:]
             
-            for i in range(steps + 1):
-                t = i / steps if steps > 0 else 0
-                x = self.last_point.x() * (1 - t) + pos.x() * t
-                y = self.last_point.y() * (1 - t) + pos.y() * t
-                
-                if self.square_eraser:
-                    # Draw a square
-                    half_width = self.actual_line_width / 2
-                    painter.fillRect(QRectF(x - half_width, y - half_width, 
-                                          self.actual_line_width, self.actual_line_width), 
-                                   color)
-                else:
-                    # Draw a circle
-                    painter.drawEllipse(x - self.actual_line_width/2, y - self.actual_line_width/2, 
-                                      self.actual_line_width, self.actual_line_width)
+            # Erase along the path through every point since the last frame
+            path = QPainterPath(self.last_point)
+            for point in points:
+                path.lineTo(point)
+            cap = Qt.SquareCap if self.square_eraser else Qt.RoundCap
+            pen = QPen(self.eraser_color(), self.actual_line_width, Qt.SolidLine, cap, Qt.RoundJoin)
             
+            painter = self.eraser_painter()
+            painter.strokePath(path, pen)
             painter.end()
             
-            # Store the cursor item's scene and remove it before clearing the scene
-            self.remove_cursor_safely()
-            
-            try:
-                # Update scene with temporary image
-                self.app.scene.clear()
-                self.app.scene.addPixmap(self.temp_image)
-                
-                # Re-add the cursor after the pixmap
-                self.create_cursor_indicator()
-                self.update_cursor_position(pos)
-                
-                self.app.image_handler.update_info_label()
-                self.last_point = pos
-            except (RuntimeError, ReferenceError):
-                # Scene might have been deleted or changed
-                self.erasing = False
-                self.last_point = None
+            # Square caps reach out to half the diagonal from each segment's ends
+            margin = self.actual_line_width * 0.75 + 1
+            start = self.last_point
+            for point in points:
+                self.update_canvas(QRectF(start, point).normalized().adjusted(-margin, -margin, margin, margin))
+                start = point
+            self.last_point = points[-1]
 
-    def erase_at_position(self, pos):
-        """Erase at a specific position"""
-        if not self.temp_image:
-            return
-            
-        painter = QPainter(self.temp_image)
+    def eraser_color(self):
+        """Transparent, or the selected color in color mode"""
+        return self.current_color if self.color_mode else QColor(Qt.transparent)
+
+    def eraser_painter(self):
+        """Painter on the stroke's working image, set up for the current mode"""
+        painter = QPainter(self.canvas.image)
         
         # Set composition mode based on erasing mode
         if self.color_mode:
             painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
         else:
             painter.setCompositionMode(QPainter.CompositionMode_Source)
-        
-        # Use transparent color or the selected color
-        color = self.current_color if self.color_mode else Qt.transparent
+        return painter
+
+    def update_canvas(self, rect):
+        try:
+            self.canvas.update(rect)
+        except (RuntimeError, ReferenceError):
+            # Scene might have been cleared while erasing
+            self.canvas = None
+            self.pixmap_item = None
+            self.erasing = False
+            self.last_point = None
+
+    def erase_at_position(self, pos):
+        """Erase at a specific position"""
+        if not self.canvas:
+            return
+            
+        painter = self.eraser_painter()
+        color = self.eraser_color()
+        width = self.actual_line_width
+        rect = QRectF(pos.x() - width/2, pos.y() - width/2, width, width)
         
         if self.square_eraser:
             # Draw a square
-            half_width = self.actual_line_width / 2
-            painter.fillRect(QRectF(pos.x() - half_width, pos.y() - half_width, 
-                                  self.actual_line_width, self.actual_line_width), 
-                           color)
+            painter.fillRect(rect, color)
         else:
             # Draw a circle
-            pen = QPen(color, 1)
-            brush = QBrush(color)
-            painter.setPen(pen)
-            painter.setBrush(brush)
-            painter.drawEllipse(pos.x() - self.actual_line_width/2, pos.y() - self.actual_line_width/2, 
-                              self.actual_line_width, self.actual_line_width)
+            painter.setPen(QPen(color, 1))
+            painter.setBrush(QBrush(color))
+            painter.drawEllipse(rect)
         
         painter.end()
-        
-        # Store the cursor item's scene and remove it before clearing the scene
-        self.remove_cursor_safely()
-        
+        self.update_canvas(rect.adjusted(-1, -1, 1, 1))
+
+    def finish_stroke(self):
+        """Put the erased image back into the scene's pixmap item"""
+        canvas, pixmap_item = self.canvas, self.pixmap_item
+        self.canvas = None
+        self.pixmap_item = None
+        if not canvas:
+            return False
         try:
-            # Update scene with temporary image
-            self.app.scene.clear()
-            self.app.scene.addPixmap(self.temp_image)
-            
-            # Re-add the cursor after the pixmap
-            self.create_cursor_indicator()
-            self.update_cursor_position(pos)
-            
-            self.app.image_handler.update_info_label()
+            pixmap_item.setPixmap(QPixmap.fromImage(canvas.image))
+            pixmap_item.show()
+            self.app.scene.removeItem(canvas)
         except (RuntimeError, ReferenceError):
             # Scene might have been deleted or changed
-            pass
+            return False
+        
+        # Update edited images dictionary with the erased image
+        if self.image_record:
+            self.image_record.edited = pixmap_item.pixmap()
+        return True
 
     def mouse_release(self, event):
         # Verify we're still on the same image
-        current_item = self.app.image_list.currentItem()
-        if current_item:
-            current_path = self.app.image_handler.get_file_path_from_item(current_item)
-            if current_path != self.current_image_path:
+        if self.app.image_list.currentIndex().isValid():
+            if self.app.image_handler.current_record() is not self.image_record:
                 self.erasing = False
                 self.last_point = None
                 return
                 
-        if not self.erasing or not self.temp_image:
+        if not self.erasing or not self.canvas:
             self.erasing = False
             self.last_point = None
             return
             
-        try:
-            # Get position
-            pos = self.app.view.mapToScene(event.pos())
-            
-            # Store the cursor item's scene and remove it before clearing the scene
-            self.remove_cursor_safely()
-            
-            # Update edited images dictionary with current image
-            if self.current_image_path and self.temp_image:
-                self.app.image_handler.edited_images[self.current_image_path] = self.temp_image.copy()
-            
-            # Don't save state here since we already saved it at start
-            self.app.scene.clear()
-            self.app.scene.addPixmap(self.temp_image)
-            
-            # Re-add cursor after clearing the scene
-            self.create_cursor_indicator()
-            
-            # Update cursor position
-            self.update_cursor_position(pos)
-            
+        if self.finish_stroke():
             self.app.image_handler.update_info_label()
             
             # Save state after completing eraser action to ensure it's not lost
             self.app.image_handler.save_state()
             
-        except (RuntimeError, ReferenceError):
-            # Scene might have been deleted or changed
-            pass
-            
         self.erasing = False
-        self.last_point = None 
\ No newline at end of file
+        self.last_point = None
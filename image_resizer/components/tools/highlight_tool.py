@@ -1,33 +1,27 @@
-from PyQt5.QtWidgets import QGraphicsPixmapItem
-from PyQt5.QtGui import QPainter, QPen, QColor, QBrush, QPainterPath
-from PyQt5.QtCore import Qt, QRectF, QPointF
+from PyQt5.QtGui import QColor
+from PyQt5.QtCore import Qt
 from .base_tool import BaseTool
+from image_resizer.utils.operations import HighlightOperation
+from image_resizer.utils.strokes import thin_points
 
 class HighlightTool(BaseTool):
     def __init__(self, app):
         super().__init__(app)
-        self.temp_image = None
+        self.annotations = None  # Scene item drawing the image's annotation layer
+        self.stroke = None  # Highlight being drawn
         self.current_color = Qt.yellow  # Default color
         self.line_width = 10  # Default line width - wider than pencil
         self.width_multiplier = 10  # Multiplier for thickness (increased to 10)
         self.opacity = 0.1  # Default opacity for highlighting
         self.drawing = False
         self.last_point = None
-        self.path_points = []  # Store points for the current stroke
-
-    def activate(self):
-        # Store the current image when tool is activated
-        for item in self.app.scene.items():
-            if isinstance(item, QGraphicsPixmapItem):
-                self.temp_image = item.pixmap().copy()
-                break
 
     def deactivate(self):
         super().deactivate()
-        self.temp_image = None
+        self.annotations = None
+        self.stroke = None
         self.drawing = False
         self.last_point = None
-        self.path_points = []  # Clear the path points
 
     def set_current_color(self, color):
         """Set the current color for highlighting (overrides the one in BaseTool)"""
@@ -48,105 +42,44 @@ class HighlightTool(BaseTool):
         
     def mouse_press(self, event):
         pos = self.app.view.mapToScene(event.pos())
+        self.annotations = self.app.image_handler.annotation_item()
+        if not self.annotations:
+            return
         self.drawing = True
         self.last_point = pos
         
-        # Reset path points
-        self.path_points = [pos]
-        
-        # Find and store the current pixmap and save state
-        for item in self.app.scene.items():
-            if isinstance(item, QGraphicsPixmapItem):
-                self.temp_image = item.pixmap().copy()
-                self.app.image_handler.save_state()  # Save state when starting to draw
-                break
-        
-        # We'll draw the entire highlight at once, so we don't need to draw on mouse press
+        # The whole stroke is drawn as one path, so the highlight stays uniform where it overlaps
+        self.stroke = HighlightOperation(self.get_highlight_color(), self.actual_width, [pos])
+        self.annotations.layer.add(self.stroke)
 
     def mouse_move(self, event):
-        if not self.drawing or not self.temp_image:
-            return
-            
-        pos = self.app.view.mapToScene(event.pos())
-        if self.last_point:
-            # Add point to path
-            self.path_points.append(pos)
-            
-            # Create a temporary image for this stroke
-            temp_image_copy = self.temp_image.copy()
-            
-            # Draw the complete path
-            self.draw_uniform_highlight(temp_image_copy)
-            
-            # Update scene with temporary image
-            self.app.scene.clear()
-            self.app.scene.addPixmap(temp_image_copy)
-            self.app.image_handler.update_info_label()
-            self.last_point = pos
+        self.mouse_move_batch(event, [self.app.view.mapToScene(event.pos())])
 
-    def draw_uniform_highlight(self, pixmap):
-        """Draw a uniform highlight along the entire path"""
-        if not self.path_points or len(self.path_points) < 2:
+    def mouse_move_batch(self, event, points):
+        if not self.drawing or not self.stroke or not self.last_point:
             return
             
-        painter = QPainter(pixmap)
-        highlight_color = self.get_highlight_color()
-        
-        # Use SourceOver mode for natural alpha blending
-        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
-        
-        # Setup painter with high quality
-        painter.setRenderHint(QPainter.Antialiasing, True)
-        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
-        
-        # Create a better path for highlighting with proper square ends
-        path = QPainterPath()
-        
-        # Get the path points
-        first_point = self.path_points[0]
-        last_point = self.path_points[-1]
-        
-        # Start path
-        path.moveTo(first_point)
-        
-        # Add all intermediate points
-        for point in self.path_points[1:]:
-            path.lineTo(point)
-        
-        # Create a pen with square cap style for proper highlighting
-        pen = QPen(highlight_color, self.actual_width)
-        pen.setCapStyle(Qt.SquareCap)  # Square caps for better highlighting coverage
-        pen.setJoinStyle(Qt.RoundJoin)  # Round joins for smoother corners
-        
-        # Set the pen
-        painter.setPen(pen)
-        
-        # Draw the path with the thick pen
-        painter.drawPath(path)
-        
-        painter.end()
+        # Only the new segments need repainting; the path is still stroked
+        # in one call within them, so overlaps stay evenly translucent
+        for pos in thin_points(points, self.last_point, self.stroke_tolerance()):
+            self.stroke.add_point(pos)
+            self.annotations.update(self.stroke.segment_rect(len(self.stroke.points) - 1))
+            self.last_point = pos
 
     def mouse_release(self, event):
-        if not self.drawing or not self.path_points:
-            self.drawing = False
-            self.last_point = None
-            self.path_points = []
-            return
-            
-        # Create final highlight
-        if self.temp_image:
-            temp_image_copy = self.temp_image.copy()
-            self.draw_uniform_highlight(temp_image_copy)
-            
-            # Update the temp_image with the final result
-            self.temp_image = temp_image_copy
-            
-            # Clear scene and show the result
-            self.app.scene.clear()
-            self.app.scene.addPixmap(self.temp_image)
-            self.app.image_handler.update_info_label()
+        if self.stroke:
+            if len(self.stroke.points) > 1:
+                # Keep only the points that shape the highlight
+                dirty = self.stroke.bounding_rect()
+                self.stroke.simplify(self.stroke_tolerance())
+                self.annotations.update(dirty.united(self.stroke.bounding_rect()))
+                
+                # Record the finished highlight as a vector annotation
+                self.app.image_handler.save_state()
+            else:
+                self.annotations.layer.remove(self.stroke)
         
         # Reset state
+        self.stroke = None
         self.drawing = False
         self.last_point = None
-        self.path_points = [] 
\ No newline at end of file
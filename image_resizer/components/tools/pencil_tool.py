@@ -1,61 +1,59 @@
-from PyQt5.QtWidgets import QGraphicsPixmapItem
-from PyQt5.QtGui import QPainter, QPen
 from PyQt5.QtCore import Qt
 from .base_tool import BaseTool
+from image_resizer.utils.operations import StrokeOperation
+from image_resizer.utils.strokes import thin_points
 
 class PencilTool(BaseTool):
     def __init__(self, app):
         super().__init__(app)
-        self.temp_image = None
+        self.annotations = None  # Scene item drawing the image's annotation layer
+        self.stroke = None
         self.current_color = Qt.red  # Default color
         self.line_width = 2  # Default line width
 
-    def activate(self):
-        # Store the current image when tool is activated
-        for item in self.app.scene.items():
-            if isinstance(item, QGraphicsPixmapItem):
-                self.temp_image = item.pixmap().copy()
-                break
-
     def deactivate(self):
         super().deactivate()
-        self.temp_image = None
+        self.annotations = None
+        self.stroke = None
 
     def mouse_press(self, event):
         pos = self.app.view.mapToScene(event.pos())
+        self.annotations = self.app.image_handler.annotation_item()
+        if not self.annotations:
+            return
         self.drawing = True
         self.last_point = pos
         
-        # Find and store the current pixmap and save state
-        for item in self.app.scene.items():
-            if isinstance(item, QGraphicsPixmapItem):
-                self.temp_image = item.pixmap().copy()
-                self.app.image_handler.save_state()  # Save state when starting to draw
-                break
+        # The stroke joins the annotation layer and is drawn live from its points
+        self.stroke = StrokeOperation(self.current_color, self.line_width, [pos])
+        self.annotations.layer.add(self.stroke)
 
     def mouse_move(self, event):
-        if not self.drawing or not self.temp_image:
+        self.mouse_move_batch(event, [self.app.view.mapToScene(event.pos())])
+
+    def mouse_move_batch(self, event, points):
+        if not self.drawing or not self.stroke or not self.last_point:
             return
             
-        pos = self.app.view.mapToScene(event.pos())
-        if self.last_point:
-            painter = QPainter(self.temp_image)
-            painter.setPen(QPen(self.current_color, self.line_width))
-            painter.setRenderHint(QPainter.Antialiasing)
-            painter.drawLine(self.last_point, pos)
-            painter.end()
-            
-            # Update scene with temporary image
-            self.app.scene.clear()
-            self.app.scene.addPixmap(self.temp_image)
-            self.app.image_handler.update_info_label()
+        # Repaint just the new segments; the image and earlier strokes stay as drawn.
+        # The view merges the rects and paints once for the whole batch
+        for pos in thin_points(points, self.last_point, self.stroke_tolerance()):
+            self.stroke.add_point(pos)
+            self.annotations.update(self.stroke.segment_rect(len(self.stroke.points) - 1))
             self.last_point = pos
 
     def mouse_release(self, event):
         self.drawing = False
         self.last_point = None
-        if self.temp_image:
-            # Don't save state here since we already saved it at start
-            self.app.scene.clear()
-            self.app.scene.addPixmap(self.temp_image)
-            self.app.image_handler.update_info_label() 
\ No newline at end of file
+        if self.stroke:
+            if len(self.stroke.points) > 1:
+                # Keep only the points that shape the stroke, so it stays cheap to draw and replay
+                dirty = self.stroke.bounding_rect()
+                self.stroke.simplify(self.stroke_tolerance())
+                self.annotations.update(dirty.united(self.stroke.bounding_rect()))
+                
+                # Record the finished stroke; the history keeps its points, not its pixels
+                self.app.image_handler.save_state()
+            else:
+                self.annotations.layer.remove(self.stroke)
+        self.stroke = None
@@ -1,12 +1,11 @@
 from PyQt5.QtWidgets import (QGraphicsTextItem, QWidget, QHBoxLayout, 
                            QFontComboBox, QSpinBox, QToolButton, QColorDialog,
                            QGraphicsItem, QApplication, QGraphicsDropShadowEffect)
-from PyQt5.QtGui import (QFont, QPen, QColor, QTextCursor, QPainter, 
-                        QCursor, QPixmap, QImage, QTextCharFormat)
-from PyQt5.QtCore import Qt, QRectF, QTimer, QBuffer, QPointF
-from PIL import Image
-import io
+from PyQt5.QtGui import (QFont, QPen, QColor, QTextCursor, 
+                        QCursor, QImage, QTextCharFormat)
+from PyQt5.QtCore import Qt, QRectF, QTimer
 from .base_tool import BaseTool
+from image_resizer.utils.operations import TextOperation
 from image_resizer.ui.styles import TEXT_TOOL_TOOLBAR_STYLE, FONT_COMBO_STYLE, COMBO_SPINBOX_STYLE
 
 class TextFormatToolbar(QWidget):
@@ -383,84 +382,41 @@ class TextTool(BaseTool):
         pass
 
     def apply_text(self):
-        """Apply text by rendering it onto the image"""
+        """Apply text as an annotation drawn over the image"""
         self.prevent_deactivation = False  # Allow deactivation when applying
         if self.text_item and self.text_item.toPlainText().strip():
-            # Save current state before applying text
-            current_state = self.app.image_handler.current_image.copy()
-            
             # Get the text item's position and bounds
             scene_pos = self.text_item.scenePos()
             bounds = self.text_item.boundingRect()
             
-            # Create a temporary pixmap to render the text
-            temp_pixmap = QPixmap(bounds.size().toSize())
-            temp_pixmap.fill(Qt.transparent)
-            
-            # Create painter for the temporary pixmap
-            painter = QPainter(temp_pixmap)
-            painter.setRenderHint(QPainter.Antialiasing)
-            painter.setRenderHint(QPainter.TextAntialiasing)
-            
             # Create a copy of the document to preserve color
             doc = self.text_item.document().clone()
             
             # Apply text color to the entire document
             text_color = self.text_item.defaultTextColor()
-            text_format = doc.rootFrame().frameFormat()
             char_format = QTextCharFormat()
             char_format.setForeground(text_color)
             cursor = QTextCursor(doc)
             cursor.select(QTextCursor.Document)
             cursor.mergeCharFormat(char_format)
+            operation = TextOperation(doc, scene_pos, bounds.size().toSize())
             
-            # Draw the document with color
-            doc.drawContents(painter, QRectF(0, 0, bounds.width(), bounds.height()))
-            painter.end()
-            
-            # Find the image item in the scene
-            image_item = None
-            for item in self.app.scene.items():
-                if hasattr(item, 'pixmap'):
-                    image_item = item
-                    break
-                    
-            if not image_item:
+            # The annotation layer draws the text from now on
+            annotations = self.app.image_handler.annotation_item()
+            if not annotations:
                 return
-                
-            # Create a copy to paint on
-            target_pixmap = image_item.pixmap().copy()
-            
-            # Create painter for the target pixmap
-            painter = QPainter(target_pixmap)
-            painter.setRenderHint(QPainter.Antialiasing)
-            painter.setRenderHint(QPainter.TextAntialiasing)
-            
-            # Draw the temporary pixmap onto the target at the correct position
-            painter.drawPixmap(QPointF(scene_pos.x(), scene_pos.y()), temp_pixmap)
-            painter.end()
             
             # Remove the text item from scene
             self.app.scene.removeItem(self.text_item)
             self.text_item = None
             
-            # Update the scene with the new pixmap
-            image_item.setPixmap(target_pixmap)
-            
-            # Convert QPixmap to PIL Image and update image handler
-            image = target_pixmap.toImage()
-            buffer = QBuffer()
-            buffer.open(QBuffer.ReadWrite)
-            image.save(buffer, "PNG")
+            # Keep the document as a vector annotation, drawn above the image
+            annotations.layer.add(operation)
+            annotations.update()
             
-            pil_image = Image.open(io.BytesIO(buffer.data()))
-            
-            # Save the current state before updating
+            # Save the current state; the history keeps the document, not its pixels
             self.app.image_handler.save_state()
             
-            # Update the current image
-            self.app.image_handler.current_image = pil_image
-            
         else:
             # Remove empty text item
             if self.text_item:
@@ -1,6 +1,6 @@
 from PyQt5.QtWidgets import QGraphicsPixmapItem
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QColor, QGuiApplication, QMouseEvent
 from image_resizer.components.tools.crop_tool import CropTool
 from image_resizer.components.tools.pencil_tool import PencilTool
 from image_resizer.components.tools.arrow_tool import ArrowTool
@@ -28,9 +28,20 @@ class ToolManager:
             'eraser': EraserTool(app),
             # We'll add other tools here later
         }
+        
+        # Mouse moves arrive faster than the screen refreshes, so they are collected
+        # and handed to the tool at most once per frame
+        self.pending_event = None  # Copy of the latest move
+        self.pending_points = []  # Scene positions of every move since the last frame
+        self.frame_timer = QTimer()
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.timeout.connect(self.next_frame)
 
     def set_tool(self, tool_name):
         """Set the current tool"""
+        # Moves already made belong to the outgoing tool
+        self.flush_mouse_moves()
+        
         # Finalize any active shapes on the current tool
         if self.current_tool and hasattr(self.current_tool, 'shape_handler'):
             self.current_tool.shape_handler.finalize_shape()
@@ -42,6 +53,8 @@ class ToolManager:
         # Set new tool
         self.current_tool = self.tools.get(tool_name)
         if self.current_tool:
+            # Tools draw on the scene pixmap, so replace any preview with full resolution
+            self.app.image_handler.ensure_full_resolution()
             self.current_tool.activate()
             # Set the current color for the new tool
             if hasattr(self.current_tool, 'current_color'):
@@ -135,13 +148,47 @@ class ToolManager:
                     self.current_tool.arrow_item.setPen(pen)
 
     def handle_mouse_press(self, event):
+        self.flush_mouse_moves()
         if self.current_tool:
             self.current_tool.mouse_press(event)
 
     def handle_mouse_move(self, event):
-        if self.current_tool:
-            self.current_tool.mouse_move(event)
+        if not self.current_tool:
+            return
+        # Qt reuses the event once the handler returns, so keep a copy
+        self.pending_event = QMouseEvent(event.type(), event.localPos(), event.windowPos(),
+                                         event.screenPos(), event.button(), event.buttons(),
+                                         event.modifiers())
+        self.pending_points.append(self.app.view.mapToScene(event.pos()))
+        
+        # The first move after a pause goes straight through; later ones wait for the next frame
+        if not self.frame_timer.isActive():
+            self.next_frame()
 
     def handle_mouse_release(self, event):
+        self.flush_mouse_moves()
+        if self.current_tool:
+            self.current_tool.mouse_release(event)
+
+    def frame_interval(self):
+        """Milliseconds between screen refreshes"""
+        screen = QGuiApplication.primaryScreen()
+        rate = screen.refreshRate() if screen else 0
+        return max(1, int(1000 / rate)) if rate > 0 else 16
+
+    def next_frame(self):
+        """Hand the moves collected during the last frame to the tool"""
+        if self.flush_mouse_moves():
+            self.frame_timer.start(self.frame_interval())
+
+    def flush_mouse_moves(self):
+        """Deliver pending moves now; returns whether there were any"""
+        self.frame_timer.stop()
+        event, points = self.pending_event, self.pending_points
+        self.pending_event = None
+        self.pending_points = []
+        if event is None:
+            return False
         if self.current_tool:
-            self.current_tool.mouse_release(event) 
\ No newline at end of file
+            self.current_tool.mouse_move_batch(event, points)
+        return True 
\ No newline at end of file
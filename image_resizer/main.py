@@ -4,11 +4,14 @@ from image_resizer.ui.main_window import ImageResizerApp
 
 def main():
     app = QApplication(sys.argv)
+    # Names the per-user cache directory the thumbnail cache is kept in
+    app.setApplicationName("resizex")
 
     app.setStyle("Fusion")
 
     window = ImageResizerApp()
     window.show()
+    app.aboutToQuit.connect(window.image_handler.shutdown)
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
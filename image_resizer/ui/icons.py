@@ -17,6 +17,9 @@ OPEN_ICON_PATH = os.path.join(BASE_DIR, "assets", "open.png")
 UNDO_ICON_PATH = os.path.join(BASE_DIR, "assets", "undo.png")
 REDO_ICON_PATH = os.path.join(BASE_DIR, "assets", "redo.png")
 
+RENAME_ICON_PATH = os.path.join(BASE_DIR, "assets", "rename.png")
+DELETE_ICON_PATH = os.path.join(BASE_DIR, "assets", "delete.png")
+
 APP_ICON_PATH = os.path.join(BASE_DIR, "assets", "app_icon.png")
 
 COMBO_ARROW_PATH = os.path.join(BASE_DIR, "assets", "dropdown-arrow.svg")
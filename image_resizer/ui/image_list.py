@@ -0,0 +1,282 @@
+import os
+from bisect import bisect_left
+from collections import OrderedDict
+
+from PyQt5.QtWidgets import (QListView, QStyledItemDelegate, QStyle, QInputDialog,
+                             QAbstractItemView)
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, pyqtSignal
+from PyQt5.QtGui import QIcon, QColor, QFont, QPainter, QCursor, QPixmap
+from image_resizer.ui.styles import IMAGE_LIST_STYLE, RENAME_DIALOG_STYLE
+from image_resizer.ui.icons import DELETE_ICON_PATH, RENAME_ICON_PATH
+
+ROW_HEIGHT = 44
+BUTTON_SIZE = 28
+ICON_SIZE = 16
+THUMBNAIL_SIZE = 32
+MARGIN = 8
+# Decoded thumbnails kept for painting, about 30 MB; rows scrolled back to
+# get theirs again from the disk cache
+MAX_THUMBNAILS = 2000
+
+
+class ImageListModel(QAbstractListModel):
+    """Names and thumbnails of the loaded images, one row per image ID"""
+
+    thumbnail_wanted = pyqtSignal(int)  # image_id
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # IDs are handed out in increasing order and rows are only appended or
+        # removed, so this stays sorted and rows can be found by bisection
+        self.image_ids = []  # in list order
+        self.names = {}  # image ID -> file name shown
+        self.thumbnails = OrderedDict()  # image ID -> QPixmap, least recently painted first
+        self.thumbnails_asked = set()  # IDs whose thumbnail was asked for
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.image_ids)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        image_id = self.image_ids[index.row()]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self.names[image_id]
+        if role == Qt.DecorationRole:
+            thumbnail = self.thumbnails.get(image_id)
+            if thumbnail is not None:
+                self.thumbnails.move_to_end(image_id)
+            elif image_id not in self.thumbnails_asked:
+                # Only rows that are painted ask, so long lists don't make every thumbnail up front
+                self.thumbnails_asked.add(image_id)
+                self.thumbnail_wanted.emit(image_id)
+            return thumbnail
+        if role == Qt.UserRole:
+            return image_id
+        return None
+
+    def row_of(self, image_id):
+        """Row showing an image ID, or -1"""
+        row = bisect_left(self.image_ids, image_id)
+        if row < len(self.image_ids) and self.image_ids[row] == image_id:
+            return row
+        return -1
+
+    def add_image(self, image_id, name):
+        row = len(self.image_ids)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.image_ids.append(image_id)
+        self.names[image_id] = name
+        self.endInsertRows()
+
+    def set_name(self, image_id, name):
+        row = self.row_of(image_id)
+        if row < 0:
+            return
+        self.names[image_id] = name
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.ToolTipRole])
+
+    def set_thumbnail(self, image_id, image):
+        row = self.row_of(image_id)
+        if row < 0:
+            return
+        self.thumbnails[image_id] = QPixmap.fromImage(image)
+        while len(self.thumbnails) > MAX_THUMBNAILS:
+            evicted, _ = self.thumbnails.popitem(last=False)
+            self.thumbnails_asked.discard(evicted)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def retry_thumbnail(self, image_id):
+        """Let a row ask again for a thumbnail that could not be made"""
+        self.thumbnails_asked.discard(image_id)
+
+    def remove_image(self, image_id):
+        row = self.row_of(image_id)
+        if row < 0:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.image_ids[row]
+        del self.names[image_id]
+        self.thumbnails.pop(image_id, None)
+        self.thumbnails_asked.discard(image_id)
+        self.endRemoveRows()
+
+
+class ImageListDelegate(QStyledItemDelegate):
+    """Paints a row's name with its rename and delete buttons, without a widget per row"""
+
+    rename_clicked = pyqtSignal(QModelIndex)
+    delete_clicked = pyqtSignal(QModelIndex)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rename_icon = QIcon(RENAME_ICON_PATH)
+        self.delete_icon = QIcon(DELETE_ICON_PATH)
+        self.font = QFont()
+        self.font.setPixelSize(13)
+
+    def button_rects(self, rect):
+        """Rename and delete button areas of a row, right-aligned"""
+        top = rect.top() + (rect.height() - BUTTON_SIZE) // 2
+        delete_rect = QRect(rect.right() - MARGIN - BUTTON_SIZE + 1, top, BUTTON_SIZE, BUTTON_SIZE)
+        rename_rect = delete_rect.translated(-BUTTON_SIZE - MARGIN, 0)
+        return rename_rect, delete_rect
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        widget = option.widget
+        style = widget.style() if widget else None
+        selected = bool(option.state & QStyle.State_Selected)
+
+        # Row background from the list's style sheet, for hover and selection
+        if style:
+            style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, widget)
+
+        rename_rect, delete_rect = self.button_rects(option.rect)
+        hovered = None
+        if widget and option.state & QStyle.State_MouseOver:
+            cursor = widget.viewport().mapFromGlobal(QCursor.pos())
+            hovered = 'rename' if rename_rect.contains(cursor) else 'delete' if delete_rect.contains(cursor) else None
+
+        painter.save()
+
+        # Thumbnail, or a placeholder until it has been made
+        thumbnail_rect = QRect(option.rect.left() + MARGIN,
+                               option.rect.top() + (option.rect.height() - THUMBNAIL_SIZE) // 2,
+                               THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+        thumbnail = index.data(Qt.DecorationRole)
+        if thumbnail is not None:
+            target = QRect(thumbnail_rect.topLeft(), thumbnail.size().scaled(thumbnail_rect.size(), Qt.KeepAspectRatio))
+            target.moveCenter(thumbnail_rect.center())
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            painter.drawPixmap(target, thumbnail)
+        else:
+            painter.fillRect(thumbnail_rect, QColor('#eeeeee'))
+
+        # Name, elided to the space left of the buttons; the rename button only shows when selected
+        text_left = thumbnail_rect.right() + MARGIN + 1
+        text_right = (rename_rect if selected else delete_rect).left() - MARGIN
+        text_rect = QRect(text_left, option.rect.top(), text_right - text_left, option.rect.height())
+        painter.setFont(self.font)
+        painter.setPen(QColor('#333333'))
+        name = painter.fontMetrics().elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, text_rect.width())
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, name)
+
+        # Buttons, shaded under the mouse like the toolbar buttons
+        painter.setPen(Qt.NoPen)
+        painter.setRenderHint(QPainter.Antialiasing)
+        buttons = [('delete', delete_rect, self.delete_icon, '#ffebee')]
+        if selected:
+            buttons.append(('rename', rename_rect, self.rename_icon, '#e8e8e8'))
+        for button, rect, icon, hover_color in buttons:
+            if hovered == button:
+                painter.setBrush(QColor(hover_color))
+                painter.drawRoundedRect(rect, 4, 4)
+            icon_rect = QRect(0, 0, ICON_SIZE, ICON_SIZE)
+            icon_rect.moveCenter(rect.center())
+            icon.paint(painter, icon_rect)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease):
+            return False
+        if event.button() != Qt.LeftButton:
+            return False
+        rename_rect, delete_rect = self.button_rects(option.rect)
+        pos = event.pos()
+        if delete_rect.contains(pos):
+            target = self.delete_clicked
+        elif rename_rect.contains(pos) and option.state & QStyle.State_Selected:
+            target = self.rename_clicked
+        else:
+            return False
+        # Presses on a button don't change the selection; the release triggers it
+        if event.type() == QEvent.MouseButtonRelease:
+            target.emit(index)
+        return True
+
+
+class ImageList(QListView):
+    """Sidebar list of loaded images, painted by a delegate so it scales to any length"""
+
+    renamed = pyqtSignal(int, str)  # image_id, new_name requested
+    deleted = pyqtSignal(int)  # image_id
+    thumbnail_wanted = pyqtSignal(int)  # image_id
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.image_model = ImageListModel(self)
+        self.setModel(self.image_model)
+        self.image_model.thumbnail_wanted.connect(self.thumbnail_wanted)
+        self.delegate = ImageListDelegate(self)
+        self.setItemDelegate(self.delegate)
+        self.delegate.rename_clicked.connect(self.rename_row)
+        self.delegate.delete_clicked.connect(self.delete_row)
+
+        self.setStyleSheet(IMAGE_LIST_STYLE)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        # Every row has the same height, so layout and scrolling never measure rows,
+        # and rows are laid out in batches so long lists don't stall the window
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(1000)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setMouseTracking(True)
+
+    def add_image(self, image_name, image_id):
+        self.image_model.add_image(image_id, image_name)
+
+    def remove_image(self, image_id):
+        self.image_model.remove_image(image_id)
+
+    def set_name(self, image_id, name):
+        self.image_model.set_name(image_id, name)
+
+    def set_thumbnail(self, image_id, image):
+        self.image_model.set_thumbnail(image_id, image)
+
+    def retry_thumbnail(self, image_id):
+        self.image_model.retry_thumbnail(image_id)
+
+    def select_row(self, row):
+        self.setCurrentIndex(self.image_model.index(row))
+
+    def mouseMoveEvent(self, event):
+        super().mouseMoveEvent(event)
+        # Repaint the row under the mouse so its button shading follows the cursor
+        index = self.indexAt(event.pos())
+        if index.isValid():
+            self.viewport().update(self.visualRect(index))
+
+    def delete_row(self, index):
+        self.deleted.emit(index.data(Qt.UserRole))
+
+    def rename_row(self, index):
+        # Create custom input dialog
+        image_name = index.data(Qt.DisplayRole)
+        dialog = QInputDialog(self)
+        dialog.setWindowTitle("Rename Image")
+        dialog.setLabelText("Enter new name:")
+        dialog.setTextValue(image_name)
+
+        # Style the dialog to match app theme
+        dialog.setStyleSheet(RENAME_DIALOG_STYLE)
+
+        ok = dialog.exec_()
+        new_name = dialog.textValue()
+
+        if ok and new_name and new_name != image_name:
+            # If new name doesn't have a valid image extension, keep the original one
+            old_ext = os.path.splitext(image_name)[1].lower()
+            new_ext = os.path.splitext(new_name)[1].lower()
+            if not new_ext or new_ext not in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff']:
+                new_name = os.path.splitext(new_name)[0] + old_ext
+
+            # The row is relabelled through set_name once the rename is accepted
+            self.renamed.emit(index.data(Qt.UserRole), new_name)
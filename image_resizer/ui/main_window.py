@@ -1,18 +1,18 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                           QListWidget, QListWidgetItem, QGraphicsDropShadowEffect, QMenuBar, 
+                           QGraphicsDropShadowEffect, QMenuBar, 
                            QMenu, QGraphicsScene, QLabel, QSlider, QPushButton, 
                            QShortcut, QFrame, QSizePolicy)
 from PyQt5.QtCore import Qt, QSize, QRectF
 from PyQt5.QtGui import QKeySequence, QColor, QPainter, QPainterPath, QIcon
-from image_resizer.ui.styles import (IMAGE_LIST_STYLE, LABEL_STYLE, 
-                                     MAIN_STYLE, ZOOM_SLIDER_STYLE)
+from image_resizer.ui.styles import (LABEL_STYLE, 
+                                     MAIN_STYLE, ZOOM_SLIDER_STYLE, BUTTON_STYLE)
 from image_resizer.ui.toolbar import Toolbar
 from image_resizer.ui.tools_toolbar import ToolsToolbar
 from image_resizer.ui.color_palette import ColorPalette
 from image_resizer.components.custom_graphics_view import CustomGraphicsView
 from image_resizer.utils.image_handler import ImageHandler
 from image_resizer.components.tools.tool_manager import ToolManager
-from image_resizer.ui.custom_list_item import ImageListItemWidget
+from image_resizer.ui.image_list import ImageList
 from image_resizer.ui.icons import APP_ICON_PATH
 
 class SimpleOverlay(QWidget):
@@ -151,9 +151,20 @@ class ImageResizerApp(QMainWindow):
         self.file_size_label = QLabel("File size: --")
         self.file_size_label.setStyleSheet(LABEL_STYLE)
         
+        # Loading progress and cancel button, shown while files are being opened
+        self.load_progress_label = QLabel("")
+        self.load_progress_label.setStyleSheet(LABEL_STYLE)
+        self.cancel_load_btn = QPushButton("Cancel")
+        self.cancel_load_btn.setFixedWidth(80)
+        self.cancel_load_btn.setStyleSheet(BUTTON_STYLE)
+        self.load_progress_label.hide()
+        self.cancel_load_btn.hide()
+        
         # Add info labels to left side
         bottom_layout.addWidget(self.size_label)
         bottom_layout.addWidget(self.file_size_label)
+        bottom_layout.addWidget(self.load_progress_label)
+        bottom_layout.addWidget(self.cancel_load_btn)
         
         # Add stretch to push zoom controls to right
         bottom_layout.addStretch()
@@ -229,11 +240,8 @@ class ImageResizerApp(QMainWindow):
         right_layout.addWidget(color_palette_container)
         
         # Create image list
-        self.image_list = QListWidget()
+        self.image_list = ImageList()
         self.image_list.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Expanding)
-        self.image_list.setStyleSheet(IMAGE_LIST_STYLE)
-        self.image_list.setSelectionMode(QListWidget.SingleSelection)
-        self.image_list.setSelectionBehavior(QListWidget.SelectItems)
         right_layout.addWidget(self.image_list)
         
         # Add containers to main layout
@@ -257,6 +265,8 @@ class ImageResizerApp(QMainWindow):
         self.toolbar.save_all_btn.clicked.connect(self.image_handler.save_all)
         self.toolbar.resize_btn.clicked.connect(self.image_handler.resize_image)
         self.toolbar.resize_all_btn.clicked.connect(self.image_handler.resize_all_images)
+        self.toolbar.quality_slider.valueChanged.connect(self.image_handler.quality_changed)
+        self.cancel_load_btn.clicked.connect(self.image_handler.cancel_loading)
         
         # Disable save and resize buttons initially
         self.toolbar.save_btn.setEnabled(False)
@@ -264,9 +274,13 @@ class ImageResizerApp(QMainWindow):
         self.toolbar.resize_btn.setEnabled(False)
         self.toolbar.resize_all_btn.setEnabled(False)
         
-        # Connect image list selection
-        self.image_list.itemClicked.connect(self.handle_item_selection)
-        self.image_list.currentItemChanged.connect(self.update_ui_state)
+        # Connect image list selection, renaming and deleting
+        self.image_list.selectionModel().currentChanged.connect(self.update_ui_state)
+        self.image_list.renamed.connect(self.image_handler.rename_image)
+        self.image_list.deleted.connect(self.image_handler.delete_image)
+        self.image_list.thumbnail_wanted.connect(self.image_handler.request_thumbnail)
+        self.image_handler.thumbnail_cache.thumbnail_ready.connect(self.image_list.set_thumbnail)
+        self.image_handler.thumbnail_cache.thumbnail_failed.connect(self.image_list.retry_thumbnail)
         
         # Connect tool buttons
         self.tools_toolbar.crop_btn.clicked.connect(lambda: self.set_tool('crop'))
@@ -324,20 +338,8 @@ class ImageResizerApp(QMainWindow):
             
     def update_ui_state(self, current, previous):
         """Update UI elements based on current state"""
-        # Update previous item's selection state
-        if previous:
-            prev_widget = self.image_list.itemWidget(previous)
-            if prev_widget:
-                prev_widget.set_selected(False)
-                
-        # Update current item's selection state
-        if current:
-            curr_widget = self.image_list.itemWidget(current)
-            if curr_widget:
-                curr_widget.set_selected(True)
-        
         # Enable/disable drawing tools based on image selection
-        has_image = current is not None
+        has_image = current.isValid()
         self.tools_toolbar.set_tools_enabled(has_image)
         
         # Call the original image selected handler
@@ -364,6 +366,10 @@ class ImageResizerApp(QMainWindow):
         self.view.resetTransform()
         # Apply new scale
         self.view.scale(scale, scale)
+        
+        # Load full resolution once the preview would be shown magnified
+        if self.image_handler.preview_magnified():
+            self.image_handler.ensure_full_resolution()
 
     def fit_to_view(self):
         """Reset zoom to fit image to view"""
@@ -391,33 +397,19 @@ class ImageResizerApp(QMainWindow):
         self.redo_shortcut_alt = QShortcut(QKeySequence("Ctrl+Y"), self)
         self.redo_shortcut_alt.activated.connect(self.image_handler.redo)
 
-    def add_image_to_list(self, image_name):
-        """Add image to list with custom widget"""
-        item = QListWidgetItem()
-        widget = ImageListItemWidget(image_name)
-        widget.renamed.connect(self.image_handler.rename_image)
-        widget.deleted.connect(self.image_handler.delete_image)
-        item.setSizeHint(widget.sizeHint())
-        self.image_list.addItem(item)
-        self.image_list.setItemWidget(item, widget)
-        # Initially set as not selected
-        widget.set_selected(False)
+    def add_image_to_list(self, image_name, image_id):
+        """Add a row for an image; the ID is its key in the handler"""
+        self.image_list.add_image(image_name, image_id)
+
+    def show_loading_progress(self, done, total):
+        """Show how many of the selected files have been opened"""
+        self.load_progress_label.setText(f"Loading images... ({done}/{total})")
+        self.load_progress_label.show()
+        self.cancel_load_btn.show()
 
-    def handle_item_selection(self, item):
-        """Handle explicit item selection"""
-        if item:
-            self.image_list.setCurrentItem(item)
-            widget = self.image_list.itemWidget(item)
-            if widget:
-                # Ensure proper selection state
-                for i in range(self.image_list.count()):
-                    curr_item = self.image_list.item(i)
-                    curr_widget = self.image_list.itemWidget(curr_item)
-                    if curr_widget:
-                        curr_widget.set_selected(curr_item == item)
-                
-                # Update image display
-                self.image_handler.image_selected(item, self.image_list.currentItem())
+    def hide_loading_progress(self):
+        self.load_progress_label.hide()
+        self.cancel_load_btn.hide()
 
     def resizeEvent(self, event):
         """Handle window resize events"""
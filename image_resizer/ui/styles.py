@@ -76,35 +76,6 @@ RESIZE_BUTTON_STYLE = """
             }
         """
 
-RENAME_BUTTON_STYLE = """
-            QPushButton {
-                border: none;
-                background: transparent;
-                color: #666666;
-                font-size: 16px;
-                padding: 4px;
-            }
-            QPushButton:hover {
-                background: #e8e8e8;
-                border-radius: 4px;
-            }
-        """
-
-DELETE_BUTTON_STYLE = """
-            QPushButton {
-                border: none;
-                background: transparent;
-                color: #666666;
-                font-size: 16px;
-                padding: 4px;
-            }
-            QPushButton:hover {
-                background: #ffebee;
-                color: #f44336;
-                border-radius: 4px;
-            }
-        """
-
 COMBO_BOX_STYLE = """
             QComboBox {
                 border: 1px solid #ddd;
@@ -233,37 +204,27 @@ MAIN_WINDOW_STYLE = """
         """
 
 IMAGE_LIST_STYLE = """
-            QListWidget {
+            QListView {
                 background-color: white;
                 border: 1px solid #DBDCDA;
                 border-radius: 4px;
                 padding: 4px;
             }
-            QListWidget::item {
+            QListView::item {
                 background: transparent;
                 border-radius: 4px;
                 margin: 2px 4px;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #f5f5f5;
             }
-            QListWidget::item:hover {
+            QListView::item:hover {
                 background-color: #f5f5f5;
             }
         """
 
 LABEL_STYLE = "background-color: white;"
 TOOLBAR_LABEL_STYLE = "background-color: #f5f5f5;"
-IMAGE_NAME_LABEL_STYLE = """
-            QLabel { 
-                color: #333333;
-                font-size: 13px;
-                padding: 2px;
-                text-overflow: ellipsis;
-                overflow: hidden;
-            }
-        """
-
 RENAME_DIALOG_STYLE = """
             QInputDialog {
                 background-color: white;
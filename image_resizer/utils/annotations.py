@@ -0,0 +1,94 @@
+from collections import OrderedDict
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPainter, QPixmap, QTransform
+
+# Composites are full-resolution pixmaps, so only the most recently rendered layers keep theirs
+MAX_RENDERED = 4
+
+_rendered_layers = OrderedDict()  # AnnotationLayer -> None, least recently rendered first
+
+
+class AnnotationLayer:
+    """Vector edits drawn over an image's pixels, kept editable until export.
+
+    Each entry pairs an operation with the transform from the coordinates it was
+    drawn in to the image's current coordinates, so crops and resizes move and
+    scale annotations without resampling them.
+    """
+
+    def __init__(self, entries=()):
+        self.entries = list(entries)  # (operation, QTransform)
+        self.version = 0  # bumped by every change to the entries
+        self.rendered = None  # (key, pixmap) of the last composite, reused while unchanged
+
+    def is_empty(self):
+        return not self.entries
+
+    def add(self, operation):
+        self.entries.append((operation, QTransform()))
+        self.version += 1
+
+    def remove(self, operation):
+        self.entries = [entry for entry in self.entries if entry[0] is not operation]
+        self.version += 1
+
+    def clear(self):
+        self.entries = []
+        self.version += 1
+
+    def snapshot(self):
+        """Immutable copy of the entries for the undo history"""
+        return tuple(self.entries)
+
+    def restore(self, snapshot):
+        self.entries = list(snapshot)
+        self.version += 1
+
+    def transform(self, transform):
+        """Map every annotation through transform, e.g. after a crop or resize"""
+        self.entries = [(operation, matrix * transform) for operation, matrix in self.entries]
+        self.version += 1
+
+    def paint(self, painter, exposed=None):
+        """Draw the annotations, skipping those outside the exposed rectangle if given"""
+        for operation, matrix in self.entries:
+            if exposed is not None and not matrix.mapRect(operation.bounding_rect()).intersects(exposed):
+                continue
+            painter.save()
+            painter.setTransform(matrix, True)
+            operation.paint(painter)
+            painter.restore()
+
+    def apply(self, device):
+        """Draw the annotations onto a QImage or QPixmap and return it"""
+        painter = QPainter(device)
+        painter.setRenderHint(QPainter.Antialiasing)
+        self.paint(painter)
+        painter.end()
+        return device
+
+    def render(self, pixmap):
+        """Pixmap with the annotations drawn over it on white, as it is exported"""
+        # Strokes still being drawn change in place, so their own versions are part of the key
+        key = (pixmap.cacheKey(), self.version, tuple(operation.version for operation, _ in self.entries))
+        if self.rendered is not None and self.rendered[0] == key:
+            _rendered_layers.move_to_end(self)
+            return self.rendered[1]
+
+        result = QPixmap(pixmap.size())
+        result.fill(Qt.white)
+        painter = QPainter(result)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        painter.drawPixmap(0, 0, pixmap)
+        self.paint(painter)
+        painter.end()
+
+        # Keep the composite so size estimates and saves see the same pixmap
+        self.rendered = (key, result)
+        _rendered_layers[self] = None
+        _rendered_layers.move_to_end(self)
+        while len(_rendered_layers) > MAX_RENDERED:
+            layer, _ = _rendered_layers.popitem(last=False)
+            layer.rendered = None
+        return result
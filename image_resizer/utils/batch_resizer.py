@@ -0,0 +1,170 @@
+import os
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QPixmap
+from image_resizer.utils.resizer import ImageResizer
+from image_resizer.utils.lazy_image import LazyImage
+from image_resizer.utils.qt_image import qpixmap_to_pil
+
+
+def _resize_job(source, size_preset):
+    """Decode (if needed) and resize one image; runs in a worker process"""
+    # Unedited images arrive as LazyImage handles and are decoded here
+    image = source.load() if isinstance(source, LazyImage) else source
+    if image.mode == 'RGBA':
+        image = image.convert('RGB')
+    resized = ImageResizer().resize_single(image, size_preset)
+    if resized is None:
+        raise ValueError("Could not resize image")
+    return resized
+
+
+class _ResizeSignals(QObject):
+    """Signals emitted from executor threads, delivered on the GUI thread"""
+    resized = pyqtSignal(int, int, object)  # generation, image_id, PIL image
+    failed = pyqtSignal(int, int, str)  # generation, image_id, error
+
+
+class BatchResizer(QObject):
+    """Resize images on a process pool and stream the results back"""
+    image_resized = pyqtSignal(int, object)  # image_id, PIL image
+    image_failed = pyqtSignal(int, str)  # image_id, error
+    progress = pyqtSignal(int, int)  # done, total
+    finished = pyqtSignal(bool)  # cancelled
+
+    def __init__(self, parent=None, max_workers=None):
+        super().__init__(parent)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = None
+        self.pending = deque()
+        self.in_flight = 0
+        self.size_preset = None
+        self.generation = 0
+        self.total = 0
+        self.done = 0
+
+        self.signals = _ResizeSignals()
+        self.signals.resized.connect(self._on_resized)
+        self.signals.failed.connect(self._on_failed)
+
+    def is_running(self):
+        return self.done < self.total
+
+    def resize(self, jobs, size_preset):
+        """Resize (image_id, source) jobs; a source is a LazyImage or an edited QPixmap"""
+        if self.is_running():
+            return
+        self.size_preset = size_preset
+        self.pending = deque(jobs)
+        self.in_flight = 0
+        self.total = len(self.pending)
+        self.done = 0
+        self.progress.emit(0, self.total)
+        if not self.total:
+            self.finished.emit(False)
+            return
+        self._submit_next()
+
+    def requeue(self, image_id, source):
+        """Add a job to the running batch, for an image that changed while it was resized"""
+        if not self.is_running():
+            return
+        self.pending.append((image_id, source))
+        self.total += 1
+
+    def cancel(self):
+        """Drop queued images and ignore results still in flight"""
+        if not self.is_running():
+            return
+        self.generation += 1
+        self.pending.clear()
+        self.total = self.done
+        self.finished.emit(True)
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def _get_executor(self):
+        if self.executor is None:
+            # Spawn fresh interpreters; forking a process that runs Qt is unsafe
+            context = multiprocessing.get_context('spawn')
+            self.executor = ProcessPoolExecutor(self.max_workers, mp_context=context)
+        return self.executor
+
+    def _submit_next(self):
+        """Keep a couple of jobs queued per worker without holding every image in memory"""
+        while self.pending and self.in_flight < self.max_workers * 2:
+            image_id, source = self.pending.popleft()
+            try:
+                if isinstance(source, QPixmap):
+                    # Pixmaps can only be read on the GUI thread, so convert before handing off
+                    source = qpixmap_to_pil(source)
+            except Exception as e:
+                self._fail(image_id, str(e))
+                continue
+            try:
+                future = self._submit(source)
+            except Exception as e:
+                # No pool could be started; fail what is left so the batch still finishes
+                self.shutdown()
+                self._fail(image_id, str(e))
+                while self.pending:
+                    self._fail(self.pending.popleft()[0], str(e))
+                break
+            self.in_flight += 1
+            future.add_done_callback(partial(self._job_done, self.generation, image_id))
+        
+        # Jobs failed here rather than in a worker; finish if none are left in flight
+        if self.total and self.done >= self.total:
+            self.finished.emit(False)
+
+    def _submit(self, source):
+        try:
+            return self._get_executor().submit(_resize_job, source, self.size_preset)
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for the rest of the batch
+            self.executor = None
+            return self._get_executor().submit(_resize_job, source, self.size_preset)
+
+    def _fail(self, image_id, error):
+        """Report a job that never reached a worker"""
+        self.image_failed.emit(image_id, error)
+        self.done += 1
+        self.progress.emit(self.done, self.total)
+
+    def _job_done(self, generation, image_id, future):
+        # Called on an executor thread; hand the result to the GUI thread
+        try:
+            image = future.result()
+        except Exception as e:
+            self.signals.failed.emit(generation, image_id, str(e))
+        else:
+            self.signals.resized.emit(generation, image_id, image)
+
+    def _on_resized(self, generation, image_id, image):
+        if generation != self.generation:
+            return
+        self.image_resized.emit(image_id, image)
+        self._task_done()
+
+    def _on_failed(self, generation, image_id, error):
+        if generation != self.generation:
+            return
+        self.image_failed.emit(image_id, error)
+        self._task_done()
+
+    def _task_done(self):
+        self.in_flight -= 1
+        self.done += 1
+        self.progress.emit(self.done, self.total)
+        if self.done >= self.total:
+            self.finished.emit(False)
+        else:
+            self._submit_next()
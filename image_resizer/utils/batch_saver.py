@@ -0,0 +1,155 @@
+import os
+import shutil
+from collections import deque
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QPixmap
+from image_resizer.utils.lazy_image import LazyImage
+from image_resizer.utils.qt_image import pil_to_qimage, qimage_to_pil
+from image_resizer.utils.encoded_cache import image_digest
+
+
+class _SaveSignals(QObject):
+    """Signals emitted from worker threads, delivered on the GUI thread"""
+    saved = pyqtSignal(int, str, str)  # generation, file_path, save_path
+    failed = pyqtSignal(int, str, str)  # generation, file_path, error
+
+
+class _SaveTask(QRunnable):
+    def __init__(self, saver, generation, file_path, save_path, source, img_format, quality, cache_key=None):
+        super().__init__()
+        self.cache_key = cache_key
+        self.saver = saver
+        self.generation = generation
+        self.file_path = file_path
+        self.save_path = save_path
+        self.source = source
+        self.img_format = img_format
+        self.quality = quality
+
+    def run(self):
+        # Skip work for batches that were cancelled while this task was queued
+        if self.generation != self.saver.generation:
+            return
+        try:
+            image = self.source
+            if isinstance(image, str):
+                # Untouched originals are copied; copyfile uses sendfile where available
+                shutil.copyfile(image, self.save_path)
+                self.saver.signals.saved.emit(self.generation, self.file_path, self.save_path)
+                return
+            if isinstance(image, LazyImage):
+                # Unedited images are decoded here instead of on the GUI thread
+                pil_image = image.load()
+                if pil_image.mode == 'RGBA':
+                    pil_image = pil_image.convert('RGB')
+                image = pil_to_qimage(pil_image)
+            if self.img_format == 'JPEG' and image.hasAlphaChannel():
+                # Drop the alpha channel the same way Pillow's RGB conversion does
+                image = pil_to_qimage(qimage_to_pil(image).convert('RGB'))
+            elif self.cache_key is not None and self.saver.encoded_cache is not None:
+                # Reuse the bytes encoded for the size estimate if the pixels are unchanged
+                encoded_cache = self.saver.encoded_cache
+                digest = encoded_cache.digest_for(self.cache_key) or image_digest(image)
+                data = encoded_cache.get(digest, self.img_format, self.quality)
+                if data is not None:
+                    with open(self.save_path, 'wb') as f:
+                        f.write(data)
+                    self.saver.signals.saved.emit(self.generation, self.file_path, self.save_path)
+                    return
+
+            # Qt's encoders run without the GIL, so several files encode at once
+            if not image.save(self.save_path, self.img_format, self.quality):
+                # Qt has no writer for some formats (GIF), so let Pillow write those
+                qimage_to_pil(image).save(self.save_path, self.img_format)
+        except Exception as e:
+            self.saver.signals.failed.emit(self.generation, self.file_path, str(e))
+        else:
+            self.saver.signals.saved.emit(self.generation, self.file_path, self.save_path)
+
+
+class BatchSaver(QObject):
+    """Encode and write images on a bounded thread pool"""
+    image_saved = pyqtSignal(str, str)  # file_path, save_path
+    image_failed = pyqtSignal(str, str)  # file_path, error
+    progress = pyqtSignal(int, int)  # done, total
+    finished = pyqtSignal(bool)  # cancelled
+
+    def __init__(self, parent=None, encoded_cache=None, max_workers=None):
+        super().__init__(parent)
+        self.encoded_cache = encoded_cache
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_workers or os.cpu_count() or 1)
+        self.pending = deque()
+        self.in_flight = 0
+        self.generation = 0
+        self.total = 0
+        self.done = 0
+
+        self.signals = _SaveSignals()
+        self.signals.saved.connect(self._on_saved)
+        self.signals.failed.connect(self._on_failed)
+
+    def is_running(self):
+        return self.done < self.total
+
+    def save(self, jobs):
+        """Save (file_path, save_path, source, format, quality) jobs.
+
+        A source is an edited QPixmap, a LazyImage to decode, or a file path to copy as is;
+        quality -1 means the format default.
+        """
+        if self.is_running():
+            return
+        self.pending = deque(jobs)
+        self.in_flight = 0
+        self.total = len(self.pending)
+        self.done = 0
+        self.progress.emit(0, self.total)
+        if not self.total:
+            self.finished.emit(False)
+            return
+        self._submit_next()
+
+    def cancel(self):
+        """Drop queued files and ignore results still in flight"""
+        if not self.is_running():
+            return
+        self.generation += 1
+        self.pending.clear()
+        self.pool.clear()
+        self.total = self.done
+        self.finished.emit(True)
+
+    def _submit_next(self):
+        """Keep a couple of jobs queued per thread without copying every pixmap up front"""
+        while self.pending and self.in_flight < self.pool.maxThreadCount() * 2:
+            file_path, save_path, source, img_format, quality = self.pending.popleft()
+            cache_key = None
+            if isinstance(source, QPixmap):
+                # Pixmaps belong to the GUI thread; workers get a QImage copy
+                cache_key = source.cacheKey()
+                source = source.toImage()
+            self.in_flight += 1
+            self.pool.start(_SaveTask(self, self.generation, file_path, save_path,
+                                      source, img_format, quality, cache_key))
+
+    def _on_saved(self, generation, file_path, save_path):
+        if generation != self.generation:
+            return
+        self.image_saved.emit(file_path, save_path)
+        self._task_done()
+
+    def _on_failed(self, generation, file_path, error):
+        if generation != self.generation:
+            return
+        self.image_failed.emit(file_path, error)
+        self._task_done()
+
+    def _task_done(self):
+        self.in_flight -= 1
+        self.done += 1
+        self.progress.emit(self.done, self.total)
+        if self.done >= self.total:
+            self.finished.emit(False)
+        else:
+            self._submit_next()
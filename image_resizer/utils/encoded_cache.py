@@ -0,0 +1,71 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def image_digest(image):
+    """Digest of a QImage's pixel content, format and geometry"""
+    digest = hashlib.sha1(f"{image.width()}x{image.height()}:{image.format()}:{image.bytesPerLine()}".encode())
+    bits = image.constBits()
+    if bits is not None:
+        bits.setsize(image.sizeInBytes())
+        digest.update(bits)
+    return digest.hexdigest()
+
+
+class EncodedCache:
+    """LRU cache of encoded file bytes keyed by pixel content, format and quality.
+
+    Shared by the size estimator, which fills it, and the save paths, which write
+    cached bytes straight to disk. Safe to use from worker threads.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, max_digests=1024):
+        self.max_bytes = max_bytes
+        self.max_digests = max_digests
+        self.entries = OrderedDict()  # (digest, format, quality) -> bytes
+        self.digests = OrderedDict()  # QPixmap.cacheKey() -> digest
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+    def put(self, digest, img_format, quality, data):
+        """Store encoded bytes, evicting the least recently used entries over budget"""
+        if len(data) > self.max_bytes:
+            return
+        key = (digest, img_format, quality)
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= len(old)
+            self.entries[key] = data
+            self.total_bytes += len(data)
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+
+    def get(self, digest, img_format, quality):
+        key = (digest, img_format, quality)
+        with self.lock:
+            data = self.entries.get(key)
+            if data is not None:
+                self.entries.move_to_end(key)
+            return data
+
+    def remember(self, cache_key, digest):
+        """Remember the content digest of a pixmap so lookups can skip hashing"""
+        with self.lock:
+            self.digests[cache_key] = digest
+            self.digests.move_to_end(cache_key)
+            if len(self.digests) > self.max_digests:
+                self.digests.popitem(last=False)
+
+    def digest_for(self, cache_key):
+        """Digest remembered for a pixmap cacheKey(), or None if it was never hashed"""
+        with self.lock:
+            return self.digests.get(cache_key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.digests.clear()
+            self.total_bytes = 0
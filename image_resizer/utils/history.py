@@ -0,0 +1,397 @@
+import os
+import mmap
+import shutil
+import tempfile
+import zlib
+from collections import OrderedDict
+import numpy as np
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QRect, QPoint, pyqtSignal
+from PyQt5.QtGui import QImage, QPainter, QPixmap
+
+# Compressed history bytes each image may keep in memory before its oldest
+# steps spill to disk, and the cap across all images (current frames included)
+IMAGE_BUDGET = 64 * 1024 * 1024
+TOTAL_BUDGET = 512 * 1024 * 1024
+
+
+def _frame(pixmap):
+    """Full-resolution QImage in a 32-bit format the patches can be diffed in"""
+    image = pixmap.toImage() if isinstance(pixmap, QPixmap) else pixmap
+    if image.hasAlphaChannel():
+        return image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+    return image.convertToFormat(QImage.Format_RGB32)
+
+
+def _pixels(image):
+    """Read-only (height, width) uint32 view of a 32-bit QImage"""
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    rows = np.frombuffer(bits, np.uint32).reshape(image.height(), image.bytesPerLine() // 4)
+    return rows[:, :image.width()]
+
+
+def changed_rect(before, after):
+    """Bounding rectangle of the pixels that differ between two frames of the same size"""
+    diff = _pixels(before) != _pixels(after)
+    rows = np.flatnonzero(diff.any(axis=1))
+    if not rows.size:
+        return QRect()
+    top, bottom = int(rows[0]), int(rows[-1])
+    cols = np.flatnonzero(diff[top:bottom + 1].any(axis=0))
+    left, right = int(cols[0]), int(cols[-1])
+    return QRect(left, top, right - left + 1, bottom - top + 1)
+
+
+def _compress(image):
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    return zlib.compress(bits, 1)
+
+
+def _paint(frame, rect, blob):
+    """Draw a patch over rect of frame, in place"""
+    painter = QPainter(frame)
+    painter.setCompositionMode(QPainter.CompositionMode_Source)
+    painter.drawImage(QPoint(rect.x(), rect.y()), blob.image())
+    painter.end()
+
+
+class _Blob:
+    """Pixels of a history step: raw until a worker compresses them, then zlib
+    bytes in memory, then a spill file read back through mmap"""
+
+    def __init__(self, image):
+        # A separate QImage handle, so painting on the caller's frame detaches it
+        self.raw = QImage(image)
+        self.width = image.width()
+        self.height = image.height()
+        self.format = image.format()
+        self.bytes_per_line = image.bytesPerLine()
+        self.data = None
+        self.path = None
+        self.nbytes = image.sizeInBytes()
+
+    def image(self):
+        """QImage of the pixels; safe to paint on, which detaches it from the blob"""
+        if self.raw is not None:
+            return QImage(self.raw)
+        if self.data is not None:
+            pixels = zlib.decompress(self.data)
+        else:
+            with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                pixels = zlib.decompress(mapped)
+        image = QImage(pixels, self.width, self.height, self.bytes_per_line, self.format)
+        # Copy so the image owns its pixels rather than borrowing the bytes object
+        return image.copy()
+
+    def spill(self, directory):
+        fd, self.path = tempfile.mkstemp(suffix='.zlib', dir=directory)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(self.data)
+        self.data = None
+
+    def discard(self):
+        self.raw = self.data = None
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                print(f"Error removing history file {self.path}: {str(e)}")
+            self.path = None
+
+
+class _Entry:
+    """One history step: a keyframe, or the before/after pixels of the rectangle it changed"""
+
+    def __init__(self, state, keyframe=None, rect=None, before=None, after=None):
+        self.state = state
+        self.keyframe = keyframe  # full frame after this step
+        self.rect = rect
+        self.before = before
+        self.after = after
+
+    def is_patch(self):
+        return self.keyframe is None
+
+    def blobs(self):
+        return [blob for blob in (self.keyframe, self.before, self.after) if blob is not None]
+
+
+class _CompressSignals(QObject):
+    """Signals emitted from worker threads, delivered on the GUI thread"""
+    compressed = pyqtSignal(object, object)  # blob, zlib bytes
+
+
+class _CompressTask(QRunnable):
+    def __init__(self, store, blob):
+        super().__init__()
+        self.store = store
+        self.blob = blob
+
+    def run(self):
+        # Skip blobs that were discarded while this task was queued
+        raw = self.blob.raw
+        if raw is None:
+            return
+        # zlib releases the GIL, so big frames compress without stalling the GUI
+        self.store.signals.compressed.emit(self.blob, _compress(raw))
+
+
+class HistoryStore(QObject):
+    """Memory budget shared by the undo histories of all images.
+
+    New steps are compressed with zlib on a worker thread. When an image's
+    compressed steps outgrow IMAGE_BUDGET, or all histories together outgrow
+    TOTAL_BUDGET, the oldest steps are written to a temp directory, and the
+    cached frames of images not edited recently are dropped to be rebuilt
+    on demand.
+    """
+
+    def __init__(self, parent=None, image_budget=IMAGE_BUDGET, total_budget=TOTAL_BUDGET):
+        super().__init__(parent)
+        self.image_budget = image_budget
+        self.total_budget = total_budget
+        self.blobs = OrderedDict()  # blob -> history, oldest first, in memory only
+        self.memory = {}  # history -> bytes of its blobs in memory
+        self.frames = OrderedDict()  # history -> bytes of its cached frame, least recent first
+        self.total = 0
+        self.directory = None
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+
+        self.signals = _CompressSignals()
+        self.signals.compressed.connect(self._on_compressed)
+
+    def add(self, history, image):
+        """Track a new blob for history and queue it for compression"""
+        blob = _Blob(image)
+        self.blobs[blob] = history
+        self._account(history, blob.nbytes)
+        self.pool.start(_CompressTask(self, blob))
+        return blob
+
+    def discard(self, blob):
+        history = self.blobs.pop(blob, None)
+        if history is not None:
+            self._account(history, -blob.nbytes)
+        blob.discard()
+
+    def frame_changed(self, history, nbytes):
+        """Record the size of a history's cached frame (0 if it has none)"""
+        self.total -= self.frames.pop(history, 0)
+        if nbytes:
+            self.frames[history] = nbytes
+            self.total += nbytes
+        self._enforce(history)
+
+    def forget(self, history):
+        """Stop accounting for a history whose blobs were all discarded"""
+        self.total -= self.frames.pop(history, 0)
+        self.memory.pop(history, None)
+
+    def close(self):
+        """Drop queued compression and remove spilled files"""
+        self.pool.clear()
+        self.pool.waitForDone()
+        if self.directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+    def _account(self, history, nbytes):
+        self.memory[history] = self.memory.get(history, 0) + nbytes
+        self.total += nbytes
+
+    def _on_compressed(self, blob, data):
+        history = self.blobs.get(blob)
+        if history is None or blob.raw is None:
+            return
+        blob.raw = None
+        blob.data = data
+        self._account(history, len(data) - blob.nbytes)
+        blob.nbytes = len(data)
+        self._enforce(history)
+
+    def _enforce(self, history):
+        while self.memory.get(history, 0) > self.image_budget:
+            if not self._spill_oldest(history):
+                break
+        # Frames can be rebuilt from keyframes and patches, so drop those of
+        # other images first, least recently edited first
+        for other in list(self.frames):
+            if self.total <= self.total_budget:
+                return
+            if other is not history:
+                self.total -= self.frames.pop(other)
+                other.release_cache()
+        while self.total > self.total_budget:
+            if not self._spill_oldest():
+                break
+
+    def _spill_oldest(self, history=None):
+        """Write the oldest compressed blob (of one history, if given) to disk"""
+        for blob, owner in self.blobs.items():
+            if blob.data is not None and (history is None or owner is history):
+                break
+        else:
+            return False
+        if self.directory is None:
+            self.directory = tempfile.mkdtemp(prefix='resizex-history-')
+        try:
+            blob.spill(self.directory)
+        except OSError as e:
+            print(f"Error writing history to disk: {str(e)}")
+            return False
+        del self.blobs[blob]
+        self._account(owner, -blob.nbytes)
+        return True
+
+
+class ImageHistory:
+    """Undo/redo timeline for one image.
+
+    Each step keeps the changed rectangle before and after the edit, or a full
+    frame for the first step and size changes such as crops. Vector edits live
+    in the annotation snapshot of each state, so they leave the pixels alone.
+    The current frame is cached; other states are rebuilt by patching it, or
+    by patching forward from the nearest keyframe.
+    """
+
+    def __init__(self, store, max_entries=10):
+        self.store = store
+        self.max_entries = max_entries
+        self.entries = []
+        self.position = 0  # number of steps currently applied
+        self.frame = None  # cached pixels after entries[position - 1]
+        self.base = None  # (entry, decompressed keyframe) last patched forward from
+
+    def can_undo(self):
+        return self.position > 0
+
+    def can_redo(self):
+        return self.position < len(self.entries)
+
+    def push(self, state, pixmap):
+        """Record a new state whose pixels are pixmap, dropping any redo steps"""
+        self.clear_redo()
+        frame = _frame(pixmap)
+        previous = self._frame_at(self.position - 1) if self.position else None
+        if previous is None or previous.size() != frame.size() or previous.format() != frame.format():
+            entry = _Entry(state, keyframe=self.store.add(self, frame))
+        else:
+            rect = changed_rect(previous, frame)
+            if rect.isEmpty():
+                entry = _Entry(state, rect=rect)
+            else:
+                entry = _Entry(state, rect=rect,
+                               before=self.store.add(self, previous.copy(rect)),
+                               after=self.store.add(self, frame.copy(rect)))
+        self.entries.append(entry)
+        self.position += 1
+        self._set_frame(frame)
+
+        # Enforce the step limit; the new oldest step becomes a keyframe
+        # since nothing before it is kept to patch from
+        while len(self.entries) > self.max_entries:
+            oldest = self.entries[1]
+            if oldest.keyframe is None:
+                keyframe = self.store.add(self, self._frame_at(1))
+                self._discard(oldest)
+                oldest.keyframe = keyframe
+                oldest.before = oldest.after = oldest.rect = None
+            self._discard(self.entries.pop(0))
+            self.position -= 1
+
+    def undo(self):
+        """Step back; returns the state that was undone"""
+        entry = self.entries[self.position - 1]
+        if self.position == 1:
+            frame = None
+        elif entry.is_patch() and self.frame is not None:
+            frame = self.frame
+            if not entry.rect.isEmpty():
+                _paint(frame, entry.rect, entry.before)
+        else:
+            frame = self._frame_at(self.position - 2)
+        self.position -= 1
+        self._set_frame(frame)
+        return entry.state
+
+    def redo(self):
+        """Step forward; returns the state that was redone"""
+        entry = self.entries[self.position]
+        if entry.keyframe is not None:
+            frame = entry.keyframe.image()
+        else:
+            frame = self.frame if self.frame is not None else self._frame_at(self.position - 1)
+            if not entry.rect.isEmpty():
+                _paint(frame, entry.rect, entry.after)
+        self.position += 1
+        self._set_frame(frame)
+        return entry.state
+
+    def current(self):
+        """Current state with its 'pixmap' rebuilt, or None at the start of the timeline"""
+        if not self.position:
+            return None
+        if self.frame is None:
+            self._set_frame(self._frame_at(self.position - 1))
+        state = dict(self.entries[self.position - 1].state)
+        state['pixmap'] = QPixmap.fromImage(self.frame)
+        return state
+
+    def clear_redo(self):
+        for entry in self.entries[self.position:]:
+            self._discard(entry)
+        del self.entries[self.position:]
+
+    def clear(self):
+        """Drop every step and the files spilled for them"""
+        for entry in self.entries:
+            self._discard(entry)
+        self.entries = []
+        self.position = 0
+        self.release_cache()
+        self.store.forget(self)
+
+    def release_cache(self):
+        """Free the cached frame and keyframe; they are rebuilt when next needed"""
+        self.frame = None
+        self.base = None
+
+    def _set_frame(self, frame):
+        self.frame = frame
+        nbytes = frame.sizeInBytes() if frame is not None else 0
+        if self.base is not None:
+            nbytes += self.base[1].sizeInBytes()
+        self.store.frame_changed(self, nbytes)
+
+    def _discard(self, entry):
+        if self.base is not None and self.base[0] is entry:
+            self.base = None
+        for blob in entry.blobs():
+            self.store.discard(blob)
+
+    def _frame_at(self, index):
+        """Pixels after entries[index], patched back from the cached frame or forward from a keyframe"""
+        current = self.position - 1
+        if self.frame is not None and index == current:
+            return self.frame
+        between = self.entries[index + 1:current + 1]
+        if self.frame is not None and index < current and all(entry.is_patch() for entry in between):
+            frame = self.frame.copy()
+            for entry in reversed(between):
+                if not entry.rect.isEmpty():
+                    _paint(frame, entry.rect, entry.before)
+            return frame
+        start = index
+        while self.entries[start].keyframe is None:
+            start -= 1
+        # Keep the decompressed keyframe; undoing past the cached frame patches from it again
+        keyframe = self.entries[start]
+        if self.base is None or self.base[0] is not keyframe:
+            self.base = (keyframe, keyframe.keyframe.image())
+        frame = QImage(self.base[1])
+        for entry in self.entries[start + 1:index + 1]:
+            if not entry.rect.isEmpty():
+                _paint(frame, entry.rect, entry.after)
+        return frame
@@ -1,38 +1,85 @@
 import os
+import shutil
 from PIL import Image
 from PyQt5.QtWidgets import QFileDialog, QMessageBox, QGraphicsPixmapItem, QApplication
-from PyQt5.QtGui import QPixmap, QImage, QPainter
-from PyQt5.QtCore import Qt, QRectF, QByteArray, QBuffer, QTimer
-import numpy as np
+from PyQt5.QtGui import QTransform
+from PyQt5.QtCore import Qt, QRectF, QTimer
 from image_resizer.utils.resizer import ImageResizer
-from io import BytesIO
-import pillow_heif
+from image_resizer.utils.image_loader import ImageLoader
+from image_resizer.utils.batch_resizer import BatchResizer
+from image_resizer.utils.batch_saver import BatchSaver
+from image_resizer.utils.size_estimator import FileSizeEstimator
+from image_resizer.utils.encoded_cache import EncodedCache, image_digest
+from image_resizer.utils.thumbnail_cache import ThumbnailCache
+from image_resizer.utils.history import ImageHistory, HistoryStore
+from image_resizer.utils.annotations import AnnotationLayer
+from image_resizer.utils.image_record import ImageRecord
+from image_resizer.components.annotation_item import AnnotationItem
+from image_resizer.utils.qt_image import pil_to_qpixmap, qpixmap_to_pil
 from image_resizer.ui.styles import (SUCCESS_RESIZE_DIALOG_STYLE, SUCCESS_SAVE_DIALOG, ERROR_SAVE_DIALOG)
 
-# Register HEIF opener with Pillow
-pillow_heif.register_heif_opener()
+# Pillow format written for each supported output extension
+SAVE_FORMATS = {
+    '.jpg': 'JPEG',
+    '.jpeg': 'JPEG',
+    '.png': 'PNG',
+    '.gif': 'GIF',
+    '.bmp': 'BMP',
+    '.tiff': 'TIFF'
+}
 
 class ImageHandler:
     def __init__(self, parent):
         self.parent = parent
-        self.images = {}  # Original images
+        self.records = {}  # ID stored on each list item -> ImageRecord, in list order
+        self.path_index = None  # file path -> ImageRecord, derived from records; None until needed
+        self.next_image_id = 0
         self.current_image = None
-        self.edited_images = {}  # Images with edits (shapes, resizing)
-        self.edited_file_sizes = {}
-        self.original_dimensions = {}
-        self.current_dimensions = {}
-        self.file_sizes = {}
         self.aspect_ratio = 1.0
-        self.history = []
-        self.redo_stack = {}
-        self.image_histories = {}
-        self.image_redo_stacks = {}
+        self.history_store = HistoryStore(parent)  # compresses and spills history within a memory budget
         self.max_history = 10
         self.resizer = ImageResizer()
         self.modified = False
-        self.resized_images = set()  # Track which images have been resized
-        self.view_scale = {}  # Track view scale for each image
         self.heic_message_shown = False  # Track whether HEIC conversion message has been shown
+        self.load_errors = []  # Files that failed to load in the current batch
+        self.preview_record = None  # Image currently shown as a reduced-resolution preview
+        
+        # Open files on a thread pool so large batches don't freeze the window
+        self.loader = ImageLoader(parent)
+        self.loader.image_loaded.connect(self._on_image_loaded)
+        self.loader.image_failed.connect(self._on_image_failed)
+        self.loader.progress.connect(self._on_loading_progress)
+        self.loader.finished.connect(self._on_loading_finished)
+        
+        # Resize All fans out to worker processes and streams results back
+        self.resize_errors = []  # Files that failed in the current Resize All batch
+        self.resize_submitted = {}  # image ID -> pixels and size its queued resize started from
+        self.resized_count = 0
+        self.batch_resizer = BatchResizer(parent)
+        self.batch_resizer.image_resized.connect(self._on_batch_resized)
+        self.batch_resizer.image_failed.connect(self._on_batch_resize_failed)
+        self.batch_resizer.progress.connect(self._on_batch_resize_progress)
+        self.batch_resizer.finished.connect(self._on_batch_resize_finished)
+        
+        # Bytes encoded for size estimates, reused when the same pixels are saved
+        self.encoded_cache = EncodedCache()
+        
+        # Save All encodes and writes files on a bounded thread pool
+        self.save_output_dir = None
+        self.save_success_count = 0
+        self.save_failed_count = 0
+        self.batch_saver = BatchSaver(parent, self.encoded_cache)
+        self.batch_saver.image_saved.connect(self._on_batch_saved)
+        self.batch_saver.image_failed.connect(self._on_batch_save_failed)
+        self.batch_saver.progress.connect(self._on_batch_save_progress)
+        self.batch_saver.finished.connect(self._on_batch_save_finished)
+        
+        # Encoded file sizes are measured off the GUI thread and cached per pixmap
+        self.size_estimator = FileSizeEstimator(parent, self.encoded_cache)
+        self.size_estimator.size_ready.connect(self._on_file_size_ready)
+        
+        # List thumbnails are made in the background and kept on disk between sessions
+        self.thumbnail_cache = ThumbnailCache(parent)
         
     def select_files(self):
         file_paths, _ = QFileDialog.getOpenFileNames(
@@ -56,39 +103,81 @@ class ImageHandler:
                 )
                 self.heic_message_shown = True
             
-            for file_path in file_paths:
-                try:
-                    # Check if it's a HEIC file
-                    is_heic = file_path.lower().endswith(('.heic'))
-                    
-                    # Open the image based on its format
-                    image = Image.open(file_path)
-                    
-                    # Convert HEIC to RGB if needed
-                    if is_heic and image.mode == 'RGBA':
-                        image = image.convert('RGB')
-                    
-                    self.images[file_path] = image
-                    
-                    # Add to list with custom widget
-                    self.parent.add_image_to_list(os.path.basename(file_path))
-                    
-                    # Store original dimensions and file size
-                    self.original_dimensions[file_path] = image.size
-                    self.current_dimensions[file_path] = image.size
-                    self.file_sizes[file_path] = os.path.getsize(file_path) / (1024 * 1024)
-                    
-                except Exception as e:
-                    QMessageBox.warning(self.parent, "Warning", 
-                                      f"Could not load {os.path.basename(file_path)}: {str(e)}")
-            
-            # Enable buttons if images were loaded
-            if self.parent.image_list.count() > 0:
-                self.parent.toolbar.resize_btn.setEnabled(True)
-                self.parent.toolbar.resize_all_btn.setEnabled(True)
-                self.parent.toolbar.save_btn.setEnabled(True)
-                self.parent.toolbar.save_all_btn.setEnabled(True)
-                self.parent.image_list.setCurrentRow(0)
+            # Headers are read in the background and entries stream in as they finish
+            self.loader.load(file_paths)
+
+    def cancel_loading(self):
+        """Stop loading the remaining files of the current batch"""
+        self.loader.cancel()
+
+    def shutdown(self):
+        """Stop background work before the application exits"""
+        self.loader.cancel()
+        self.batch_resizer.cancel()
+        self.batch_resizer.shutdown()
+        
+        # Queued size estimates skip themselves once no image wants them
+        self.size_estimator.latest.clear()
+        self.size_estimator.pool.clear()
+        
+        # Let running workers finish (saves complete their current file)
+        # so none of them touches Qt objects while the application tears down
+        for pool in (self.loader.pool, self.batch_saver.pool, self.size_estimator.pool):
+            pool.waitForDone()
+        
+        # Finish thumbnails being written to the cache
+        self.thumbnail_cache.close()
+        
+        # Remove history spilled to disk
+        self.history_store.close()
+
+    def request_thumbnail(self, image_id):
+        """Make the list thumbnail for an image once its row is shown"""
+        record = self.records.get(image_id)
+        if record:
+            self.thumbnail_cache.request(image_id, record.source)
+
+    def _on_image_loaded(self, file_path, image):
+        """Register an image once its header has been read"""
+        # Opening a file twice would give two records one path, and their saves would collide
+        if self.record(file_path) is not None:
+            self.load_errors.append(f"{os.path.basename(file_path)}: already open")
+            return
+        
+        self.next_image_id += 1
+        record = ImageRecord(self.next_image_id, file_path, image)
+        self.records[record.image_id] = record
+        self.path_index[file_path] = record  # record() above built the index
+        
+        # Add to list with custom widget
+        self.parent.add_image_to_list(os.path.basename(file_path), record.image_id)
+        
+        # Enable buttons and show the first image as soon as one is available
+        if not self.parent.toolbar.resize_btn.isEnabled():
+            self.parent.toolbar.resize_btn.setEnabled(True)
+            self.parent.toolbar.resize_all_btn.setEnabled(True)
+            self.parent.toolbar.save_btn.setEnabled(True)
+            self.parent.toolbar.save_all_btn.setEnabled(True)
+        if not self.parent.image_list.currentIndex().isValid():
+            self.parent.image_list.select_row(0)
+
+    def _on_image_failed(self, file_path, error):
+        """Remember failures and report them together when the batch ends"""
+        self.load_errors.append(f"{os.path.basename(file_path)}: {error}")
+
+    def _on_loading_progress(self, done, total):
+        self.parent.show_loading_progress(done, total)
+
+    def _on_loading_finished(self, cancelled):
+        self.parent.hide_loading_progress()
+        
+        if self.load_errors:
+            # Keep the dialog readable for large batches
+            details = "\n".join(self.load_errors[:10])
+            if len(self.load_errors) > 10:
+                details += f"\n... and {len(self.load_errors) - 10} more"
+            self.load_errors = []
+            QMessageBox.warning(self.parent, "Warning", f"Could not load some images:\n\n{details}")
 
     def resize_image(self):
         """Resize current image without saving"""
@@ -101,35 +190,28 @@ class ImageHandler:
             size_preset = self.parent.toolbar.size_combo.currentText()
             quality = self.parent.toolbar.quality_slider.value()
             
-            # Get current file path
-            current_item = self.parent.image_list.currentItem()
-            if not current_item:
-                return
-            file_path = self.get_file_path_from_item(current_item)
-            if not file_path:
+            # Get current image
+            record = self.current_record()
+            if not record:
                 return
+            file_path = record.path
 
             # Check if it's a HEIC file
             is_heic = file_path.lower().endswith('.heic')
 
+            # Render from full-resolution pixels, not the preview
+            self.ensure_full_resolution()
+            
             # Save state before updating
             self.save_state()
             
-            # Capture the entire scene including shapes
-            scene_rect = self.parent.scene.sceneRect()
-            temp_pixmap = QPixmap(int(scene_rect.width()), int(scene_rect.height()))
-            temp_pixmap.fill(Qt.white)
-            painter = QPainter(temp_pixmap)
-            self.parent.scene.render(painter)
-            painter.end()
+            # Resize the image's own pixels; annotations are redrawn at the new size
+            source_pixmap = record.edited
+            if source_pixmap is None:
+                return
             
             # Convert QPixmap to PIL Image for resizing
-            temp_buffer = QByteArray()
-            buffer = QBuffer(temp_buffer)
-            buffer.open(QBuffer.WriteOnly)
-            temp_pixmap.save(buffer, 'PNG')
-            buffer.close()
-            source_image = Image.open(BytesIO(temp_buffer.data()))
+            source_image = qpixmap_to_pil(source_pixmap)
             
             # Convert to RGB mode if necessary
             if source_image.mode in ('RGBA', 'LA'):
@@ -149,11 +231,13 @@ class ImageHandler:
             actual_width, actual_height = resized_image.size
             
             # Convert PIL Image to QPixmap
-            img_array = np.array(resized_image)
-            height, width, channels = img_array.shape
-            bytes_per_line = channels * width
-            qimage = QImage(img_array.data, width, height, bytes_per_line, QImage.Format_RGB888)
-            pixmap = QPixmap.fromImage(qimage)
+            pixmap = pil_to_qpixmap(resized_image)
+            
+            # Scale the annotations with the image rather than resampling them
+            layer = record.annotations
+            if layer:
+                layer.transform(QTransform.fromScale(actual_width / source_pixmap.width(),
+                                                     actual_height / source_pixmap.height()))
             
             # Clear scene and add new pixmap
             self.parent.scene.clear()
@@ -162,15 +246,15 @@ class ImageHandler:
             
             # Set scene rect to match the new image size
             self.parent.scene.setSceneRect(0, 0, actual_width, actual_height)
+            self.show_annotations(record)
             
             # Store edited version and update dimensions
-            self.edited_images[file_path] = pixmap
-            self.current_dimensions[file_path] = (actual_width, actual_height)
-            self.resized_images.add(file_path)  # Mark as resized ONLY when explicitly using resize
+            record.edited = pixmap
+            record.size = (actual_width, actual_height)
+            record.resized = True  # Mark as resized ONLY when explicitly using resize
             
-            # Calculate and store file size using the accurate method
-            accurate_file_size = self.calculate_file_size(pixmap, quality)
-            self.edited_file_sizes[file_path] = accurate_file_size
+            # Look up the file size; a background encode updates the label if needed
+            accurate_file_size = self.request_file_size(record, self.composite(record))
             
             # Update info labels
             self.parent.size_label.setText(f"Size: {actual_width} × {actual_height}px")
@@ -181,7 +265,7 @@ class ImageHandler:
             self.fit_image_to_view()
             
             # Store view scale
-            self.view_scale[file_path] = self.parent.view.transform().m11()
+            record.view_scale = self.parent.view.transform().m11()
             
             # Mark as modified
             self.modified = True
@@ -195,13 +279,10 @@ class ImageHandler:
 
     def save_current(self):
         """Save the current image"""
-        current_item = self.parent.image_list.currentItem()
-        if not current_item:
-            return
-        
-        file_path = self.get_file_path_from_item(current_item)
-        if not file_path:
+        record = self.current_record()
+        if not record:
             return
+        file_path = record.path
 
         # Get save path
         save_path = self.resizer.get_save_path(self.parent, file_path)
@@ -210,12 +291,14 @@ class ImageHandler:
         
         try:
             # Check if the image has been modified
-            has_shapes = file_path in self.edited_images  # Has shapes or other edits
-            is_resized = file_path in self.resized_images  # Has been explicitly resized
+            has_shapes = record.edited is not None  # Has shapes or other edits
+            is_resized = record.resized  # Has been explicitly resized
             is_modified = has_shapes or is_resized
             
-            # Check if the original file exists (it might not if the image was renamed)
-            original_file_exists = os.path.exists(file_path)
+            # Check if the original file still exists; renamed images keep reading it
+            # from where it was loaded
+            original_path = record.source.path
+            original_file_exists = os.path.exists(original_path)
             
             # Check if original is HEIC
             is_heic_source = file_path.lower().endswith('.heic')
@@ -231,68 +314,17 @@ class ImageHandler:
                 else:
                     save_path = save_path + orig_ext
             
-            # Get the pixmap to save
-            pixmap = None
-            if file_path in self.edited_images:
-                # For images with shapes or edits, use the edited image directly
-                pixmap = self.edited_images[file_path]
-            elif original_file_exists:
-                # For unmodified images, use the original
-                original_image = self.images.get(file_path)
-                if original_image:
-                    # Convert PIL image to RGB if it's RGBA
-                    if original_image.mode == 'RGBA':
-                        original_image = original_image.convert('RGB')
-                    img_array = np.array(original_image)
-                    if len(img_array.shape) == 3:  # Color image
-                        array_height, array_width, channels = img_array.shape
-                        bytes_per_line = channels * array_width
-                        qimage = QImage(img_array.data, array_width, array_height, bytes_per_line, QImage.Format_RGB888)
-                    else:  # Grayscale image
-                        array_height, array_width = img_array.shape
-                        bytes_per_line = array_width
-                        qimage = QImage(img_array.data, array_width, array_height, bytes_per_line, QImage.Format_Grayscale8)
-                    pixmap = QPixmap.fromImage(qimage)
-            
-            if not pixmap:
+            if self.can_copy_original(record, save_path):
+                # Untouched image in its own format: copy the original bytes instead of re-encoding
+                if not (os.path.exists(save_path) and os.path.samefile(original_path, save_path)):
+                    shutil.copyfile(original_path, save_path)
+            elif not self._encode_for_save(record, save_path, is_modified, is_heic_source, original_file_exists):
                 QMessageBox.critical(self.parent, "Error", "Could not get image data to save.")
                 return
             
-            # Save the image with appropriate settings
-            save_ext = os.path.splitext(save_path)[1].lower()
-            if save_ext in ['.jpg', '.jpeg']:
-                # For JPEG, we need to handle quality settings
-                if is_modified or is_heic_source:
-                    # Only apply quality settings if the image has been modified or if from HEIC
-                    quality = self.parent.toolbar.quality_slider.value()
-                    
-                    # For HEIC sources, apply higher compression to better match original file size
-                    if is_heic_source and file_path in self.edited_images:
-                        # Apply additional compression for HEIC sources
-                        adjusted_quality = max(30, int(quality * 0.6))  # Scale down quality but keep minimum 30
-                        pixmap.save(save_path, 'JPEG', adjusted_quality)
-                    else:
-                        pixmap.save(save_path, 'JPEG', quality)
-                else:
-                    # For unmodified images, save with maximum quality
-                    pixmap.save(save_path, 'JPEG', 100)
-            else:
-                # For other formats, use their native format with maximum quality
-                format_map = {
-                    '.png': ('PNG', -1),  # -1 means maximum compression for PNG
-                    '.gif': ('GIF', None),
-                    '.bmp': ('BMP', None),
-                    '.tiff': ('TIFF', None)
-                }
-                img_format, quality = format_map.get(save_ext, ('PNG', -1))
-                if quality is not None:
-                    pixmap.save(save_path, img_format, quality)
-                else:
-                    pixmap.save(save_path, img_format)
-            
             # Show appropriate success message
             if original_file_exists:
-                original_size = os.path.getsize(file_path)
+                original_size = os.path.getsize(original_path)
                 new_size = os.path.getsize(save_path)
                 orig_mb, new_mb, reduction = self.resizer.calculate_statistics(original_size, new_size)
                 
@@ -332,11 +364,92 @@ class ImageHandler:
         except Exception as e:
             QMessageBox.critical(self.parent, "Error", f"Failed to save image: {str(e)}")
 
+    def _encode_for_save(self, record, save_path, is_modified, is_heic_source, original_file_exists):
+        """Encode the current or original pixels of an image to save_path"""
+        # Get the pixmap to save
+        pixmap = None
+        if record.edited is not None:
+            # For images with shapes or edits, draw the annotations over the edited pixels
+            pixmap = self.composite(record)
+        elif original_file_exists:
+            # For unmodified images, decode the original
+            original_image = self.load_image(record)
+            if original_image:
+                # Convert PIL image to RGB if it's RGBA
+                if original_image.mode == 'RGBA':
+                    original_image = original_image.convert('RGB')
+                pixmap = pil_to_qpixmap(original_image)
+        
+        if not pixmap:
+            return False
+        
+        # Save the image with appropriate settings
+        save_ext = os.path.splitext(save_path)[1].lower()
+        if save_ext in ['.jpg', '.jpeg']:
+            # For JPEG, we need to handle quality settings
+            if is_modified or is_heic_source:
+                # Only apply quality settings if the image has been modified or if from HEIC
+                quality = self.parent.toolbar.quality_slider.value()
+                
+                # For HEIC sources, apply higher compression to better match original file size
+                if is_heic_source and record.edited is not None:
+                    # Apply additional compression for HEIC sources
+                    adjusted_quality = max(30, int(quality * 0.6))  # Scale down quality but keep minimum 30
+                    return self.write_pixmap(pixmap, save_path, 'JPEG', adjusted_quality)
+                return self.write_pixmap(pixmap, save_path, 'JPEG', quality)
+            # For unmodified images, save with maximum quality
+            return self.write_pixmap(pixmap, save_path, 'JPEG', 100)
+        else:
+            # For other formats, use their native format with maximum quality
+            format_map = {
+                '.png': ('PNG', -1),  # -1 means maximum compression for PNG
+                '.gif': ('GIF', None),
+                '.bmp': ('BMP', None),
+                '.tiff': ('TIFF', None)
+            }
+            img_format, quality = format_map.get(save_ext, ('PNG', -1))
+            if quality is not None:
+                return self.write_pixmap(pixmap, save_path, img_format, quality)
+            return self.write_pixmap(pixmap, save_path, img_format, -1)
+
+    def can_copy_original(self, record, save_path):
+        """Check whether saving would only re-encode an untouched original in its own format"""
+        if record.edited is not None or record.resized:
+            return False
+        if not os.path.exists(record.source.path):
+            return False
+        save_format = SAVE_FORMATS.get(os.path.splitext(save_path)[1].lower())
+        return save_format is not None and save_format == record.source.format
+
+    def write_pixmap(self, pixmap, save_path, img_format, quality):
+        """Write a pixmap, reusing the bytes encoded for its size estimate when possible"""
+        digest = self.encoded_cache.digest_for(pixmap.cacheKey())
+        if digest is None:
+            # Hashing is far cheaper than encoding, and catches copies of estimated pixmaps
+            digest = image_digest(pixmap.toImage())
+        data = self.encoded_cache.get(digest, img_format, quality)
+        if data is None:
+            if pixmap.save(save_path, img_format, quality):
+                return True
+            # Qt has no writer for some formats (GIF), so let Pillow write those
+            image = qpixmap_to_pil(pixmap)
+            if img_format == 'JPEG':
+                image = image.convert('RGB')
+                image.save(save_path, img_format, quality=quality if quality >= 0 else 95)
+            else:
+                image.save(save_path, img_format)
+            return os.path.exists(save_path)
+        with open(save_path, 'wb') as f:
+            f.write(data)
+        return True
+
     def resize_all_images(self):
         """Resize all images without saving"""
-        if not self.images:
+        if not self.records:
             QMessageBox.warning(self.parent, "Warning", "No images loaded!")
             return
+        if self.batch_resizer.is_running():
+            return
             
         # Show overlay
         self.parent.overlay.show()
@@ -349,120 +462,128 @@ class ImageHandler:
         QTimer.singleShot(100, self._perform_resize_all)
         
     def _perform_resize_all(self):
-        """Perform the actual resize all operation"""
+        """Hand every image to the batch resizer; results stream back as they finish"""
+        # Get current settings
+        size_preset = self.parent.toolbar.size_combo.currentText()
+        
+        # Collect all images to process, in list order; jobs are keyed by image ID
+        # so renaming, deleting or reopening files mid-batch can't misroute results
         try:
-            # Get current settings
-            size_preset = self.parent.toolbar.size_combo.currentText()
-            quality = self.parent.toolbar.quality_slider.value()
-            
-            # Store current selection to restore later
-            current_item = self.parent.image_list.currentItem()
-            
-            # Collect all items to process
-            items_to_process = []
-            for i in range(self.parent.image_list.count()):
-                item = self.parent.image_list.item(i)
-                file_path = self.get_file_path_from_item(item)
-                if file_path:
-                    items_to_process.append((item, file_path))
-            
-            # Update UI before processing starts
-            QApplication.processEvents()
-            
-            # Process all images
-            for idx, (item, file_path) in enumerate(items_to_process):
-                # Update overlay text with progress
-                self.parent.overlay.label.setText(f"Resizing images... ({idx + 1}/{len(items_to_process)})")
-                QApplication.processEvents()
-                
-                # Get the original or edited image for this file
-                source_image = None
-                if file_path in self.edited_images:
-                    # Convert QPixmap to PIL Image
-                    pixmap = self.edited_images[file_path]
-                    temp_buffer = QByteArray()
-                    buffer = QBuffer(temp_buffer)
-                    buffer.open(QBuffer.WriteOnly)
-                    pixmap.save(buffer, 'PNG')
-                    buffer.close()
-                    source_image = Image.open(BytesIO(temp_buffer.data()))
-                else:
-                    source_image = self.images[file_path]
-                    
-                # Ensure source image is in RGB mode if needed
-                if source_image.mode == 'RGBA':
-                    source_image = source_image.convert('RGB')
-                
-                # Resize the image
-                resized_image = self.resizer.resize_single(source_image, size_preset)
-                if not resized_image:
-                    continue
-                
-                # Convert to QPixmap with quality
-                img_byte_arr = BytesIO()
-                resized_image.save(img_byte_arr, format='JPEG', quality=quality)
-                img_byte_arr.seek(0)
-                
-                # Convert to QPixmap and store
-                qimage = QImage.fromData(img_byte_arr.getvalue())
-                pixmap = QPixmap.fromImage(qimage)
-                
-                # Store edited version and dimensions
-                self.edited_images[file_path] = pixmap
-                self.current_dimensions[file_path] = resized_image.size
-                self.resized_images.add(file_path)  # Mark as resized
-                
-                # Calculate the accurate file size directly using our dedicated method
-                accurate_file_size = self.calculate_file_size(pixmap, quality)
-                self.edited_file_sizes[file_path] = accurate_file_size
-                
-                # If this is the current image, update the preview
-                if item == current_item:
-                    self.parent.scene.clear()
-                    scene_pixmap_item = self.parent.scene.addPixmap(pixmap)
-                    scene_pixmap_item.setTransformationMode(Qt.SmoothTransformation)
-                    
-                    # Set scene rect to match the new image size
-                    self.parent.scene.setSceneRect(0, 0, resized_image.size[0], resized_image.size[1])
-                    
-                    # Reset view transform and fit to view
-                    self.parent.view.resetTransform()
-                    self.fit_image_to_view()
-                    
-                    # Store view scale for current image
-                    self.view_scale[file_path] = self.parent.view.transform().m11()
-                    
-                    # Update the file size label with the correct value
-                    self.parent.file_size_label.setText(f"File size: {accurate_file_size:.2f}MB")
-                
-                # Force UI update every few processed files
-                if idx % 3 == 0:
-                    QApplication.processEvents()
-            
-            # Mark all as modified
-            self.modified = True
+            self.resize_submitted = {}
+            jobs = [self._resize_job(record) for record in self.records.values()]
             
-            # Final UI update before showing success dialog
-            QApplication.processEvents()
+            self.resize_errors = []
+            self.resized_count = 0
+            self.batch_resizer.resize(jobs, size_preset)
+        except Exception as e:
+            # Drop whatever was queued so Resize All can be started again
+            self.batch_resizer.cancel()
+            self.parent.overlay.hide()
+            QMessageBox.critical(self.parent, "Error", f"An error occurred: {str(e)}")
+
+    def _resize_job(self, record):
+        """Resize job for an image, remembering the pixels and size it starts from"""
+        edited = record.edited
+        self.resize_submitted[record.image_id] = (edited.cacheKey() if edited is not None else None, record.size)
+        # Edited images are resized from their pixmap, others are decoded in the worker
+        return record.image_id, edited if edited is not None else record.source
+
+    def _on_batch_resized(self, image_id, resized_image):
+        """Store one resized image as soon as its worker finishes"""
+        # Skip images that were deleted while the batch was running
+        record = self.records.get(image_id)
+        submitted = self.resize_submitted.pop(image_id, None)
+        if record is None or submitted is None:
+            return
+        
+        # The image was cropped, erased or undone after its job was queued; the result
+        # would throw that away, so resize its current pixels instead
+        edited_key, (old_width, old_height) = submitted
+        current_key = record.edited.cacheKey() if record.edited is not None else None
+        if current_key != edited_key or record.size != (old_width, old_height):
+            self.batch_resizer.requeue(*self._resize_job(record))
+            return
+        self.resized_count += 1
+        
+        # Convert to QPixmap and store; quality is applied when saving
+        pixmap = pil_to_qpixmap(resized_image)
+        
+        # Annotations were left out of the resize; scale them from the size it was resized from
+        layer = record.annotations
+        if layer:
+            layer.transform(QTransform.fromScale(resized_image.size[0] / old_width,
+                                                 resized_image.size[1] / old_height))
+        
+        # Store edited version and dimensions
+        record.edited = pixmap
+        record.size = resized_image.size
+        record.resized = True  # Mark as resized
+        
+        # Look up the file size; a background encode updates the label if needed
+        accurate_file_size = self.request_file_size(record, self.composite(record))
+        
+        # If this is the current image, update the preview
+        if record is self.current_record():
+            self.preview_record = None
+            self.parent.scene.clear()
+            scene_pixmap_item = self.parent.scene.addPixmap(pixmap)
+            scene_pixmap_item.setTransformationMode(Qt.SmoothTransformation)
             
-            # Create custom success dialog
-            success_dialog = QMessageBox(self.parent)
-            success_dialog.setWindowTitle("Success")
-            success_dialog.setText(f"Successfully resized {len(items_to_process)} images!")
-            success_dialog.setIcon(QMessageBox.Information)
+            # Set scene rect to match the new image size
+            self.parent.scene.setSceneRect(0, 0, resized_image.size[0], resized_image.size[1])
+            self.show_annotations(record)
             
-            # Style the dialog to match app theme
-            success_dialog.setStyleSheet(SUCCESS_RESIZE_DIALOG_STYLE)
+            # Reset view transform and fit to view
+            self.parent.view.resetTransform()
+            self.fit_image_to_view()
             
-            # Show the dialog
-            success_dialog.exec_()
+            # Store view scale for current image
+            record.view_scale = self.parent.view.transform().m11()
             
-        except Exception as e:
-            QMessageBox.critical(self.parent, "Error", f"An error occurred: {str(e)}")
-        finally:
-            # Hide overlay
-            self.parent.overlay.hide()
-            QApplication.processEvents()
+            # Update the info labels with the correct values
+            self.parent.size_label.setText(f"Size: {resized_image.size[0]} × {resized_image.size[1]}px")
+            self.parent.file_size_label.setText(f"File size: {accurate_file_size:.2f}MB")
+
+    def _on_batch_resize_failed(self, image_id, error):
+        """Remember failures and report them together when the batch ends"""
+        self.resize_submitted.pop(image_id, None)
+        record = self.records.get(image_id)
+        if record:
+            self.resize_errors.append(f"{os.path.basename(record.path)}: {error}")
+
+    def _on_batch_resize_progress(self, done, total):
+        self.parent.overlay.label.setText(f"Resizing images... ({done}/{total})")
+
+    def _on_batch_resize_finished(self, cancelled):
+        # Hide overlay
+        self.parent.overlay.hide()
+        if cancelled:
+            return
+        
+        # Mark all as modified
+        self.modified = True
+        
+        if self.resize_errors:
+            # Keep the dialog readable for large batches
+            details = "\n".join(self.resize_errors[:10])
+            if len(self.resize_errors) > 10:
+                details += f"\n... and {len(self.resize_errors) - 10} more"
+            QMessageBox.warning(self.parent, "Warning", f"Could not resize some images:\n\n{details}")
+        
+        # Create custom success dialog
+        resized_count = self.resized_count
+        if not resized_count:
+            return
+        success_dialog = QMessageBox(self.parent)
+        success_dialog.setWindowTitle("Success")
+        success_dialog.setText(f"Successfully resized {resized_count} images!")
+        success_dialog.setIcon(QMessageBox.Information)
+        
+        # Style the dialog to match app theme
+        success_dialog.setStyleSheet(SUCCESS_RESIZE_DIALOG_STYLE)
+        
+        # Show the dialog
+        success_dialog.exec_()
 
     def fit_image_to_view(self):
         """Helper method to properly fit and center image in view"""
@@ -488,11 +609,9 @@ class ImageHandler:
             QApplication.processEvents()
             
             # Store the view scale for the current image
-            current_item = self.parent.image_list.currentItem()
-            if current_item:
-                file_path = self.get_file_path_from_item(current_item)
-                if file_path:
-                    self.view_scale[file_path] = self.parent.view.transform().m11()
+            record = self.current_record()
+            if record:
+                record.view_scale = self.parent.view.transform().m11()
             
             # Reset scrollbars one final time
             self.parent.view.horizontalScrollBar().setValue(0)
@@ -501,9 +620,9 @@ class ImageHandler:
     def image_selected(self, current, previous):
         """Handle image selection change"""
         # Make sure to save the eraser state of the previous image before switching
-        if previous and hasattr(self.parent, 'tool_manager'):
-            prev_file_path = self.get_file_path_from_item(previous)
-            if prev_file_path and prev_file_path in self.edited_images:
+        if hasattr(self.parent, 'tool_manager'):
+            prev_record = self.index_record(previous)
+            if prev_record and prev_record.edited is not None:
                 # Force save state to preserve eraser changes before switching
                 # Get current tool to check if it's the eraser
                 current_tool = self.parent.tool_manager.current_tool
@@ -512,35 +631,33 @@ class ImageHandler:
                     current_tool.deactivate()
                 
                 # Save state explicitly for the previous image
-                self.save_state(prev_file_path)
-        
-        if not current:
-            return
+                self.save_state(prev_record)
         
-        # Get file path from item
-        file_path = self.get_file_path_from_item(current)
-        if not file_path:
+        # Get the image's record from the row
+        record = self.index_record(current)
+        if not record:
             return
         
         # Clear the scene first
         self.parent.scene.clear()
+        self.preview_record = None
         
         # Load the image into the scene
-        if file_path in self.edited_images:
+        if record.edited is not None:
             # Use edited version with all its modifications
-            pixmap = self.edited_images[file_path]
-            width, height = self.current_dimensions[file_path]
+            pixmap = record.edited
+            width, height = record.size
             
-            # Calculate accurate file size using the pixmap with the current quality setting
-            accurate_file_size = self.calculate_file_size(pixmap)
-            self.edited_file_sizes[file_path] = accurate_file_size
+            # Look up the file size for the current quality setting
+            self.request_file_size(record, self.composite(record))
             
-            # Add pixmap to scene
+            # Add pixmap to scene, with its annotations drawn live above it
             scene_pixmap_item = self.parent.scene.addPixmap(pixmap)
             scene_pixmap_item.setTransformationMode(Qt.SmoothTransformation)
             
             # Set scene rect to exactly match the image size
             self.parent.scene.setSceneRect(0, 0, width, height)
+            self.show_annotations(record)
             
             # Use the helper method to fit image
             self.fit_image_to_view()
@@ -551,31 +668,27 @@ class ImageHandler:
                 if current_tool and hasattr(current_tool, 'shape_handler'):
                     current_tool.shape_handler.clear_selection()
         else:
-            # Use original PIL Image
-            original_image = self.images.get(file_path)
+            # Decode only as many pixels as the view can show, unless a tool
+            # is active and needs the full-resolution image to draw on
+            editing = hasattr(self.parent, 'tool_manager') and self.parent.tool_manager.current_tool is not None
+            if editing:
+                original_image, preview_scale = self.load_image(record), 1.0
+            else:
+                original_image, preview_scale = self.load_preview(record)
             if original_image:
                 # Store original dimensions first
-                orig_width, orig_height = original_image.size
-                self.current_dimensions[file_path] = (orig_width, orig_height)
-                
-                # Get file size
-                file_size = self.file_sizes.get(file_path, 0)
+                orig_width, orig_height = record.source.size
+                record.size = (orig_width, orig_height)
                 
                 # Convert PIL Image to QPixmap
-                img_array = np.array(original_image)
-                if len(img_array.shape) == 3:  # Color image
-                    array_height, array_width, channels = img_array.shape
-                    bytes_per_line = channels * array_width
-                    qimage = QImage(img_array.data, array_width, array_height, bytes_per_line, QImage.Format_RGB888)
-                else:  # Grayscale image
-                    array_height, array_width = img_array.shape
-                    bytes_per_line = array_width
-                    qimage = QImage(img_array.data, array_width, array_height, bytes_per_line, QImage.Format_Grayscale8)
-                pixmap = QPixmap.fromImage(qimage)
+                pixmap = pil_to_qpixmap(original_image)
                 
-                # Add pixmap to scene
+                # Add pixmap to scene, scaled up so it covers the full-resolution scene rect
                 scene_pixmap_item = self.parent.scene.addPixmap(pixmap)
                 scene_pixmap_item.setTransformationMode(Qt.SmoothTransformation)
+                if preview_scale != 1.0:
+                    scene_pixmap_item.setScale(preview_scale)
+                    self.preview_record = record
                 
                 # Set scene rect to exactly match the image size
                 self.parent.scene.setSceneRect(0, 0, orig_width, orig_height)
@@ -587,55 +700,43 @@ class ImageHandler:
                 width, height = orig_width, orig_height
         
         # Update current image reference
-        self.current_image = self.images.get(file_path)
+        self.current_image = record.source
         
         # Update info labels with correct dimensions and file size
         self.parent.size_label.setText(f"Size: {width} × {height}px")
-        self.parent.file_size_label.setText(f"File size: {self.edited_file_sizes.get(file_path, self.file_sizes.get(file_path, 0)):.2f}MB")
+        self.parent.file_size_label.setText(f"File size: {record.shown_file_size():.2f}MB")
         
         # Adjust line width for drawing tools based on actual image dimensions
         actual_diagonal = (width**2 + height**2)**0.5
         self._update_tool_sizes(actual_diagonal)
         
-        # Update the edited_file_sizes if it's not set
-        if file_path not in self.edited_file_sizes:
-            self.edited_file_sizes[file_path] = self.file_sizes.get(file_path, 0)
+        # Update the edited file size if it's not set
+        if record.edited_file_size is None:
+            record.edited_file_size = record.file_size
             
         # Update undo/redo button states based on the selected image's history
-        has_history = file_path in self.image_histories and len(self.image_histories[file_path]) > 0
-        has_redo = file_path in self.image_redo_stacks and len(self.image_redo_stacks[file_path]) > 0
-        self.parent.toolbar.undo_btn.setEnabled(has_history)
-        self.parent.toolbar.redo_btn.setEnabled(has_redo)
+        self._update_history_buttons(record)
         
-        # Update current tool's image path if it's the eraser
+        # Update the image the eraser works on
         if hasattr(self.parent, 'tool_manager'):
             current_tool = self.parent.tool_manager.current_tool
             if current_tool and current_tool.__class__.__name__ == 'EraserTool':
-                current_tool.current_image_path = file_path
-                # Update temp_image to match current pixmap
-                for item in self.parent.scene.items():
-                    if isinstance(item, QGraphicsPixmapItem):
-                        current_tool.temp_image = item.pixmap().copy()
-                        break
+                current_tool.image_record = record
+                # The scene was rebuilt, so show the eraser outline again
+                current_tool.create_cursor_indicator()
 
-    def update_preview_and_info(self, file_path):
+    def update_preview_and_info(self, record):
         """Update the preview area and info labels with current image"""
         if self.current_image:
             # Clear previous scene
             self.parent.scene.clear()
             
             # Create preview
-            preview = self.current_image.copy()
+            preview = self.current_image.load()
             preview.thumbnail((800, 800))
             
             # Convert to QPixmap and add to scene
-            preview_array = np.array(preview)
-            height, width, channels = preview_array.shape
-            bytes_per_line = channels * width
-            preview_array = preview_array[:, :, ::-1].copy()  # Convert BGR to RGB
-            qimage = QImage(preview_array.data, width, height, 
-                          bytes_per_line, QImage.Format_RGB888)
-            pixmap = QPixmap.fromImage(qimage)
+            pixmap = pil_to_qpixmap(preview)
             
             # Add pixmap to scene
             self.parent.scene.addPixmap(pixmap)
@@ -643,8 +744,8 @@ class ImageHandler:
             self.parent.view.fitInView(self.parent.scene.sceneRect(), Qt.KeepAspectRatio)
             
             # Update dimensions and file size
-            current_width, current_height = self.current_dimensions[file_path]
-            file_size = self.edited_file_sizes.get(file_path, self.file_sizes[file_path])
+            current_width, current_height = record.size
+            file_size = record.shown_file_size()
             
             # Update info labels
             self.parent.size_label.setText(f"Size: {current_width} × {current_height}px")
@@ -652,23 +753,24 @@ class ImageHandler:
             
             self.aspect_ratio = current_width / current_height
 
-    def update_preview_with_edited(self, file_path):
+    def update_preview_with_edited(self, record):
         """Update preview with edited version of the image"""
-        if self.edited_images.get(file_path):
+        if record and record.edited:
             # Clear previous scene
             self.parent.scene.clear()
             
             # Add edited pixmap
-            edited_pixmap = self.edited_images[file_path]
+            edited_pixmap = record.edited
             scene_pixmap_item = self.parent.scene.addPixmap(edited_pixmap)
             scene_pixmap_item.setTransformationMode(Qt.SmoothTransformation)
+            self.show_annotations(record)
             
             # Use helper method to fit image
             self.fit_image_to_view()
             
             # Update dimensions and file size
-            current_width, current_height = self.current_dimensions[file_path]
-            file_size = self.edited_file_sizes.get(file_path, self.file_sizes[file_path])
+            current_width, current_height = record.size
+            file_size = record.shown_file_size()
             
             # Update info labels
             self.parent.size_label.setText(f"Size: {current_width} × {current_height}px")
@@ -676,16 +778,18 @@ class ImageHandler:
             
             self.aspect_ratio = current_width / current_height
 
-    def save_state(self, specific_file_path=None):
+    def save_state(self, record=None):
         """Save current state for undo/redo"""
-        current_item = self.parent.image_list.currentItem()
-        if not current_item:
+        if not self.parent.image_list.currentIndex().isValid():
             return
             
-        file_path = specific_file_path or self.get_file_path_from_item(current_item)
-        if not file_path:
+        record = record or self.current_record()
+        if not record:
             return
         
+        # History entries must hold full-resolution pixels
+        self.ensure_full_resolution()
+        
         # Check if this is a crop operation
         is_crop_operation = False
         if hasattr(self.parent, 'tool_manager'):
@@ -708,77 +812,66 @@ class ImageHandler:
         width = int(scene_rect.width())
         height = int(scene_rect.height())
         
-        # Create pixmap with white background
-        temp_pixmap = QPixmap(width, height)
-        temp_pixmap.fill(Qt.white)
-        
-        # Create painter with high quality settings
-        painter = QPainter(temp_pixmap)
-        painter.setRenderHint(QPainter.Antialiasing, True)
-        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
-        painter.setRenderHint(QPainter.HighQualityAntialiasing, True)
-        
-        # Render the scene at the correct dimensions
-        self.parent.scene.render(painter, QRectF(temp_pixmap.rect()), scene_rect)
-        painter.end()
+        # The image's own pixels; annotations are recorded as vectors beside them
+        pixmap = None
+        for item in self.parent.scene.items():
+            if isinstance(item, QGraphicsPixmapItem):
+                pixmap = item.pixmap()
+                break
+        if pixmap is None:
+            return
+        layer = record.annotations
         
         # Initialize history if needed
-        if file_path not in self.image_histories:
-            self.image_histories[file_path] = []
+        if record.history is None:
+            record.history = ImageHistory(self.history_store, self.max_history)
         
-        # Create state
+        # Store edited version
+        record.edited = pixmap
+        
+        # Create state; the history keeps only the pixels that changed
         state = {
-            'pixmap': temp_pixmap,
             'dimensions': (width, height),
             'scene_rect': scene_rect,
-            'file_size': self.calculate_file_size(temp_pixmap),
-            'is_resized': file_path in self.resized_images,
-            'view_scale': self.view_scale.get(file_path, 1.0),
-            'file_path': file_path,
-            'is_crop': is_crop_operation
+            'file_size': self.request_file_size(record, self.composite(record)),
+            'is_resized': record.resized,
+            'view_scale': record.view_scale,
+            'file_path': record.path,
+            'is_crop': is_crop_operation,
+            'annotations': layer.snapshot() if layer else ()
         }
         
-        # Add state to history
-        self.image_histories[file_path].append(state)
-        
-        # Store edited version
-        self.edited_images[file_path] = temp_pixmap.copy()
+        # Add state to history, which also drops any redo steps
+        record.history.push(state, pixmap)
         
         # Update dimensions and file size
-        self.current_dimensions[file_path] = (width, height)
-        self.edited_file_sizes[file_path] = state['file_size']
-        
-        # Clear redo stack and disable redo button
-        if file_path in self.image_redo_stacks:
-            self.image_redo_stacks[file_path].clear()
-        self.parent.toolbar.redo_btn.setEnabled(False)
+        record.size = (width, height)
+        record.edited_file_size = state['file_size']
         
-        # Update undo button state
-        self.parent.toolbar.undo_btn.setEnabled(len(self.image_histories.get(file_path, [])) > 0)
+        # Update undo/redo button states
+        self._update_history_buttons(record)
         
         # Update info labels
         self.update_info_label()
 
     def update_info_label(self):
         """Update the info labels with current image information"""
-        current_item = self.parent.image_list.currentItem()
-        if current_item:
-            file_path = self.get_file_path_from_item(current_item)
-            if file_path:
-                current_width, current_height = self.current_dimensions[file_path]
-                file_size = self.edited_file_sizes.get(file_path, self.file_sizes[file_path])
-                
-                self.parent.size_label.setText(f"Size: {current_width} × {current_height}px")
-                self.parent.file_size_label.setText(f"File size: {file_size:.2f}MB") 
+        record = self.current_record()
+        if record:
+            current_width, current_height = record.size
+            file_size = record.shown_file_size()
+            
+            self.parent.size_label.setText(f"Size: {current_width} × {current_height}px")
+            self.parent.file_size_label.setText(f"File size: {file_size:.2f}MB") 
 
     def undo(self):
         """Undo last action"""
-        current_item = self.parent.image_list.currentItem()
-        if not current_item:
+        record = self.current_record()
+        if not record:
             return
             
-        current_file_path = self.get_file_path_from_item(current_item)
-        if not current_file_path or current_file_path not in self.image_histories:
+        history = record.history
+        if not history or not history.can_undo():
             return
             
         # Clear any active tool or selection
@@ -791,35 +884,20 @@ class ImageHandler:
                     current_tool.deactivate()
                     QApplication.processEvents()
         
-        # Get current state
-        if not self.image_histories[current_file_path]:
-            return
-            
-        current_state = self.image_histories[current_file_path].pop()
-        
-        # Initialize redo stack if needed
-        if current_file_path not in self.image_redo_stacks:
-            self.image_redo_stacks[current_file_path] = []
-        
-        # Add current state to redo stack
-        self.image_redo_stacks[current_file_path].append(current_state)
+        # Step back; the undone state stays in the history for redo
+        current_state = history.undo()
         
         # If we have more history, restore the previous state
-        if self.image_histories[current_file_path]:
-            prev_state = self.image_histories[current_file_path][-1]
-            self._apply_state(prev_state, current_file_path)
+        prev_state = history.current()
+        if prev_state:
+            self._apply_state(prev_state, record)
             
-            # If we just undid a resize operation, clear redo stack and disable redo button
+            # If we just undid a resize operation, drop the redo steps
             if current_state.get('is_resized', False) and not prev_state.get('is_resized', False):
-                self.image_redo_stacks[current_file_path].clear()
-                self.parent.toolbar.redo_btn.setEnabled(False)
-            else:
-                # Update redo button state normally
-                self.parent.toolbar.redo_btn.setEnabled(len(self.image_redo_stacks.get(current_file_path, [])) > 0)
+                history.clear_redo()
             
             # Update file size label with the current state's file size
-            current_file_size = self.calculate_file_size(prev_state['pixmap'])
-            self.edited_file_sizes[current_file_path] = current_file_size
+            current_file_size = self.request_file_size(record, self.composite(record))
             self.parent.file_size_label.setText(f"File size: {current_file_size:.2f}MB")
             
             # Force UI update
@@ -827,21 +905,27 @@ class ImageHandler:
             QApplication.processEvents()
         else:
             # If no more history, revert to original
-            self._revert_to_original(current_file_path)
+            self._revert_to_original(record)
             
             # Update file size label with original file size
-            original_file_size = self.file_sizes[current_file_path]
-            self.edited_file_sizes[current_file_path] = original_file_size
+            original_file_size = record.file_size
+            record.edited_file_size = original_file_size
             self.parent.file_size_label.setText(f"File size: {original_file_size:.2f}MB")
             
             # Force UI update
             self.parent.file_size_label.repaint()
             QApplication.processEvents()
         
-        # Update undo button state
-        self.parent.toolbar.undo_btn.setEnabled(len(self.image_histories.get(current_file_path, [])) > 0)
+        # Update undo/redo button states
+        self._update_history_buttons(record)
+
+    def _update_history_buttons(self, record):
+        """Enable undo/redo to match the history of an image"""
+        history = record.history if record else None
+        self.parent.toolbar.undo_btn.setEnabled(bool(history and history.can_undo()))
+        self.parent.toolbar.redo_btn.setEnabled(bool(history and history.can_redo()))
 
-    def _apply_state(self, state, file_path):
+    def _apply_state(self, state, record):
         """Helper method to apply a state"""
         # Clear scene and update
         self.parent.scene.clear()
@@ -857,21 +941,23 @@ class ImageHandler:
         # Set scene rect
         self.parent.scene.setSceneRect(0, 0, width, height)
         
-        # Calculate current file size
-        current_file_size = self.calculate_file_size(state['pixmap'])
+        # Bring back the annotations this state had
+        if record.annotations is None:
+            record.annotations = AnnotationLayer()
+        record.annotations.restore(state['annotations'])
+        self.show_annotations(record)
         
-        # Update dimensions and file size
-        self.current_dimensions[file_path] = state['dimensions']
-        self.edited_file_sizes[file_path] = current_file_size
+        # Update dimensions
+        record.size = state['dimensions']
         
         # Update resize state
-        if state['is_resized']:
-            self.resized_images.add(file_path)
-        else:
-            self.resized_images.discard(file_path)
+        record.resized = state['is_resized']
         
         # Store edited version
-        self.edited_images[file_path] = state['pixmap'].copy()
+        record.edited = state['pixmap']
+        
+        # Look up the file size; a background encode updates the label if needed
+        current_file_size = self.request_file_size(record, self.composite(record))
         
         # Reset view transform
         self.parent.view.resetTransform()
@@ -892,10 +978,10 @@ class ImageHandler:
         self.parent.view.centerOn(scene_rect.center())
         
         # Store the view scale
-        self.view_scale[file_path] = scale
+        record.view_scale = scale
         
         # Update tool sizes
-        actual_width, actual_height = self.current_dimensions[file_path]
+        actual_width, actual_height = record.size
         diagonal = (actual_width**2 + actual_height**2)**0.5
         self._update_tool_sizes(diagonal)
         
@@ -907,27 +993,20 @@ class ImageHandler:
         self.parent.scene.update()
         QApplication.processEvents()
 
-    def _revert_to_original(self, file_path):
+    def _revert_to_original(self, record):
         """Helper method to revert to original image"""
         # Clear scene
         self.parent.scene.clear()
         
-        if file_path in self.images:
-            self.edited_images.pop(file_path, None)
-            self.resized_images.discard(file_path)
+        if record:
+            record.edited = None
+            record.annotations = None
+            record.resized = False
             
             # Convert original image to pixmap
-            original_image = self.images[file_path]
-            img_array = np.array(original_image)
-            if len(img_array.shape) == 3:
-                height, width, channels = img_array.shape
-                bytes_per_line = channels * width
-                qimage = QImage(img_array.data, width, height, bytes_per_line, QImage.Format_RGB888)
-            else:
-                height, width = img_array.shape
-                bytes_per_line = width
-                qimage = QImage(img_array.data, width, height, bytes_per_line, QImage.Format_Grayscale8)
-            pixmap = QPixmap.fromImage(qimage)
+            original_image = self.load_image(record)
+            width, height = original_image.size
+            pixmap = pil_to_qpixmap(original_image)
             
             # Add to scene
             pixmap_item = self.parent.scene.addPixmap(pixmap)
@@ -937,7 +1016,7 @@ class ImageHandler:
             self.parent.scene.setSceneRect(0, 0, width, height)
             
             # Update dimensions
-            self.current_dimensions[file_path] = (width, height)
+            record.size = (width, height)
             
             # Reset view and fit image
             self.parent.view.resetTransform()
@@ -952,17 +1031,14 @@ class ImageHandler:
 
     def redo(self):
         """Redo last undone action"""
-        # Get current file path
-        current_item = self.parent.image_list.currentItem()
-        if not current_item:
-            return
-            
-        current_file_path = self.get_file_path_from_item(current_item)
-        if not current_file_path:
+        # Get current image
+        record = self.current_record()
+        if not record:
             return
             
-        # Check if there's a redo stack for this image
-        if current_file_path not in self.image_redo_stacks or not self.image_redo_stacks[current_file_path]:
+        # Check if there's anything to redo for this image
+        history = record.history
+        if not history or not history.can_redo():
             return
             
         # Clear any active tool or selection before redoing
@@ -978,101 +1054,205 @@ class ImageHandler:
                     # Force an immediate update of the scene
                     QApplication.processEvents()
         
-        # Get the next state
-        next_state = self.image_redo_stacks[current_file_path].pop()
-        
-        # Initialize history if needed
-        if current_file_path not in self.image_histories:
-            self.image_histories[current_file_path] = []
-            
-        # Add state back to history
-        self.image_histories[current_file_path].append(next_state)
-        
-        # Apply the state
-        self._apply_state(next_state, current_file_path)
+        # Step forward and apply the rebuilt state
+        history.redo()
+        self._apply_state(history.current(), record)
         
         # Update button states based on current image's history
-        self.parent.toolbar.undo_btn.setEnabled(len(self.image_histories.get(current_file_path, [])) > 0)
-        self.parent.toolbar.redo_btn.setEnabled(len(self.image_redo_stacks.get(current_file_path, [])) > 0)
+        self._update_history_buttons(record)
 
-    def get_file_path_from_item(self, item):
-        """Get the full file path from a list item"""
-        if not item:
+    def load_image(self, record):
+        """Decode the original pixels for an image, or None if unavailable"""
+        if not record:
             return None
+        try:
+            return record.source.load()
+        except Exception as e:
+            print(f"Error decoding {record.path}: {str(e)}")
+            return None
+
+    def load_preview(self, record):
+        """Decode a reduced image that covers the view, returning (image, scale)"""
+        if not record:
+            return None, 1.0
+        
+        # Size the preview to the physical pixels of the viewport
+        viewport = self.parent.view.viewport()
+        ratio = viewport.devicePixelRatioF()
+        width, height = viewport.width(), viewport.height()
+        if width < 100 or height < 100:
+            # View not laid out yet, fall back to a typical preview size
+            width, height = 1024, 768
+        max_width, max_height = width * ratio, height * ratio
+        try:
+            return record.source.load_preview(max_width, max_height)
+        except Exception as e:
+            print(f"Error decoding preview for {record.path}: {str(e)}")
+            return self.load_image(record), 1.0
+
+    def ensure_full_resolution(self):
+        """Swap the preview in the scene for the full-resolution image before editing"""
+        record = self.preview_record
+        if not record:
+            return
+        self.preview_record = None
         
-        # Get the image name from the custom widget
-        widget = self.parent.image_list.itemWidget(item)
-        if widget:
-            image_name = widget.image_name
+        # Find the scaled preview item; the scene may have been rebuilt since
+        for item in self.parent.scene.items():
+            if isinstance(item, QGraphicsPixmapItem) and item.scale() != 1.0:
+                break
         else:
-            # Fallback to item text if no widget
-            image_name = item.text()
-        
-        # Find matching path
-        for path in self.images.keys():
-            if os.path.basename(path) == image_name:
-                return path
-        return None
+            return
+        
+        original_image = self.load_image(record)
+        if not original_image:
+            return
+        item.setPixmap(pil_to_qpixmap(original_image))
+        item.setScale(1.0)
 
-    def calculate_file_size(self, pixmap, quality=80):
-        """Calculate file size based on pixmap data using the same format that will be used for saving"""
-        byte_array = QByteArray()
-        buffer = QBuffer(byte_array)
-        buffer.open(QBuffer.WriteOnly)
-        
-        # Get current file path to determine format
-        current_item = self.parent.image_list.currentItem()
-        if current_item:
-            file_path = self.get_file_path_from_item(current_item)
-            if file_path:
-                # Get file extension
-                file_ext = os.path.splitext(file_path)[1].lower()
-                
-                # Check if this is a HEIC source file
-                is_heic_source = file_path.lower().endswith('.heic')
-                
-                # Use same quality setting for both .jpg and .jpeg
-                if file_ext in ['.jpg', '.jpeg'] or is_heic_source:
-                    # For HEIC source files that have been edited, use higher compression
-                    # to compensate for the loss of HEIC's efficient compression
-                    if is_heic_source and file_path in self.edited_images:
-                        # Get slider quality but apply additional compression
-                        base_quality = self.parent.toolbar.quality_slider.value()
-                        adjusted_quality = max(30, int(base_quality * 0.6))  # Scale down quality but keep minimum 30
-                        pixmap.save(buffer, "JPEG", adjusted_quality)
-                    else:
-                        quality = self.parent.toolbar.quality_slider.value()
-                        pixmap.save(buffer, "JPEG", quality)
-                else:
-                    # For other formats, use their native format
-                    format_map = {
-                        '.png': ('PNG', -1),
-                        '.gif': ('GIF', None),
-                        '.bmp': ('BMP', None),
-                        '.tiff': ('TIFF', None)
-                    }
-                    img_format, quality = format_map.get(file_ext, ('PNG', -1))
-                    if quality is not None:
-                        pixmap.save(buffer, img_format, quality)
-                    else:
-                        pixmap.save(buffer, img_format)
-                
-                size_in_mb = byte_array.size() / (1024 * 1024)
-                buffer.close()
-                return size_in_mb
-        
-        # Default to PNG with maximum compression if no file path available
-        pixmap.save(buffer, "PNG", -1)
-        size_in_mb = byte_array.size() / (1024 * 1024)
-        buffer.close()
-        return size_in_mb
+    def composite(self, record):
+        """Edited pixels of an image with its annotations drawn on top, as they are saved"""
+        if record is None:
+            return None
+        pixmap, layer = record.edited, record.annotations
+        if pixmap is None or ((layer is None or layer.is_empty()) and not pixmap.hasAlphaChannel()):
+            return pixmap
+        # Transparent areas are saved over white, as the scene shows them
+        if layer is None:
+            layer = record.annotations = AnnotationLayer()
+        return layer.render(pixmap)
+
+    def show_annotations(self, record):
+        """Add an image's annotation layer to the scene above its pixmap"""
+        layer = record.annotations if record else None
+        if layer is None:
+            return None
+        item = AnnotationItem(layer, self.parent.scene.sceneRect())
+        self.parent.scene.addItem(item)
+        return item
+
+    def annotation_item(self):
+        """Scene item drawing the current image's annotations, added on first use"""
+        for item in self.parent.scene.items():
+            if isinstance(item, AnnotationItem):
+                return item
+        record = self.current_record()
+        if not record:
+            return None
+        self.ensure_full_resolution()
+        if record.annotations is None:
+            record.annotations = AnnotationLayer()
+        return self.show_annotations(record)
+
+    def flatten_annotations(self):
+        """Draw the current annotations into the image's pixels, for tools that edit pixels"""
+        item = None
+        pixmap_item = None
+        for scene_item in self.parent.scene.items():
+            if isinstance(scene_item, AnnotationItem):
+                item = scene_item
+            elif isinstance(scene_item, QGraphicsPixmapItem):
+                pixmap_item = scene_item
+        if item is None or pixmap_item is None or item.layer.is_empty():
+            return
+        self.ensure_full_resolution()
+        pixmap_item.setPixmap(item.layer.apply(pixmap_item.pixmap().copy()))
+        item.layer.clear()
+        item.update()
+
+    def preview_magnified(self):
+        """Check whether the preview is being drawn larger than its own pixels"""
+        if not self.preview_record:
+            return False
+        for item in self.parent.scene.items():
+            if isinstance(item, QGraphicsPixmapItem):
+                ratio = self.parent.view.viewport().devicePixelRatioF()
+                return self.parent.view.transform().m11() * item.scale() * ratio > 1.0
+        return False
+
+    def record(self, file_path):
+        """Record of the open image at a path, or None"""
+        # Rebuilt from the records after a rename or delete, so it never disagrees with them
+        if self.path_index is None:
+            self.path_index = {record.path: record for record in self.records.values()}
+        return self.path_index.get(file_path)
+
+    def index_record(self, index):
+        """Record of the image a list row shows, or None"""
+        if index is None or not index.isValid():
+            return None
+        # Rows carry an ID rather than a name, so files with the same name in
+        # different folders stay apart
+        return self.records.get(index.data(Qt.UserRole))
+
+    def current_record(self):
+        """Record of the selected image, or None"""
+        return self.index_record(self.parent.image_list.currentIndex())
+
+    def get_save_format(self, record):
+        """Format and quality an edited image is encoded with when it is saved"""
+        # Get file extension
+        file_ext = os.path.splitext(record.path)[1].lower() if record else ''
+        
+        # Check if this is a HEIC source file
+        is_heic_source = file_ext == '.heic'
+        
+        # Use same quality setting for both .jpg and .jpeg
+        if file_ext in ['.jpg', '.jpeg'] or is_heic_source:
+            quality = self.parent.toolbar.quality_slider.value()
+            # For HEIC source files that have been edited, use higher compression
+            # to compensate for the loss of HEIC's efficient compression
+            if is_heic_source and record and record.edited is not None:
+                quality = max(30, int(quality * 0.6))  # Scale down quality but keep minimum 30
+            return 'JPEG', quality
+        
+        # For other formats, use their native format
+        format_map = {
+            '.png': ('PNG', -1),
+            '.gif': ('GIF', -1),
+            '.bmp': ('BMP', -1),
+            '.tiff': ('TIFF', -1)
+        }
+        return format_map.get(file_ext, ('PNG', -1))
+
+    def request_file_size(self, record, pixmap):
+        """Return the cached encoded size of a pixmap, measuring it in the background if needed"""
+        img_format, quality = self.get_save_format(record)
+        size = self.size_estimator.estimate(record.image_id, pixmap, img_format, quality)
+        if size is None:
+            # Extrapolate from a sample until the worker reports the exact size
+            size = self.size_estimator.quick_estimate(pixmap, img_format, quality)
+        if size is None:
+            # Keep the last known size until the worker reports back
+            size = record.shown_file_size()
+        record.edited_file_size = size
+        return size
+
+    def quality_changed(self, value):
+        """Show the output size for the new quality while the slider moves"""
+        record = self.current_record()
+        if record and record.edited is not None:
+            size = self.request_file_size(record, self.composite(record))
+            self.parent.file_size_label.setText(f"File size: {size:.2f}MB")
+
+    def _on_file_size_ready(self, image_id, size):
+        """Show a background size measurement once it is ready"""
+        record = self.records.get(image_id)
+        if record is None:
+            return
+        record.edited_file_size = size
+        if record is self.current_record():
+            self.parent.file_size_label.setText(f"File size: {size:.2f}MB")
 
     def save_all(self):
-        """Save all modified images"""
-        if not self.images:
+        """Save all images; untouched ones are copied as they are"""
+        if not self.records:
             QMessageBox.warning(self.parent, "Warning", "No images loaded!")
             return
         
+        if self.batch_saver.is_running():
+            return
+        
         # Get output directory
         output_dir = self.resizer.get_output_directory(self.parent)
         if not output_dir:
@@ -1089,157 +1269,104 @@ class ImageHandler:
         QTimer.singleShot(100, lambda: self._perform_save_all(output_dir))
         
     def _perform_save_all(self, output_dir):
-        """Perform the actual save all operation"""
-        success_count = 0
-        failed_count = 0
-        
-        # Store current selection to restore later
-        current_item = self.parent.image_list.currentItem()
+        """Queue every image for encoding, or copying if untouched, on the save thread pool"""
+        self.save_output_dir = output_dir
+        self.save_success_count = 0
+        self.save_failed_count = 0
         
-        try:
-            # First, collect all items to process to avoid issues with renamed images
-            items_to_process = []
-            for i in range(self.parent.image_list.count()):
-                item = self.parent.image_list.item(i)
-                file_path = self.get_file_path_from_item(item)
-                if file_path:
-                    items_to_process.append((item, file_path))
-            
-            # Update UI before processing starts
-            QApplication.processEvents()
+        # Collect all images to process, in list order
+        jobs = []
+        used_paths = set()
+        for record in self.records.values():
+            file_path = record.path
             
-            # Process each item
-            for idx, (item, file_path) in enumerate(items_to_process):
-                # Check if the image has been modified
-                has_shapes = file_path in self.edited_images  # Has shapes or other edits
-                is_resized = file_path in self.resized_images  # Has been explicitly resized
-                is_heic = file_path.lower().endswith('.heic')  # Is HEIC format
-                is_modified = has_shapes or is_resized or is_heic  # Consider HEIC as modified
-                
-                # Skip unmodified images
-                if not is_modified:
+            # Check if the image has been modified
+            has_shapes = record.edited is not None  # Has shapes or other edits
+            is_resized = record.resized  # Has been explicitly resized
+            is_heic = file_path.lower().endswith('.heic')  # Is HEIC format
+            is_modified = has_shapes or is_resized or is_heic  # Consider HEIC as modified
+            
+            # Create save path with proper extension
+            base_name = os.path.basename(file_path)
+            original_ext = os.path.splitext(file_path)[1].lower()
+            
+            # Ensure we have a valid extension, convert HEIC to JPG
+            if not original_ext or original_ext not in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff'] or original_ext == '.heic':
+                original_ext = '.jpg'
+            
+            # Untouched images are copied byte for byte; skip those stored in another format,
+            # unless a rename gave them a new one
+            stem = os.path.splitext(base_name)[0]
+            copy_original = not is_modified and self.can_copy_original(record, stem + original_ext)
+            if not is_modified and not copy_original and file_path == record.source.path:
+                continue
+            
+            # Names are fixed here in list order, so parallel writes never race for a path
+            save_path = os.path.join(output_dir, f"{stem}{original_ext}")
+            suffix = 2
+            while save_path in used_paths:
+                save_path = os.path.join(output_dir, f"{stem}_{suffix}{original_ext}")
+                suffix += 1
+            used_paths.add(save_path)
+            
+            # Get the pixmap to save; unmodified originals are decoded by the worker
+            if copy_original:
+                source = record.source.path
+                if os.path.exists(save_path) and os.path.samefile(source, save_path):
+                    # Saving into the folder it came from: the file is already there as is
+                    self.save_success_count += 1
                     continue
+            elif record.edited is not None:
+                source = self.composite(record)
+            elif os.path.exists(record.source.path):
+                source = record.source
+            else:
+                self.save_failed_count += 1
+                continue
+            
+            if original_ext in ['.jpg', '.jpeg']:
+                # Save with quality setting
+                img_format = 'JPEG'
+                quality = self.parent.toolbar.quality_slider.value()
                 
-                # Update overlay text with progress
-                self.parent.overlay.label.setText(f"Saving images... ({idx + 1}/{len(items_to_process)})")
-                QApplication.processEvents()
-                
-                # Check if the original file exists
-                original_file_exists = os.path.exists(file_path)
-                
-                # Create save path with proper extension
-                base_name = os.path.basename(file_path)
-                original_ext = os.path.splitext(file_path)[1].lower()
-                
-                # Ensure we have a valid extension, convert HEIC to JPG
-                if not original_ext or original_ext not in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff'] or original_ext == '.heic':
-                    original_ext = '.jpg'
-                
-                save_path = os.path.join(output_dir, f"{os.path.splitext(base_name)[0]}{original_ext}")
-                
-                try:
-                    # Get the pixmap to save
-                    pixmap = None
-                    if file_path in self.edited_images:
-                        # For images with shapes, use the edited image directly
-                        pixmap = self.edited_images[file_path]
-                    elif original_file_exists:
-                        # For unmodified images, use the original
-                        original_image = self.images.get(file_path)
-                        if original_image:
-                            # Convert PIL image to RGB if it's RGBA
-                            if original_image.mode == 'RGBA':
-                                original_image = original_image.convert('RGB')
-                            img_array = np.array(original_image)
-                            if len(img_array.shape) == 3:  # Color image
-                                array_height, array_width, channels = img_array.shape
-                                bytes_per_line = channels * array_width
-                                qimage = QImage(img_array.data, array_width, array_height, bytes_per_line, QImage.Format_RGB888)
-                            else:  # Grayscale image
-                                array_height, array_width = img_array.shape
-                                bytes_per_line = array_width
-                                qimage = QImage(img_array.data, array_width, array_height, bytes_per_line, QImage.Format_Grayscale8)
-                            pixmap = QPixmap.fromImage(qimage)
-                    
-                    if not pixmap:
-                        failed_count += 1
-                        continue
-                    
-                    # Convert pixmap to RGB if saving as JPEG
-                    save_ext = os.path.splitext(save_path)[1].lower()
-                    if save_ext in ['.jpg', '.jpeg']:
-                        # Convert to RGB by saving to a temporary buffer and reloading
-                        temp_buffer = QByteArray()
-                        buffer = QBuffer(temp_buffer)
-                        buffer.open(QBuffer.WriteOnly)
-                        pixmap.save(buffer, 'PNG')  # Save as PNG to preserve quality
-                        buffer.close()
-                        
-                        # Load as PIL image, convert to RGB, and back to QPixmap
-                        pil_image = Image.open(BytesIO(temp_buffer.data()))
-                        if pil_image.mode == 'RGBA':
-                            pil_image = pil_image.convert('RGB')
-                        
-                        # Convert back to QPixmap
-                        img_byte_arr = BytesIO()
-                        pil_image.save(img_byte_arr, format='PNG')
-                        img_byte_arr.seek(0)
-                        qimage = QImage.fromData(img_byte_arr.getvalue())
-                        pixmap = QPixmap.fromImage(qimage)
-                        
-                        # Save with quality setting
-                        quality = self.parent.toolbar.quality_slider.value()
-                        
-                        # For HEIC sources, apply higher compression to better match original file size
-                        if is_heic and file_path in self.edited_images:
-                            # Apply additional compression for HEIC sources
-                            adjusted_quality = max(30, int(quality * 0.6))  # Scale down quality but keep minimum 30
-                            pixmap.save(save_path, 'JPEG', adjusted_quality)
-                        else:
-                            pixmap.save(save_path, 'JPEG', quality)
-                    else:
-                        # For other formats, use their native format
-                        format_map = {
-                            '.png': ('PNG', -1),  # -1 means maximum compression for PNG
-                            '.gif': ('GIF', None),
-                            '.bmp': ('BMP', None),
-                            '.tiff': ('TIFF', None)
-                        }
-                        img_format, quality = format_map.get(save_ext, ('PNG', -1))
-                        if quality is not None:
-                            pixmap.save(save_path, img_format, quality)
-                        else:
-                            pixmap.save(save_path, img_format)
-                    
-                    success_count += 1
-                    
-                    # Force UI update every few saved files
-                    if idx % 3 == 0:
-                        QApplication.processEvents()
-                    
-                except Exception as e:
-                    failed_count += 1
-                    print(f"Error saving {save_path}: {str(e)}")
-                    
-            # Final UI update before hiding overlay
-            QApplication.processEvents()
-                    
-        except Exception as e:
-            QMessageBox.warning(
-                self.parent,
-                "Warning",
-                f"Failed to save images: {str(e)}"
-            )
-        finally:
-            # Hide overlay
-            self.parent.overlay.hide()
-            # Reset the overlay label text
-            self.parent.overlay.label.setText("Resizing images...")
-            QApplication.processEvents()
+                # For HEIC sources, apply higher compression to better match original file size
+                if is_heic and record.edited is not None:
+                    quality = max(30, int(quality * 0.6))  # Scale down quality but keep minimum 30
+            else:
+                # For other formats, use their native format
+                format_map = {
+                    '.png': ('PNG', -1),  # -1 means maximum compression for PNG
+                    '.gif': ('GIF', -1),
+                    '.bmp': ('BMP', -1),
+                    '.tiff': ('TIFF', -1)
+                }
+                img_format, quality = format_map.get(original_ext, ('PNG', -1))
             
-            # Restore original selection
-            if current_item:
-                self.parent.image_list.setCurrentItem(current_item)
+            jobs.append((file_path, save_path, source, img_format, quality))
+        
+        self.batch_saver.save(jobs)
+
+    def _on_batch_saved(self, file_path, save_path):
+        self.save_success_count += 1
+
+    def _on_batch_save_failed(self, file_path, error):
+        self.save_failed_count += 1
+        print(f"Error saving {os.path.basename(file_path)}: {error}")
+
+    def _on_batch_save_progress(self, done, total):
+        self.parent.overlay.label.setText(f"Saving images... ({done}/{total})")
+
+    def _on_batch_save_finished(self, cancelled):
+        # Hide overlay
+        self.parent.overlay.hide()
+        # Reset the overlay label text
+        self.parent.overlay.label.setText("Resizing images...")
+        if cancelled:
+            return
+        
+        success_count = self.save_success_count
+        failed_count = self.save_failed_count
+        output_dir = self.save_output_dir
         
         # Show final results with styled dialog
         if success_count > 0:
@@ -1269,191 +1396,71 @@ class ImageHandler:
             
             error_dialog.exec_()
 
-    def rename_image(self, item, new_name):
+    def rename_image(self, image_id, new_name):
         """Rename image file in the list"""
-        # Get the old name from the item's widget
-        widget = self.parent.image_list.itemWidget(item)
-        if not widget:
+        record = self.records.get(image_id)
+        if record is None:
             return
-            
-        old_name = widget.image_name
-        
-        # Ensure the new name has a valid image extension
-        old_ext = os.path.splitext(old_name)[1].lower()
-        new_ext = os.path.splitext(new_name)[1].lower()
-        
-        # If new name doesn't have an extension or has a different extension, add the original extension
-        if not new_ext or new_ext not in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff']:
-            new_name = os.path.splitext(new_name)[0] + old_ext
-        
-        # Store current states
-        temp_images = self.images.copy()
-        temp_edited_images = self.edited_images.copy()
-        temp_current_dimensions = self.current_dimensions.copy()
-        temp_file_sizes = self.file_sizes.copy()
-        temp_edited_file_sizes = self.edited_file_sizes.copy()
-        temp_image_histories = self.image_histories.copy()
-        temp_redo_stack = self.redo_stack.copy() if hasattr(self, 'redo_stack') else {}
-        temp_image_redo_stacks = self.image_redo_stacks.copy() if hasattr(self, 'image_redo_stacks') else {}
-        
-        # Find the file path
-        old_path = None
-        for path in temp_images.keys():
-            if os.path.basename(path) == old_name:
-                old_path = path
-                break
         
-        if old_path:
-            # Create new path
-            new_path = os.path.join(os.path.dirname(old_path), new_name)
-            
-            # Clear all dictionaries
-            self.images.clear()
-            self.edited_images.clear()
-            self.current_dimensions.clear()
-            self.file_sizes.clear()
-            self.edited_file_sizes.clear()
-            self.image_histories.clear()
-            if hasattr(self, 'redo_stack'):
-                self.redo_stack.clear()
-            if hasattr(self, 'image_redo_stacks'):
-                self.image_redo_stacks.clear()
-            
-            # Clear the list widget
-            self.parent.image_list.clear()
-            
-            # Rebuild dictionaries with updated paths
-            for path, image in temp_images.items():
-                if path == old_path:
-                    self.images[new_path] = image
-                    
-                    # For renamed files, we need to ensure we have a valid pixmap
-                    if old_path in temp_edited_images:
-                        # If we have an edited version, use it
-                        self.edited_images[new_path] = temp_edited_images[old_path]
-                    else:
-                        # If no edited version exists, create a pixmap from the original image
-                        # without any quality changes or resizing
-                        img_array = np.array(image)
-                        if len(img_array.shape) == 3:  # Color image
-                            array_height, array_width, channels = img_array.shape
-                            bytes_per_line = channels * array_width
-                            qimage = QImage(img_array.data, array_width, array_height, bytes_per_line, QImage.Format_RGB888)
-                        else:  # Grayscale image
-                            array_height, array_width = img_array.shape
-                            bytes_per_line = array_width
-                            qimage = QImage(img_array.data, array_width, array_height, bytes_per_line, QImage.Format_Grayscale8)
-                        pixmap = QPixmap.fromImage(qimage)
-                        self.edited_images[new_path] = pixmap
-                    
-                    # Copy all other properties
-                    if old_path in temp_current_dimensions:
-                        self.current_dimensions[new_path] = temp_current_dimensions[old_path]
-                    if old_path in temp_file_sizes:
-                        self.file_sizes[new_path] = temp_file_sizes[old_path]
-                    if old_path in temp_edited_file_sizes:
-                        self.edited_file_sizes[new_path] = temp_edited_file_sizes[old_path]
-                    if old_path in temp_image_histories:
-                        self.image_histories[new_path] = temp_image_histories[old_path]
-                    if hasattr(self, 'redo_stack') and old_path in temp_redo_stack:
-                        self.redo_stack[new_path] = temp_redo_stack[old_path]
-                    if hasattr(self, 'image_redo_stacks') and old_path in temp_image_redo_stacks:
-                        self.image_redo_stacks[new_path] = temp_image_redo_stacks[old_path]
-                    
-                    # Add to list with new name
-                    self.parent.add_image_to_list(new_name)
-                else:
-                    self.images[path] = image
-                    if path in temp_edited_images:
-                        self.edited_images[path] = temp_edited_images[path]
-                    if path in temp_current_dimensions:
-                        self.current_dimensions[path] = temp_current_dimensions[path]
-                    if path in temp_file_sizes:
-                        self.file_sizes[path] = temp_file_sizes[path]
-                    if path in temp_edited_file_sizes:
-                        self.edited_file_sizes[path] = temp_edited_file_sizes[path]
-                    if path in temp_image_histories:
-                        self.image_histories[path] = temp_image_histories[path]
-                    if hasattr(self, 'redo_stack') and path in temp_redo_stack:
-                        self.redo_stack[path] = temp_redo_stack[path]
-                    if hasattr(self, 'image_redo_stacks') and path in temp_image_redo_stacks:
-                        self.image_redo_stacks[path] = temp_image_redo_stacks[path]
-                    
-                    # Add to list with original name
-                    self.parent.add_image_to_list(os.path.basename(path))
-            
-            # Find and select the renamed item
-            for i in range(self.parent.image_list.count()):
-                item = self.parent.image_list.item(i)
-                if self.parent.image_list.itemWidget(item).image_name == new_name:
-                    self.parent.image_list.setCurrentRow(i)
-                    break
+        # Two open images with one path would overwrite each other when saved
+        new_path = os.path.join(os.path.dirname(record.path), new_name)
+        if new_path == record.path:
+            return
+        if self.record(new_path) is not None:
+            QMessageBox.warning(self.parent, "Warning", f"Another open image is already named {new_name}.")
+            return
+        
+        # Only the record's path changes; its pixels are still read from the original file
+        record.path = new_path
+        self.path_index = None
+        self.parent.image_list.set_name(image_id, new_name)
 
-    def delete_image(self, image_name):
+    def delete_image(self, image_id):
         """Delete image from the list"""
-        # Find the file path
-        for path in list(self.images.keys()):
-            if os.path.basename(path) == image_name:
-                # Remove from all dictionaries
-                self.images.pop(path)
-                self.edited_images.pop(path, None)
-                self.current_dimensions.pop(path, None)
-                self.file_sizes.pop(path, None)
-                self.edited_file_sizes.pop(path, None)  # Clear edited file sizes
-                if path in self.resized_images:
-                    self.resized_images.remove(path)  # Remove from resized images set
-                self.view_scale.pop(path, None)  # Clear view scale
-                
-                # Clear history and redo stacks for this image
-                self.image_histories.pop(path, None)
-                self.image_redo_stacks.pop(path, None)
-                
-                # Remove from list widget
-                for i in range(self.parent.image_list.count()):
-                    item = self.parent.image_list.item(i)
-                    if self.parent.image_list.itemWidget(item).image_name == image_name:
-                        self.parent.image_list.takeItem(i)
-                        break
-                
-                # Clear view if this was the current image
-                if not self.images:
-                    # Reset everything when all images are gone
-                    self.parent.scene.clear()
-                    self.parent.size_label.setText("Size: --")
-                    self.parent.file_size_label.setText("File size: --")
-                    
-                    # Clear all remaining state
-                    self.current_image = None
-                    self.edited_file_sizes.clear()
-                    self.resized_images.clear()
-                    self.view_scale.clear()
-                    self.image_histories.clear()
-                    self.image_redo_stacks.clear()
-                    self.modified = False
-                    
-                    # Disable resize and save buttons when no images are left
-                    self.parent.toolbar.resize_btn.setEnabled(False)
-                    self.parent.toolbar.resize_all_btn.setEnabled(False)
-                    self.parent.toolbar.save_btn.setEnabled(False)
-                    self.parent.toolbar.save_all_btn.setEnabled(False)
-                break
+        # Drop the image's record; everything kept about it goes with it
+        record = self.records.pop(image_id, None)
+        if record is None:
+            return
+        self.path_index = None
+        self.size_estimator.forget(image_id)
+        self.thumbnail_cache.forget(image_id)
+        
+        # Clear history and redo steps for this image
+        if record.history:
+            record.history.clear()
+        
+        # Remove its row from the list
+        self.parent.image_list.remove_image(image_id)
+        
+        # Clear view if this was the current image
+        if not self.records:
+            # Reset everything when all images are gone
+            self.parent.scene.clear()
+            self.parent.size_label.setText("Size: --")
+            self.parent.file_size_label.setText("File size: --")
+            
+            # Clear all remaining state
+            self.current_image = None
+            self.modified = False
+            
+            # Disable resize and save buttons when no images are left
+            self.parent.toolbar.resize_btn.setEnabled(False)
+            self.parent.toolbar.resize_all_btn.setEnabled(False)
+            self.parent.toolbar.save_btn.setEnabled(False)
+            self.parent.toolbar.save_all_btn.setEnabled(False)
 
     def _update_tool_sizes(self, diagonal, base_diagonal=1500.0):
         """Update line widths, handle sizes, and text sizes for all tools"""
         if not hasattr(self.parent, 'tool_manager'):
             return
 
-        # Get current item and file path
-        current_item = self.parent.image_list.currentItem()
-        if not current_item:
-            return
-        
-        file_path = self.get_file_path_from_item(current_item)
-        if not file_path:
+        # Get the current image
+        record = self.current_record()
+        if not record:
             return
         
         # Get actual image dimensions
-        actual_width, actual_height = self.current_dimensions.get(file_path, (0, 0))
+        actual_width, actual_height = record.size
         if actual_width == 0 or actual_height == 0:
             return
         
@@ -1464,7 +1471,7 @@ class ImageHandler:
         handle_scale_factor = 1.0
         
         # For lines, use a scale factor based on whether the image is resized
-        if file_path in self.resized_images:
+        if record.resized:
             line_scale_factor = 1.0
         else:
             # Calculate scale factors based on image dimensions
@@ -1494,7 +1501,7 @@ class ImageHandler:
         base_font_size = 24  # Base font size for text tool
         
         # Get view scale for this image
-        view_scale = self.view_scale.get(file_path, 1.0)
+        view_scale = record.view_scale
         
         # Calculate final sizes with different scale factors
         line_width = max(1, base_line_width * line_scale_factor)
@@ -1507,8 +1514,8 @@ class ImageHandler:
         print(f"Text scale factor: {text_scale_factor:.2f}")
         print(f"Handle scale factor: {handle_scale_factor:.2f}")
         print(f"View scale: {view_scale:.2f}")
-        print(f"Is resized: {file_path in self.resized_images}")
-        print(f"Has shapes: {file_path in self.edited_images}")
+        print(f"Is resized: {record.resized}")
+        print(f"Has shapes: {record.edited is not None}")
         print(f"Calculated sizes - Line: {line_width:.2f}, Handle: {handle_size:.2f}, Arrow: {arrow_size:.2f}, Font: {font_size}")
         
         # Update sizes for all tools
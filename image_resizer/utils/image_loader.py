@@ -0,0 +1,89 @@
+import os
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from image_resizer.utils.lazy_image import LazyImage
+
+
+class _LoadSignals(QObject):
+    """Signals emitted from worker threads, delivered on the GUI thread"""
+    loaded = pyqtSignal(int, str, object)  # generation, file_path, LazyImage
+    failed = pyqtSignal(int, str, str)  # generation, file_path, error
+
+
+class _LoadTask(QRunnable):
+    def __init__(self, loader, generation, file_path):
+        super().__init__()
+        self.loader = loader
+        self.generation = generation
+        self.file_path = file_path
+
+    def run(self):
+        # Skip work for batches that were cancelled while this task was queued
+        if self.generation != self.loader.generation:
+            return
+        try:
+            image = LazyImage(self.file_path)
+        except Exception as e:
+            self.loader.signals.failed.emit(self.generation, self.file_path, str(e))
+        else:
+            self.loader.signals.loaded.emit(self.generation, self.file_path, image)
+
+
+class ImageLoader(QObject):
+    """Open image files on a thread pool and stream the results back"""
+    image_loaded = pyqtSignal(str, object)  # file_path, LazyImage
+    image_failed = pyqtSignal(str, str)  # file_path, error
+    progress = pyqtSignal(int, int)  # done, total
+    finished = pyqtSignal(bool)  # cancelled
+
+    def __init__(self, parent=None, max_workers=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        # Header reads are mostly I/O, so allow more threads than cores
+        self.pool.setMaxThreadCount(max_workers or min(16, (os.cpu_count() or 1) * 2))
+        self.generation = 0
+        self.total = 0
+        self.done = 0
+
+        self.signals = _LoadSignals()
+        self.signals.loaded.connect(self._on_loaded)
+        self.signals.failed.connect(self._on_failed)
+
+    def is_running(self):
+        return self.done < self.total
+
+    def load(self, file_paths):
+        """Queue files for loading; results arrive in completion order"""
+        if not self.is_running():
+            self.total = 0
+            self.done = 0
+        self.total += len(file_paths)
+        self.progress.emit(self.done, self.total)
+        for file_path in file_paths:
+            self.pool.start(_LoadTask(self, self.generation, file_path))
+
+    def cancel(self):
+        """Drop queued files and ignore results still in flight"""
+        if not self.is_running():
+            return
+        self.generation += 1
+        self.pool.clear()
+        self.total = self.done
+        self.finished.emit(True)
+
+    def _on_loaded(self, generation, file_path, image):
+        if generation != self.generation:
+            return
+        self.image_loaded.emit(file_path, image)
+        self._task_done()
+
+    def _on_failed(self, generation, file_path, error):
+        if generation != self.generation:
+            return
+        self.image_failed.emit(file_path, error)
+        self._task_done()
+
+    def _task_done(self):
+        self.done += 1
+        self.progress.emit(self.done, self.total)
+        if self.done >= self.total:
+            self.finished.emit(False)
@@ -0,0 +1,23 @@
+class ImageRecord:
+    """Everything the editor keeps about one image in the list"""
+
+    __slots__ = ('image_id', 'path', 'source', 'edited', 'annotations', 'original_size',
+                 'size', 'file_size', 'edited_file_size', 'history', 'resized', 'view_scale')
+
+    def __init__(self, image_id, path, source):
+        self.image_id = image_id  # Stored on the list item
+        self.path = path
+        self.source = source  # Header-only LazyImage handle on the original file
+        self.edited = None  # Edited pixels (crops, erasing, resizing), once there are any
+        self.annotations = None  # AnnotationLayer of strokes, shapes and text over the pixels
+        self.original_size = source.size
+        self.size = source.size  # Current dimensions
+        self.file_size = source.file_size / (1024 * 1024)  # Size of the original file in MB
+        self.edited_file_size = None  # Size in MB when saved with the current edits and quality
+        self.history = None  # ImageHistory holding its undo and redo steps
+        self.resized = False  # Whether it has been explicitly resized
+        self.view_scale = 1.0  # Zoom the image was last fitted at
+
+    def shown_file_size(self):
+        """File size in MB to show for the image"""
+        return self.file_size if self.edited_file_size is None else self.edited_file_size
@@ -0,0 +1,103 @@
+import os
+from PIL import Image, ImageOps
+import pillow_heif
+
+# Register HEIF opener with Pillow
+pillow_heif.register_heif_opener()
+
+# EXIF orientation tag and the orientations that swap width and height
+ORIENTATION_TAG = 0x0112
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+class LazyImage:
+    """Header-only handle to an image file; pixels are decoded on demand"""
+    __slots__ = ('path', 'size', 'mode', 'format', 'orientation', 'file_size')
+
+    def __init__(self, path):
+        self.path = path
+
+        # Image.open only parses the header, the pixel data is left on disk
+        image = Image.open(path)
+        try:
+            width, height = image.size
+            self.mode = image.mode
+            self.format = image.format
+            self.orientation = self._read_orientation(image)
+        finally:
+            image.close()
+
+        # Report the size the image will have once EXIF orientation is applied
+        if self.orientation in TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+        self.size = (width, height)
+        self.file_size = os.path.getsize(path)
+
+    @staticmethod
+    def _read_orientation(image):
+        """Read the EXIF orientation without touching the pixel data"""
+        try:
+            if image.format == 'PNG':
+                # PNG getexif() may decode the image to reach a trailing eXIf chunk
+                exif_data = image.info.get('exif')
+                if not exif_data:
+                    return 1
+                exif = Image.Exif()
+                exif.load(exif_data)
+            else:
+                exif = image.getexif()
+            return exif.get(ORIENTATION_TAG, 1) or 1
+        except Exception:
+            return 1
+
+    @property
+    def is_heic(self):
+        return self.path.lower().endswith('.heic')
+
+    def load(self):
+        """Decode the full-resolution image"""
+        image = Image.open(self.path)
+        image.load()
+        return self._finish(image)
+
+    def load_preview(self, max_width, max_height):
+        """Decode the smallest reduced image that still covers max_width x max_height.
+
+        Returns the image and the factor from preview pixels to full-resolution pixels.
+        """
+        # Target size in stored (pre-orientation) pixels
+        if self.orientation in TRANSPOSED_ORIENTATIONS:
+            max_width, max_height = max_height, max_width
+        max_width = max(1, int(max_width))
+        max_height = max(1, int(max_height))
+
+        image = Image.open(self.path)
+        stored_width = image.size[0]
+
+        if image.format == 'JPEG':
+            # Let libjpeg decode at 1/2, 1/4 or 1/8 scale directly
+            image.draft(image.mode, (max_width, max_height))
+            image.load()
+        else:
+            image.load()
+            factor = min(image.size[0] // max_width, image.size[1] // max_height)
+            if factor >= 2:
+                # reduce() averages pixels, which palette and bilevel images can't hold
+                if image.mode in ('P', '1'):
+                    image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+                image = image.reduce(factor)
+
+        scale = stored_width / image.size[0]
+        return self._finish(image), scale
+
+    def _finish(self, image):
+        """Apply orientation and mode fixes shared by full and preview decodes"""
+        # Apply EXIF orientation so pixels match the reported size
+        if self.orientation != 1:
+            image = ImageOps.exif_transpose(image)
+
+        # Convert HEIC to RGB if needed
+        if self.is_heic and image.mode == 'RGBA':
+            image = image.convert('RGB')
+
+        return image
@@ -0,0 +1,189 @@
+import math
+from abc import ABC, abstractmethod
+from PyQt5.QtCore import Qt, QRectF, QPointF, QLineF, QSizeF
+from PyQt5.QtGui import QPainter, QPen, QColor, QPainterPath, QPolygonF
+from image_resizer.utils.strokes import simplify_points
+
+
+class _Operation(ABC):
+    """Vector edit that can be drawn onto any paint device at any scale"""
+
+    version = 0  # bumped whenever the operation changes in place
+
+    @abstractmethod
+    def paint(self, painter):
+        """Draw the operation in the coordinates it was recorded in"""
+
+    @abstractmethod
+    def bounding_rect(self):
+        """Area the operation paints, in the coordinates it was recorded in"""
+
+
+class StrokeOperation(_Operation):
+    """Freehand stroke drawn as one polyline through its points"""
+
+    def __init__(self, color, width, points=None):
+        self.color = QColor(color)
+        self.width = width
+        self._set_points(points or [])
+
+    def _set_points(self, points):
+        self.version += 1
+        self.points = []
+        self.polygon = QPolygonF()  # the points, kept for drawing in a single call
+        self.bounds = QRectF()
+        for point in points:
+            self.add_point(point)
+
+    def simplify(self, tolerance):
+        """Drop points the stroke passes within tolerance of anyway"""
+        self._set_points(simplify_points(self.points, tolerance))
+
+    def pen(self):
+        pen = QPen(self.color, self.width)
+        pen.setJoinStyle(Qt.RoundJoin)
+        return pen
+
+    def add_point(self, point):
+        self.version += 1
+        point = QPointF(point)
+        self.points.append(point)
+        self.polygon.append(point)
+        # Grow the bounds as the stroke is drawn instead of rescanning every point
+        point_rect = QRectF(point, QSizeF(0, 0))
+        self.bounds = self.bounds.united(point_rect) if len(self.points) > 1 else point_rect
+
+    def _pad(self, rect):
+        # Half the pen on each side, plus a pixel for antialiasing
+        pad = self.width / 2 + 1
+        return rect.adjusted(-pad, -pad, pad, pad)
+
+    def segment_rect(self, index):
+        """Area painted by the segment ending at points[index]"""
+        return self._pad(QRectF(self.points[index - 1], self.points[index]).normalized())
+
+    def bounding_rect(self):
+        return self._pad(self.bounds)
+
+    def paint(self, painter):
+        painter.setPen(self.pen())
+        painter.drawPolyline(self.polygon)
+
+
+class HighlightOperation(_Operation):
+    """Translucent marker stroke, drawn as one path so overlaps don't darken"""
+
+    def __init__(self, color, width, points=None):
+        self.color = QColor(color)  # includes the highlight opacity
+        self.width = width
+        self._set_points(points or [])
+
+    def _set_points(self, points):
+        self.version += 1
+        self.points = []
+        self.path = QPainterPath()  # extended point by point as the stroke is drawn
+        for point in points:
+            self.add_point(point)
+
+    def simplify(self, tolerance):
+        """Drop points the stroke passes within tolerance of anyway"""
+        self._set_points(simplify_points(self.points, tolerance))
+
+    def add_point(self, point):
+        self.version += 1
+        point = QPointF(point)
+        if self.points:
+            self.path.lineTo(point)
+        else:
+            self.path.moveTo(point)
+        self.points.append(point)
+
+    def pen(self):
+        # Square caps cover the ends fully, round joins keep corners smooth
+        pen = QPen(self.color, self.width)
+        pen.setCapStyle(Qt.SquareCap)
+        pen.setJoinStyle(Qt.RoundJoin)
+        return pen
+
+    def _pad(self, rect):
+        # Square caps reach past the end points by up to half a diagonal
+        pad = self.width * 0.75 + 1
+        return rect.adjusted(-pad, -pad, pad, pad)
+
+    def segment_rect(self, index):
+        """Area painted by the segment ending at points[index]"""
+        return self._pad(QRectF(self.points[index - 1], self.points[index]).normalized())
+
+    def bounding_rect(self):
+        return self._pad(self.path.controlPointRect())
+
+    def paint(self, painter):
+        if len(self.points) < 2:
+            return
+        painter.setPen(self.pen())
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPath(self.path)
+
+
+class ShapeOperation(_Operation):
+    """Line, arrow, ellipse or rectangle outline in image coordinates"""
+
+    def __init__(self, kind, geometry, pen, arrow_size=None):
+        self.kind = kind  # 'line', 'arrow', 'ellipse' or 'rect'
+        self.geometry = QLineF(geometry) if isinstance(geometry, QLineF) else QRectF(geometry)
+        self.pen = QPen(pen)
+        self.arrow_size = arrow_size
+
+    def paint(self, painter):
+        painter.setPen(self.pen)
+        painter.setBrush(Qt.NoBrush)
+        if self.kind in ('line', 'arrow'):
+            line = self.geometry
+            painter.drawLine(line)
+            if self.kind == 'arrow':
+                # Two strokes at 30 degrees either side of the line, back from the tip
+                p2 = line.p2()
+                angle = math.atan2(line.dy(), line.dx())
+                arrow_p1 = QPointF(
+                    p2.x() - self.arrow_size * math.cos(angle + math.pi/6),
+                    p2.y() - self.arrow_size * math.sin(angle + math.pi/6)
+                )
+                arrow_p2 = QPointF(
+                    p2.x() - self.arrow_size * math.cos(angle - math.pi/6),
+                    p2.y() - self.arrow_size * math.sin(angle - math.pi/6)
+                )
+                painter.drawLine(p2, arrow_p1)
+                painter.drawLine(p2, arrow_p2)
+        elif self.kind == 'ellipse':
+            painter.drawEllipse(self.geometry)
+        else:
+            painter.drawRect(self.geometry)
+
+    def bounding_rect(self):
+        if isinstance(self.geometry, QLineF):
+            rect = QRectF(self.geometry.p1(), self.geometry.p2()).normalized()
+        else:
+            rect = QRectF(self.geometry)
+        pad = self.pen.widthF() / 2 + (self.arrow_size or 0) + 1
+        return rect.adjusted(-pad, -pad, pad, pad)
+
+
+class TextOperation(_Operation):
+    """Rich text document drawn at a position"""
+
+    def __init__(self, document, position, size):
+        self.document = document  # QTextDocument owned by the operation
+        self.position = QPointF(position)
+        self.size = size  # QSize of the text box
+
+    def paint(self, painter):
+        # Glyphs are laid out again at the painter's scale, so text stays sharp when resized
+        painter.save()
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.translate(self.position)
+        self.document.drawContents(painter, QRectF(0, 0, self.size.width(), self.size.height()))
+        painter.restore()
+
+    def bounding_rect(self):
+        return QRectF(self.position, QSizeF(self.size))
+
@@ -0,0 +1,107 @@
+import numpy as np
+from PIL import Image
+from PyQt5.QtGui import QImage, QPixmap
+
+# Pillow modes Qt can wrap directly: mode -> (raw packing, QImage format, bytes per pixel).
+# The byte-order formats (RGBX8888, RGBA8888) match Pillow's packing on any endianness.
+_QT_FORMATS = {
+    'L': ('L', QImage.Format_Grayscale8, 1),
+    'RGB': ('RGBX', QImage.Format_RGBX8888, 4),
+    'RGBX': ('RGBX', QImage.Format_RGBX8888, 4),
+    'RGBA': ('RGBA', QImage.Format_RGBA8888, 4),
+    'RGBa': ('RGBa', QImage.Format_RGBA8888_Premultiplied, 4),
+}
+
+# Modes that have to be converted before they can be handed to Qt
+_CONVERSIONS = {
+    '1': 'L',
+    'LA': 'RGBA',
+    'La': 'RGBA',
+    'PA': 'RGBA',
+    'CMYK': 'RGB',
+    'YCbCr': 'RGB',
+    'LAB': 'RGB',
+    'HSV': 'RGB',
+}
+
+# 16-bit and 32-bit grayscale modes, shown through Qt's 16-bit grayscale format
+_DEEP_GRAY_MODES = ('I;16', 'I;16L', 'I;16B', 'I;16N', 'I', 'F')
+
+
+class _ImageBuffer(np.ndarray):
+    """Byte view of QImage memory that keeps the QImage alive while Pillow maps it"""
+
+
+def pil_to_qimage(image):
+    """Convert a PIL image of any mode to a QImage sharing one packed buffer"""
+    mode = image.mode
+    if mode == 'P':
+        mode = 'RGBA' if 'transparency' in image.info else 'RGB'
+        image = image.convert(mode)
+    elif mode in _CONVERSIONS:
+        mode = _CONVERSIONS[mode]
+        image = image.convert(mode)
+
+    width, height = image.size
+    if mode in _DEEP_GRAY_MODES:
+        pixels = np.asarray(image)
+        if mode in ('I', 'F'):
+            # 32-bit data has no fixed range, so stretch what the image uses onto 16 bits
+            low, high = image.getextrema()
+            if high > low:
+                pixels = (pixels.astype(np.float64) - low) * (65535.0 / (high - low))
+        data = np.ascontiguousarray(np.clip(pixels, 0, 65535).astype(np.uint16)).tobytes()
+        qimage = QImage(data, width, height, width * 2, QImage.Format_Grayscale16)
+    else:
+        if mode not in _QT_FORMATS:
+            mode = 'RGBA' if 'A' in mode else 'RGB'
+            image = image.convert(mode)
+        raw_mode, qt_format, pixel_size = _QT_FORMATS[mode]
+        # One packing pass; QImage wraps the bytes without copying them again
+        data = image.tobytes('raw', raw_mode)
+        qimage = QImage(data, width, height, width * pixel_size, qt_format)
+
+    # QImage does not own the buffer, so tie its lifetime to the QImage
+    qimage._buffer = data
+    return qimage
+
+
+def pil_to_qpixmap(image):
+    """Convert a PIL image of any mode to a QPixmap"""
+    return QPixmap.fromImage(pil_to_qimage(image))
+
+
+def qimage_to_pil(qimage):
+    """Convert a QImage to a PIL image (RGBA, RGB or L).
+
+    RGBA, RGBX and grayscale data is mapped by Pillow without copying.
+    """
+    if qimage.isNull():
+        return None
+
+    if qimage.hasAlphaChannel():
+        qimage = qimage.convertToFormat(QImage.Format_RGBA8888)
+        mode, raw_mode = 'RGBA', 'RGBA'
+    elif qimage.format() == QImage.Format_Grayscale8:
+        mode, raw_mode = 'L', 'L'
+    else:
+        # RGBX8888 is mapped as-is; Pillow's RGB mode uses the same 4-byte layout
+        qimage = qimage.convertToFormat(QImage.Format_RGBX8888)
+        mode, raw_mode = 'RGBX', 'RGBX'
+
+    bits = qimage.constBits()
+    bits.setsize(qimage.sizeInBytes())
+    buffer = np.frombuffer(bits, dtype=np.uint8).view(_ImageBuffer)
+    buffer.qimage = qimage
+
+    size = (qimage.width(), qimage.height())
+    image = Image.frombuffer(mode, size, buffer, 'raw', raw_mode, qimage.bytesPerLine(), 1)
+    if mode == 'RGBX':
+        # Callers expect RGB; Pillow stores both in 4 bytes so this is a plain copy
+        image = image.convert('RGB')
+    return image
+
+
+def qpixmap_to_pil(pixmap):
+    """Convert a QPixmap to a PIL image (RGBA, RGB or L)"""
+    return qimage_to_pil(pixmap.toImage())
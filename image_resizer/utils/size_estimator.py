@@ -0,0 +1,233 @@
+import io
+from collections import OrderedDict
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QByteArray, QBuffer, QRect, pyqtSignal
+from PyQt5.QtGui import QImage, QPainter, QPixmap
+from image_resizer.utils.encoded_cache import image_digest
+from image_resizer.utils.qt_image import qimage_to_pil
+
+# Sampled estimates encode a TILE_GRID x TILE_GRID mosaic of TILE_SIZE tiles.
+# TILE_SIZE is a multiple of the 16px JPEG MCU so tiles compress like the full image.
+TILE_SIZE = 64
+TILE_GRID = 4
+
+# PNG and GIF compress whole rows with long-range matches, so they are sampled
+# as STRIP_COUNT full-width strips holding about STRIP_PIXELS pixels in total
+ROW_FORMATS = ('PNG', 'GIF')
+STRIP_COUNT = 8
+STRIP_PIXELS = 128 * 1024
+
+# Ratio of real to sampled size per format, from benchmarks/size_estimate.py;
+# refined at runtime from every full encode the worker measures
+DEFAULT_CALIBRATION = {
+    'JPEG': 1.0,
+    'PNG': 1.0,
+}
+
+
+def encoded_size(image, img_format, quality):
+    """Encode a QImage or QPixmap in memory and return the size in bytes"""
+    byte_array = QByteArray()
+    buffer = QBuffer(byte_array)
+    buffer.open(QBuffer.WriteOnly)
+    image.save(buffer, img_format, quality)
+    buffer.close()
+    return byte_array.size()
+
+
+def _sample_canvas(image, width, height):
+    canvas_format = QImage.Format_ARGB32 if image.hasAlphaChannel() else QImage.Format_RGB32
+    canvas = QImage(width, height, canvas_format)
+    painter = QPainter(canvas)
+    painter.setCompositionMode(QPainter.CompositionMode_Source)
+    return canvas, painter
+
+
+def _draw(painter, target, image, source):
+    if isinstance(image, QPixmap):
+        painter.drawPixmap(target, image, source)
+    else:
+        painter.drawImage(target, image, source)
+
+
+def sample_tiles(image):
+    """Build a mosaic of tiles spread evenly over a QImage or QPixmap.
+
+    Returns None when the image is small enough to encode in full.
+    """
+    width, height = image.width(), image.height()
+    mosaic_size = TILE_SIZE * TILE_GRID
+    if width < mosaic_size * 2 or height < mosaic_size * 2:
+        return None
+
+    mosaic, painter = _sample_canvas(image, mosaic_size, mosaic_size)
+    for row in range(TILE_GRID):
+        for col in range(TILE_GRID):
+            # Centre of each grid cell, snapped to the MCU grid
+            x = ((width * (2 * col + 1)) // (2 * TILE_GRID) - TILE_SIZE // 2) // 16 * 16
+            y = ((height * (2 * row + 1)) // (2 * TILE_GRID) - TILE_SIZE // 2) // 16 * 16
+            target = QRect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+            _draw(painter, target, image, QRect(x, y, TILE_SIZE, TILE_SIZE))
+    painter.end()
+    return mosaic
+
+
+def sample_strips(image):
+    """Stack full-width strips spread evenly over a QImage or QPixmap.
+
+    Returns None when the image is small enough to encode in full.
+    """
+    width, height = image.width(), image.height()
+    rows = max(2, STRIP_PIXELS // (STRIP_COUNT * width))
+    if height < rows * STRIP_COUNT * 4:
+        return None
+
+    strips, painter = _sample_canvas(image, width, rows * STRIP_COUNT)
+    for index in range(STRIP_COUNT):
+        y = (height * (2 * index + 1)) // (2 * STRIP_COUNT) - rows // 2
+        target = QRect(0, index * rows, width, rows)
+        _draw(painter, target, image, QRect(0, y, width, rows))
+    painter.end()
+    return strips
+
+
+_header_sizes = {}
+
+
+def _header_size(img_format, quality):
+    """Fixed per-file cost of a format (headers, tables), measured on a tiny image"""
+    key = (img_format, quality)
+    if key not in _header_sizes:
+        blank = QImage(16, 16, QImage.Format_RGB32)
+        blank.fill(0)
+        _header_sizes[key] = encoded_size(blank, img_format, quality)
+    return _header_sizes[key]
+
+
+def sampled_size(image, img_format, quality):
+    """Extrapolate the encoded size in bytes from a sample, or None for small images
+    and formats Qt can't write"""
+    if img_format in ROW_FORMATS:
+        sample_image = sample_strips(image)
+    else:
+        sample_image = sample_tiles(image)
+    if sample_image is None:
+        return None
+    encoded = encoded_size(sample_image, img_format, quality)
+    if not encoded:
+        # Qt has no writer for this format (GIF); only a full encode can tell
+        return None
+    header = _header_size(img_format, quality)
+    sample = max(0, encoded - header)
+    pixel_ratio = (image.width() * image.height()) / (sample_image.width() * sample_image.height())
+    return header + sample * pixel_ratio
+
+
+class _EstimateSignals(QObject):
+    """Signals emitted from worker threads, delivered on the GUI thread"""
+    measured = pyqtSignal(object, float, float)  # cache key, size in MB (-1 if skipped), sampled MB (-1 if none)
+
+
+class _EstimateTask(QRunnable):
+    def __init__(self, estimator, key, image):
+        super().__init__()
+        self.estimator = estimator
+        self.key = key
+        self.image = image
+
+    def run(self):
+        # Skip pixmaps that were replaced by newer edits while this task was queued
+        if not self.estimator.is_wanted(self.key):
+            self.estimator.signals.measured.emit(self.key, -1.0, -1.0)
+            return
+        cache_key, img_format, quality = self.key
+        byte_array = QByteArray()
+        buffer = QBuffer(byte_array)
+        buffer.open(QBuffer.WriteOnly)
+        encoded = self.image.save(buffer, img_format, quality)
+        buffer.close()
+        data = byte_array.data()
+        if not encoded:
+            # Qt has no writer for some formats (GIF), so let Pillow encode those as saving does
+            try:
+                out = io.BytesIO()
+                qimage_to_pil(self.image).save(out, img_format)
+                data = out.getvalue()
+            except Exception as e:
+                print(f"Error estimating {img_format} size: {str(e)}")
+                self.estimator.signals.measured.emit(self.key, -1.0, -1.0)
+                return
+        size = len(data)
+        
+        # Keep the bytes so saving the same pixels does not encode them again
+        encoded_cache = self.estimator.encoded_cache
+        if encoded_cache is not None:
+            digest = image_digest(self.image)
+            encoded_cache.remember(cache_key, digest)
+            encoded_cache.put(digest, img_format, quality, data)
+        # Measure the sampled estimate too so the calibration keeps learning
+        sampled = sampled_size(self.image, img_format, quality)
+        sampled = sampled / (1024 * 1024) if sampled is not None else -1.0
+        self.estimator.signals.measured.emit(self.key, size / (1024 * 1024), sampled)
+
+
+class FileSizeEstimator(QObject):
+    """Measure encoded file sizes on a worker thread, cached per pixmap, format and quality"""
+    size_ready = pyqtSignal(int, float)  # image_id, size in MB
+
+    def __init__(self, parent=None, encoded_cache=None, max_entries=512):
+        super().__init__(parent)
+        self.encoded_cache = encoded_cache
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+        self.max_entries = max_entries
+        self.cache = OrderedDict()  # (cacheKey, format, quality) -> size in MB
+        self.in_flight = set()
+        self.latest = {}  # image ID -> key of the pixmap it currently shows
+        self.calibration = dict(DEFAULT_CALIBRATION)
+
+        self.signals = _EstimateSignals()
+        self.signals.measured.connect(self._on_measured)
+
+    def estimate(self, image_id, pixmap, img_format, quality):
+        """Return the cached size in MB, or None and emit size_ready once measured"""
+        key = (pixmap.cacheKey(), img_format, quality)
+        self.latest[image_id] = key
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        if key not in self.in_flight:
+            self.in_flight.add(key)
+            # Pixmaps belong to the GUI thread; the worker encodes a QImage copy
+            self.pool.start(_EstimateTask(self, key, pixmap.toImage()))
+        return None
+
+    def quick_estimate(self, pixmap, img_format, quality):
+        """Calibrated size in MB from a sample, fast enough for slider updates"""
+        sampled = sampled_size(pixmap, img_format, quality)
+        if sampled is None:
+            return None
+        return sampled * self.calibration.get(img_format, 1.0) / (1024 * 1024)
+
+    def forget(self, image_id):
+        """Stop reporting sizes for an image that was closed"""
+        self.latest.pop(image_id, None)
+
+    def is_wanted(self, key):
+        # Called from workers; list() copies the values atomically under the GIL
+        return key in list(self.latest.values())
+
+    def _on_measured(self, key, size, sampled):
+        self.in_flight.discard(key)
+        if size < 0:
+            return
+        if sampled > 0:
+            # Move the correction factor a little towards this real encode
+            img_format = key[1]
+            ratio = size / sampled
+            self.calibration[img_format] = 0.8 * self.calibration.get(img_format, 1.0) + 0.2 * ratio
+        self.cache[key] = size
+        if len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+        for image_id, latest_key in list(self.latest.items()):
+            if latest_key == key:
+                self.size_ready.emit(image_id, size)
@@ -0,0 +1,51 @@
+import numpy as np
+
+# Largest distance, in pixels, that a dropped point may lie from the simplified stroke
+TOLERANCE = 0.5
+
+
+def tolerance_for_scale(scale):
+    """Tolerance in image pixels that stays below half a pixel both in the image and on screen"""
+    return TOLERANCE / max(1.0, scale)
+
+
+def thin_points(points, last, min_distance):
+    """Points that are at least min_distance from the point kept before them"""
+    kept = []
+    for point in points:
+        if last is None or abs(point.x() - last.x()) + abs(point.y() - last.y()) >= min_distance:
+            kept.append(point)
+            last = point
+    return kept
+
+
+def simplify_points(points, tolerance):
+    """Ramer-Douglas-Peucker: keep the fewest points that stay within tolerance of the stroke"""
+    if len(points) < 3:
+        return list(points)
+    xy = np.array([(point.x(), point.y()) for point in points], dtype=np.float64)
+    keep = np.zeros(len(xy), dtype=bool)
+    keep[0] = keep[-1] = True
+
+    # Split spans at their farthest point until every dropped point is close enough
+    spans = [(0, len(xy) - 1)]
+    while spans:
+        first, last = spans.pop()
+        if last - first < 2:
+            continue
+        start = xy[first]
+        direction = xy[last] - start
+        offsets = xy[first + 1:last] - start
+        # Distance to the segment, not the infinite line, so a stroke that doubles
+        # back on itself keeps the point where it turns
+        length = direction @ direction
+        along = np.clip(offsets @ direction / length, 0, 1) if length else np.zeros(len(offsets))
+        gaps = offsets - along[:, None] * direction
+        distances = np.hypot(gaps[:, 0], gaps[:, 1])
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            spans.append((first, split))
+            spans.append((split, last))
+    return [points[index] for index in np.flatnonzero(keep)]
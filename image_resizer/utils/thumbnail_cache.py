@@ -0,0 +1,245 @@
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QStandardPaths, pyqtSignal
+from PyQt5.QtGui import QImage
+
+# Longest side of a stored thumbnail, twice the size shown so it stays sharp on HiDPI screens
+THUMBNAIL_SIZE = 64
+# Disk budget for stored thumbnails, roughly 15,000 of them
+MAX_BYTES = 64 * 1024 * 1024
+# Bytes hashed from each end of a file to recognise it under another path
+DIGEST_CHUNK = 64 * 1024
+
+
+def file_digest(path):
+    """SHA-1 of a file's size and its first and last DIGEST_CHUNK bytes.
+
+    Reading only the ends keeps a miss cheap next to decoding the image, and the
+    size, headers and trailing image data tell different files apart.
+    """
+    size = os.path.getsize(path)
+    digest = hashlib.sha1(str(size).encode())
+    with open(path, 'rb') as f:
+        digest.update(f.read(DIGEST_CHUNK))
+        if size > DIGEST_CHUNK:
+            f.seek(max(DIGEST_CHUNK, size - DIGEST_CHUNK))
+            digest.update(f.read(DIGEST_CHUNK))
+    return digest.hexdigest()
+
+
+def make_thumbnail(source):
+    """Encoded thumbnail of a LazyImage, decoded at reduced size where the format allows"""
+    # JPEGs are decoded by libjpeg at 1/2, 1/4 or 1/8 scale, other formats are reduced after decoding
+    image, _ = source.load_preview(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+    image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+    out = io.BytesIO()
+    if image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info:
+        image.convert('RGBA').save(out, 'PNG')
+    else:
+        image.convert('RGB').save(out, 'JPEG', quality=85)
+    return out.getvalue()
+
+
+class ThumbnailStore:
+    """Thumbnails kept in a single SQLite file.
+
+    Encoded bytes are keyed by the content hash of their source file, and an index
+    maps path, mtime and size to that hash so unchanged files are found without
+    reading them. The least recently used thumbnails are dropped over budget.
+    Safe to use from worker threads.
+    """
+
+    def __init__(self, path, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        # Space freed by evictions is handed back to the file system, not left in the file
+        self.db.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        self.db.execute('PRAGMA journal_mode = WAL')
+        self.db.execute('PRAGMA synchronous = NORMAL')
+        with self.db:
+            self.db.execute('CREATE TABLE IF NOT EXISTS thumbnails '
+                            '(digest TEXT PRIMARY KEY, data BLOB NOT NULL, used INTEGER NOT NULL)')
+            self.db.execute('CREATE INDEX IF NOT EXISTS thumbnails_used ON thumbnails (used)')
+            self.db.execute('CREATE TABLE IF NOT EXISTS files '
+                            '(path TEXT PRIMARY KEY, mtime INTEGER NOT NULL, size INTEGER NOT NULL, '
+                            'digest TEXT NOT NULL)')
+        self.total_bytes, self.clock = self.db.execute(
+            'SELECT COALESCE(SUM(LENGTH(data)), 0), COALESCE(MAX(used), 0) FROM thumbnails').fetchone()
+
+    def lookup(self, path, mtime, size):
+        """Content hash recorded for a file that hasn't changed since, or None"""
+        with self.lock:
+            row = self.db.execute('SELECT digest FROM files WHERE path = ? AND mtime = ? AND size = ?',
+                                  (path, mtime, size)).fetchone()
+        return row[0] if row else None
+
+    def get(self, digest):
+        """Encoded thumbnail for a content hash, or None"""
+        with self.lock:
+            row = self.db.execute('SELECT data FROM thumbnails WHERE digest = ?', (digest,)).fetchone()
+            if row is None:
+                return None
+            self.clock += 1
+            with self.db:
+                self.db.execute('UPDATE thumbnails SET used = ? WHERE digest = ?', (self.clock, digest))
+            return row[0]
+
+    def link(self, path, mtime, size, digest):
+        """Record the content hash of a file"""
+        with self.lock, self.db:
+            self.db.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)', (path, mtime, size, digest))
+
+    def put(self, path, mtime, size, digest, data):
+        """Store a thumbnail for a file, evicting the least recently used over budget"""
+        with self.lock:
+            self.clock += 1
+            with self.db:
+                old = self.db.execute('SELECT LENGTH(data) FROM thumbnails WHERE digest = ?', (digest,)).fetchone()
+                self.db.execute('INSERT OR REPLACE INTO thumbnails VALUES (?, ?, ?)', (digest, data, self.clock))
+                self.db.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)', (path, mtime, size, digest))
+            self.total_bytes += len(data) - (old[0] if old else 0)
+            if self.total_bytes > self.max_bytes:
+                self._trim()
+
+    def _trim(self):
+        # Evict down to 90% of the budget so the next few inserts don't trim again
+        target = self.max_bytes * 0.9
+        evicted = []
+        rows = self.db.execute('SELECT digest, LENGTH(data) FROM thumbnails ORDER BY used')
+        for digest, nbytes in rows:
+            if self.total_bytes <= target:
+                break
+            evicted.append((digest,))
+            self.total_bytes -= nbytes
+        rows.close()
+        with self.db:
+            self.db.executemany('DELETE FROM thumbnails WHERE digest = ?', evicted)
+            self.db.executemany('DELETE FROM files WHERE digest = ?', evicted)
+        self.db.execute('PRAGMA incremental_vacuum')
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+class _ThumbnailSignals(QObject):
+    """Signals emitted from worker threads, delivered on the GUI thread"""
+    ready = pyqtSignal(int, object)  # image_id, QImage
+    failed = pyqtSignal(int)  # image_id
+
+
+class _ThumbnailTask(QRunnable):
+    def __init__(self, cache, image_id, source):
+        super().__init__()
+        self.cache = cache
+        self.image_id = image_id
+        self.source = source
+
+    def run(self):
+        # Skip images that were removed while this task was queued
+        if self.image_id not in self.cache.wanted:
+            return
+        try:
+            image = QImage.fromData(self.cache.thumbnail_data(self.source))
+        except Exception as e:
+            print(f"Error making thumbnail for {self.source.path}: {str(e)}")
+            image = None
+        if image is None or image.isNull():
+            self.cache.signals.failed.emit(self.image_id)
+        else:
+            self.cache.signals.ready.emit(self.image_id, image)
+
+
+class ThumbnailCache(QObject):
+    """Make list thumbnails on a thread pool, reusing those stored by earlier sessions"""
+    thumbnail_ready = pyqtSignal(int, object)  # image_id, QImage
+    thumbnail_failed = pyqtSignal(int)  # image_id
+
+    def __init__(self, parent=None, directory=None, max_bytes=MAX_BYTES, max_workers=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        # Leave cores free for the size estimator and saving
+        self.pool.setMaxThreadCount(max_workers or max(1, min(4, (os.cpu_count() or 1) // 2)))
+        self.wanted = set()  # IDs of images with a thumbnail queued or in progress
+
+        self.store = None
+        directory = directory or QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            self.store = ThumbnailStore(os.path.join(directory, 'thumbnails.db'), max_bytes)
+        except (OSError, sqlite3.Error) as e:
+            # Thumbnails still work, they just aren't kept for the next session
+            print(f"Thumbnail cache unavailable: {str(e)}")
+
+        self.signals = _ThumbnailSignals()
+        self.signals.ready.connect(self._on_ready)
+        self.signals.failed.connect(self._on_failed)
+
+    def request(self, image_id, source):
+        """Queue a thumbnail for a LazyImage; thumbnail_ready reports it by image ID"""
+        if image_id in self.wanted:
+            return
+        self.wanted.add(image_id)
+        self.pool.start(_ThumbnailTask(self, image_id, source))
+
+    def forget(self, image_id):
+        """Stop making a thumbnail for an image that was removed"""
+        self.wanted.discard(image_id)
+
+    def thumbnail_data(self, source):
+        """Encoded thumbnail of a LazyImage, from the store when it has one; runs on workers"""
+        path = source.path
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        store = self.store
+        if store is None:
+            return make_thumbnail(source)
+
+        try:
+            digest = store.lookup(*key)
+            data = store.get(digest) if digest else None
+            if data is not None:
+                return data
+            # The file is new or changed; its content may still be stored under another
+            # path, as when a folder was moved or a file copied
+            digest = file_digest(path)
+            data = store.get(digest)
+            if data is not None:
+                store.link(*key, digest)
+                return data
+        except sqlite3.Error as e:
+            print(f"Error reading thumbnail cache: {str(e)}")
+            return make_thumbnail(source)
+
+        data = make_thumbnail(source)
+        try:
+            store.put(*key, digest, data)
+        except sqlite3.Error as e:
+            print(f"Error writing thumbnail cache: {str(e)}")
+        return data
+
+    def close(self):
+        """Drop queued thumbnails, wait for running ones and close the store"""
+        self.wanted.clear()
+        self.pool.clear()
+        self.pool.waitForDone()
+        if self.store:
+            self.store.close()
+            self.store = None
+
+    def _on_ready(self, image_id, image):
+        if image_id not in self.wanted:
+            return
+        self.wanted.discard(image_id)
+        self.thumbnail_ready.emit(image_id, image)
+
+    def _on_failed(self, image_id):
+        if image_id not in self.wanted:
+            return
+        # Forget the request so the row can ask again when it is next painted
+        self.wanted.discard(image_id)
+        self.thumbnail_failed.emit(image_id)
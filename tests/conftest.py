@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+
+
+@pytest.fixture(scope='session')
+def app():
+    """QApplication shared by tests that need pixmaps or queued signals"""
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,57 @@
+from PyQt5.QtGui import QImage
+
+from image_resizer.utils.encoded_cache import EncodedCache, image_digest
+
+
+def test_get_returns_bytes_for_the_same_format_and_quality():
+    cache = EncodedCache()
+    cache.put('a', 'JPEG', 80, b'jpeg')
+    assert cache.get('a', 'JPEG', 80) == b'jpeg'
+    assert cache.get('a', 'JPEG', 90) is None
+    assert cache.get('a', 'PNG', 80) is None
+
+
+def test_put_evicts_least_recently_used_over_budget():
+    cache = EncodedCache(max_bytes=10)
+    cache.put('a', 'PNG', -1, b'1234')
+    cache.put('b', 'PNG', -1, b'1234')
+    cache.get('a', 'PNG', -1)
+    cache.put('c', 'PNG', -1, b'1234')
+    assert cache.get('b', 'PNG', -1) is None
+    assert cache.get('a', 'PNG', -1) == b'1234'
+    assert cache.total_bytes == 8
+
+
+def test_put_replaces_without_double_counting():
+    cache = EncodedCache()
+    cache.put('a', 'PNG', -1, b'1234')
+    cache.put('a', 'PNG', -1, b'12')
+    assert cache.total_bytes == 2
+
+
+def test_put_skips_data_larger_than_the_budget():
+    cache = EncodedCache(max_bytes=4)
+    cache.put('a', 'PNG', -1, b'12345')
+    assert cache.get('a', 'PNG', -1) is None
+    assert cache.total_bytes == 0
+
+
+def test_remembered_digests_are_bounded():
+    cache = EncodedCache(max_digests=2)
+    for key in range(3):
+        cache.remember(key, f'digest{key}')
+    assert cache.digest_for(0) is None
+    assert cache.digest_for(2) == 'digest2'
+
+
+def test_image_digest_follows_pixels_and_geometry():
+    image = QImage(4, 4, QImage.Format_RGB32)
+    image.fill(0xff0000)
+    same = QImage(4, 4, QImage.Format_RGB32)
+    same.fill(0xff0000)
+    assert image_digest(image) == image_digest(same)
+    same.setPixel(1, 1, 0x00ff00)
+    assert image_digest(image) != image_digest(same)
+    wide = QImage(8, 2, QImage.Format_RGB32)
+    wide.fill(0xff0000)
+    assert image_digest(image) != image_digest(wide)
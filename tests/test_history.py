@@ -0,0 +1,110 @@
+import os
+
+import numpy as np
+import pytest
+from PyQt5.QtGui import QImage
+
+from image_resizer.utils.history import HistoryStore, _Blob, _compress
+
+
+def noisy_image(seed, size=64):
+    """Image that zlib can barely compress, so budgets are easy to reason about"""
+    image = QImage(size, size, QImage.Format_RGB32)
+    pixels = np.random.default_rng(seed).integers(0, 2 ** 32, size * size, dtype=np.uint32)
+    bits = image.bits()
+    bits.setsize(image.sizeInBytes())
+    np.frombuffer(bits, np.uint32)[:] = pixels
+    return image
+
+
+class FakeHistory:
+    """Stands in for ImageHistory; the store only calls release_cache()"""
+
+    def __init__(self):
+        self.released = 0
+
+    def release_cache(self):
+        self.released += 1
+
+
+def settle(store, app):
+    store.pool.waitForDone()
+    app.processEvents()
+
+
+@pytest.fixture
+def store(app):
+    store = HistoryStore()
+    yield store
+    store.close()
+
+
+def test_blob_round_trips_through_memory_and_disk(tmp_path, app):
+    image = noisy_image(1)
+    blob = _Blob(image)
+    assert blob.image() == image
+
+    blob.raw, blob.data = None, _compress(image)
+    assert blob.image() == image
+
+    blob.spill(str(tmp_path))
+    path = blob.path
+    assert blob.data is None and os.path.exists(path)
+    assert blob.image() == image
+
+    blob.discard()
+    assert not os.path.exists(path)
+
+
+def test_blob_is_not_changed_by_painting_on_the_source(app):
+    image = noisy_image(2)
+    blob = _Blob(image)
+    expected = image.copy()
+    image.fill(0)
+    assert blob.image() == expected
+
+
+def test_store_accounts_compressed_bytes(store, app):
+    history = FakeHistory()
+    blob = store.add(history, noisy_image(3))
+    raw_bytes = blob.nbytes
+    settle(store, app)
+    assert blob.raw is None and blob.data is not None
+    assert store.memory[history] == len(blob.data) == blob.nbytes
+    assert store.total == blob.nbytes
+    assert blob.nbytes <= raw_bytes * 1.01
+
+    store.discard(blob)
+    assert store.memory[history] == 0 and store.total == 0
+
+
+def test_image_budget_spills_oldest_blobs_of_that_image(store, app):
+    history, other = FakeHistory(), FakeHistory()
+    kept = store.add(other, noisy_image(4))
+    blobs = [store.add(history, noisy_image(seed)) for seed in range(5, 9)]
+    settle(store, app)
+
+    store.image_budget = blobs[0].nbytes * 2
+    store._enforce(history)
+    assert store.memory[history] <= store.image_budget
+    assert [blob.path is not None for blob in blobs] == [True, True, False, False]
+    assert kept.path is None and kept.data is not None
+    assert blobs[0].image() == noisy_image(5)
+
+
+def test_total_budget_drops_other_frames_before_spilling(store, app):
+    history, other = FakeHistory(), FakeHistory()
+    blob = store.add(history, noisy_image(9))
+    settle(store, app)
+    store.frame_changed(other, 1000)
+    store.total_budget = store.total - 1
+    store.frame_changed(history, 10)
+
+    assert other.released == 1 and other not in store.frames
+    assert blob.data is not None
+    assert store.total <= store.total_budget
+
+    store.total_budget = 0
+    store.frame_changed(history, 10)
+    assert blob.path is not None
+    assert history.released == 0
@@ -0,0 +1,69 @@
+import pytest
+from PyQt5.QtGui import QImage, QPainter, QColor, QPixmap
+
+from image_resizer.utils import size_estimator
+from image_resizer.utils.size_estimator import FileSizeEstimator, encoded_size, sampled_size
+
+
+def gradient_image(width, height):
+    image = QImage(width, height, QImage.Format_RGB32)
+    painter = QPainter(image)
+    for x in range(0, width, 8):
+        painter.fillRect(x, 0, 8, height, QColor((x * 7) % 256, (x * 3) % 256, 128))
+    painter.end()
+    return image
+
+
+@pytest.mark.parametrize('img_format, quality', [('JPEG', 80), ('PNG', -1)])
+def test_sampled_size_is_close_to_the_real_size(app, img_format, quality):
+    image = gradient_image(1600, 1200)
+    real = encoded_size(image, img_format, quality)
+    sampled = sampled_size(image, img_format, quality)
+    assert 0.5 < sampled / real < 2
+
+
+def test_sampled_size_skips_small_images_and_unwritable_formats(app):
+    assert sampled_size(gradient_image(100, 100), 'JPEG', 80) is None
+    assert sampled_size(gradient_image(1600, 1200), 'GIF', -1) is None
+
+
+def test_quick_estimate_applies_the_calibration(app):
+    pixmap = QPixmap.fromImage(gradient_image(1600, 1200))
+    estimator = FileSizeEstimator()
+    sampled = sampled_size(pixmap, 'JPEG', 80) / (1024 * 1024)
+    assert estimator.quick_estimate(pixmap, 'JPEG', 80) == pytest.approx(sampled)
+    estimator.calibration['JPEG'] = 1.5
+    assert estimator.quick_estimate(pixmap, 'JPEG', 80) == pytest.approx(sampled * 1.5)
+
+
+def test_measured_sizes_move_the_calibration(app):
+    estimator = FileSizeEstimator()
+    key = (1, 'JPEG', 80)
+    estimator._on_measured(key, 2.0, 1.0)
+    assert estimator.calibration['JPEG'] == pytest.approx(0.8 + 0.2 * 2.0)
+    for _ in range(50):
+        estimator._on_measured(key, 2.0, 1.0)
+    assert estimator.calibration['JPEG'] == pytest.approx(2.0, rel=1e-3)
+    assert estimator.cache[key] == 2.0
+
+
+def test_measured_sizes_without_a_sample_leave_the_calibration(app):
+    estimator = FileSizeEstimator()
+    estimator._on_measured((1, 'GIF', -1), 0.2, -1.0)
+    estimator._on_measured((2, 'PNG', -1), -1.0, -1.0)
+    assert estimator.calibration == size_estimator.DEFAULT_CALIBRATION
+    assert (2, 'PNG', -1) not in estimator.cache
+
+
+def test_estimate_reports_the_size_once_measured(app):
+    estimator = FileSizeEstimator()
+    pixmap = QPixmap.fromImage(gradient_image(1600, 1200))
+    sizes = []
+    estimator.size_ready.connect(lambda image_id, size: sizes.append((image_id, size)))
+    assert estimator.estimate(7, pixmap, 'JPEG', 80) is None
+    estimator.pool.waitForDone()
+    app.processEvents()
+    real = encoded_size(pixmap, 'JPEG', 80) / (1024 * 1024)
+    assert sizes == [(7, pytest.approx(real))]
+    assert estimator.estimate(7, pixmap, 'JPEG', 80) == pytest.approx(real)
+    assert estimator.calibration['JPEG'] != size_estimator.DEFAULT_CALIBRATION['JPEG']
@@ -0,0 +1,65 @@
+import math
+
+from PyQt5.QtCore import QPointF
+
+from image_resizer.utils.strokes import simplify_points, thin_points, tolerance_for_scale
+
+
+def points(*coords):
+    return [QPointF(x, y) for x, y in coords]
+
+
+def coords(points):
+    return [(point.x(), point.y()) for point in points]
+
+
+def test_thin_points_drops_points_closer_than_min_distance():
+    kept = thin_points(points((0, 0), (1, 0), (2, 1), (3, 1), (6, 1)), None, 3)
+    assert coords(kept) == [(0, 0), (2, 1), (6, 1)]
+
+
+def test_thin_points_measures_from_the_last_kept_point():
+    kept = thin_points(points((1, 0), (4, 0)), QPointF(0, 0), 2)
+    assert coords(kept) == [(4, 0)]
+
+
+def test_simplify_points_keeps_short_strokes():
+    stroke = points((0, 0), (5, 5))
+    assert coords(simplify_points(stroke, 0.5)) == [(0, 0), (5, 5)]
+
+
+def test_simplify_points_collapses_a_straight_line():
+    stroke = points(*[(x, 2 * x) for x in range(20)])
+    assert coords(simplify_points(stroke, 0.5)) == [(0, 0), (19, 38)]
+
+
+def test_simplify_points_keeps_corners_and_drops_jitter():
+    stroke = points((0, 0), (5, 0.2), (10, 0), (10, 5), (10.1, 10), (10, 20))
+    assert coords(simplify_points(stroke, 0.5)) == [(0, 0), (10, 0), (10, 20)]
+
+
+def test_simplify_points_keeps_the_turn_of_a_stroke_that_doubles_back():
+    stroke = points((0, 0), (10, 0), (5, 0))
+    assert coords(simplify_points(stroke, 0.5)) == [(0, 0), (10, 0), (5, 0)]
+
+
+def segment_distance(point, a, b):
+    dx, dy = b.x() - a.x(), b.y() - a.y()
+    t = ((point.x() - a.x()) * dx + (point.y() - a.y()) * dy) / (dx * dx + dy * dy)
+    t = min(1.0, max(0.0, t))
+    return math.hypot(point.x() - a.x() - t * dx, point.y() - a.y() - t * dy)
+
+
+def test_simplified_stroke_stays_within_tolerance():
+    stroke = points(*[(x, (x % 7) * 0.3) for x in range(100)])
+    kept = simplify_points(stroke, 1.0)
+    assert len(kept) < len(stroke)
+    indices = [stroke.index(point) for point in kept]
+    for first, last in zip(indices, indices[1:]):
+        for point in stroke[first + 1:last]:
+            assert segment_distance(point, stroke[first], stroke[last]) <= 1.0
+
+
+def test_tolerance_for_scale_tightens_when_zoomed_in():
+    assert tolerance_for_scale(0.25) == 0.5
+    assert tolerance_for_scale(4) == 0.125
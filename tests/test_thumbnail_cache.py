@@ -0,0 +1,67 @@
+import pytest
+
+from image_resizer.utils.thumbnail_cache import DIGEST_CHUNK, ThumbnailStore, file_digest
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ThumbnailStore(str(tmp_path / 'thumbnails.db'), max_bytes=1000)
+    yield store
+    store.close()
+
+
+def put(store, name, nbytes=100):
+    store.put(f'/images/{name}', 1, nbytes, name, b'x' * nbytes)
+
+
+def test_put_and_lookup(store):
+    put(store, 'a')
+    assert store.lookup('/images/a', 1, 100) == 'a'
+    assert store.lookup('/images/a', 2, 100) is None
+    assert store.get('a') == b'x' * 100
+    assert store.total_bytes == 100
+
+
+def test_trim_evicts_least_recently_used_to_ninety_percent(store):
+    for name in 'abcdefghij':
+        put(store, name)
+    store.get('a')
+    put(store, 'k')
+    # 1100 bytes over a 1000 byte budget: trimmed to 900, oldest first, 'a' was just used
+    assert store.total_bytes == 900
+    assert store.get('b') is None and store.get('c') is None
+    assert store.lookup('/images/b', 1, 100) is None
+    assert store.get('a') is not None and store.get('k') is not None
+
+
+def test_replacing_a_thumbnail_does_not_double_count(store):
+    put(store, 'a')
+    store.put('/images/a', 2, 100, 'a', b'y' * 40)
+    assert store.total_bytes == 40
+
+
+def test_total_survives_reopening(tmp_path):
+    path = str(tmp_path / 'thumbnails.db')
+    store = ThumbnailStore(path, max_bytes=1000)
+    for name in 'abc':
+        put(store, name)
+    store.close()
+    store = ThumbnailStore(path, max_bytes=1000)
+    assert store.total_bytes == 300
+    put(store, 'd')
+    assert store.get('d') is not None
+    store.close()
+
+
+def test_file_digest_reads_only_the_ends(tmp_path):
+    head, tail = b'h' * DIGEST_CHUNK, b't' * DIGEST_CHUNK
+    first = tmp_path / 'first'
+    second = tmp_path / 'second'
+    first.write_bytes(head + b'a' * 1000 + tail)
+    second.write_bytes(head + b'b' * 1000 + tail)
+    assert file_digest(str(first)) == file_digest(str(second))
+
+    second.write_bytes(head + b'a' * 1000 + b'u' + tail[1:])
+    assert file_digest(str(first)) != file_digest(str(second))
+    second.write_bytes(head + b'a' * 1001 + tail)
+    assert file_digest(str(first)) != file_digest(str(second))